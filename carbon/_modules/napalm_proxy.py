@@ -126,3 +126,83 @@ def reconnect(force=False):
         'result': True,
         'comment': 'Already alive.'
     }
+
+
+def cache_stats():
+    '''
+    Returns the number of hits and misses of the getters cache
+    from the NAPALM proxy, and the number of results currently cached.
+
+    CLI Example:
+
+    .. code-block:: bash
+
+        salt '*' napalm_proxy.cache_stats
+
+    Output Example:
+
+    .. code-block:: yaml
+
+        result: True
+        out:
+            hits: 42
+            misses: 7
+            entries: 5
+        comment: ''
+    '''
+    return {
+        'out': __proxy__['napalm.cache_stats'](),
+        'result': True,
+        'comment': ''
+    }
+
+
+def cache_flush():
+    '''
+    Flushes the getters cache of the NAPALM proxy,
+    so the next calls will query the device.
+
+    CLI Example:
+
+    .. code-block:: bash
+
+        salt '*' napalm_proxy.cache_flush
+    '''
+    return {
+        'out': __proxy__['napalm.cache_flush'](),
+        'result': True,
+        'comment': ''
+    }
+
+
+def multi_call(*getters, **kwargs):
+    '''
+    Executes multiple getters and returns their output, grouped by getter name.
+    When the proxy is configured with ``multi_call_sessions`` greater than 1,
+    the getters are executed concurrently, over multiple sessions with the device.
+
+    getters
+        The names of the getters to execute.
+
+    CLI Example:
+
+    .. code-block:: bash
+
+        salt '*' napalm_proxy.multi_call get_facts get_interfaces get_arp_table
+
+    Output Example:
+
+    .. code-block:: yaml
+
+        get_facts:
+            result: True
+            out:
+                ...
+            comment: ''
+        get_interfaces:
+            result: True
+            out:
+                ...
+            comment: ''
+    '''
+    return __proxy__['napalm.multi_call'](*getters)
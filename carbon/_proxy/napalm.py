@@ -31,6 +31,15 @@ please refer to the `NAPALM Read the Docs page`_.
 * username: username to be used when connecting to the device
 * passwd: the password needed to establish the connection
 * optional_args: dictionary with the optional arguments. Check the complete list of supported `optional arguments`_
+* getters_cache: optional, how long the results of the getters are cached, see below.
+* multi_call_sessions: optional, the maximum number of sessions opened with the device
+  to execute the getters concurrently, using ``multi_call``. Default: ``1``, i.e., sequentially.
+* connection_broker: optional, open the connection with the network device from a separate process,
+  that executes the calls received from the job processes over a local Unix socket, see
+  the ``conn_broker`` util. This way, the jobs executed in parallel processes (``multiprocessing: true``)
+  don't open their own connection. Default: ``False``.
+* connection_broker_channels: optional, how many connections the broker opens with the network device;
+  the calls are queued until a connection is available. Default: ``1``.
 
 .. _`NAPALM Read the Docs page`: https://napalm.readthedocs.io/en/latest/#supported-network-operating-systems
 .. _`optional arguments`: http://napalm.readthedocs.io/en/latest/support/index.html#list-of-supported-optional-arguments
@@ -50,6 +59,44 @@ Example:
             port: 12201
             config_format: set
 
+Getters cache
+-------------
+
+The results of the getters (i.e., the NAPALM methods whose name starts with ``get_``) can be cached by the proxy
+for a few seconds, so the beacons, grains, mines and states calling the same getter in a short interval
+don't query the device each time. The cache is flushed by any other method (e.g., when the configuration
+is loaded, committed, discarded or rolled back, or when executing CLI commands), and when the connection
+is re-opened.
+
+The cache is disabled by default, and is used only when the proxy minion runs with
+``multiprocessing: False``: otherwise each job runs in a separate process, with its own copy of the cache,
+so the changes made by a job would not flush the results cached by the others.
+
+The ``getters_cache`` dictionary accepts:
+
+* ttl: for how many seconds the results are cached. Default: ``0``, i.e., the results are not cached.
+* getters: the TTL for specific getters.
+
+Example:
+
+.. code-block:: yaml
+
+    proxy:
+        proxytype: napalm
+        driver: junos
+        host: core05.nrt02
+        username: my_username
+        passwd: my_password
+        multiprocessing: false
+        getters_cache:
+            ttl: 30
+            getters:
+                get_facts: 3600
+                get_bgp_neighbors: 0
+
+The number of hits and misses can be checked using the
+:mod:`napalm_proxy.cache_stats <salt.modules.napalm_proxy.cache_stats>` function.
+
 .. seealso::
 
     - :mod:`NAPALM grains: select network devices based on their characteristics <salt.grains.napalm>`
@@ -66,8 +113,12 @@ Example:
 from __future__ import absolute_import
 
 # Import python lib
+import copy
+import time
+import threading
 import traceback
 import logging
+from multiprocessing.pool import ThreadPool
 log = logging.getLogger(__file__)
 
 # Import third party lib
@@ -81,7 +132,9 @@ try:
 except ImportError:
     HAS_NAPALM = False
 
+import salt.loader
 from salt.ext import six as six
+from salt.ext.six.moves import queue  # pylint: disable=import-error
 
 # ----------------------------------------------------------------------------------------------------------------------
 # proxy properties
@@ -96,6 +149,16 @@ __proxyenabled__ = ['napalm']
 
 NETWORK_DEVICE = {}
 DETAILS = {}
+GETTERS_CACHE = {
+    'results': {},
+    'hits': 0,
+    'misses': 0,
+    # incremented on each flush: the results of the getters started before are not cached
+    'generation': 0
+}
+GETTERS_CACHE_LOCK = threading.Lock()
+
+DEFAULT_GETTERS_CACHE_TTL = 0
 
 # ----------------------------------------------------------------------------------------------------------------------
 # property functions
@@ -109,6 +172,93 @@ def __virtual__():
 # helper functions -- will not be exported
 # ----------------------------------------------------------------------------------------------------------------------
 
+
+def _get_cache_ttl(method):
+    '''
+    Return for how many seconds the result of a method can be cached.
+    Only the getters are cached.
+    '''
+    if not method.startswith('get_') or NETWORK_DEVICE.get('MULTIPROCESSING', True):
+        return 0
+    getters_cache = NETWORK_DEVICE.get('GETTERS_CACHE', {})
+    return getters_cache.get('getters', {}).get(method, getters_cache.get('ttl', DEFAULT_GETTERS_CACHE_TTL))
+
+
+def _get_driver():
+    '''
+    Return a new instance of the network driver, not connected yet.
+    '''
+    _driver_ = napalm_base.get_network_driver(NETWORK_DEVICE.get('DRIVER_NAME'))
+    return _driver_(
+        NETWORK_DEVICE.get('HOSTNAME', ''),
+        NETWORK_DEVICE.get('USERNAME', ''),
+        NETWORK_DEVICE.get('PASSWORD', ''),
+        timeout=NETWORK_DEVICE['TIMEOUT'],
+        optional_args=NETWORK_DEVICE['OPTIONAL_ARGS']
+    )
+
+
+def _get_sessions(count):
+    '''
+    Return up to ``count`` connected driver instances: the main connection,
+    plus the additional sessions, opened when first needed.
+    '''
+    if NETWORK_DEVICE.get('BROKER'):
+        # the broker queues the calls until one of its connections is available
+        return [NETWORK_DEVICE.get('DRIVER')] * count
+    sessions = NETWORK_DEVICE.setdefault('SESSIONS', [])
+    while len(sessions) < count - 1:
+        try:
+            driver = _get_driver()
+            driver.open()
+        except Exception as error:
+            log.error('Cannot open an additional session with {hostname}: {error}'.format(
+                hostname=NETWORK_DEVICE.get('HOSTNAME', ''),
+                error=error
+            ))
+            break
+        sessions.append(driver)
+    return [NETWORK_DEVICE.get('DRIVER')] + sessions[:count - 1]
+
+
+def _open_driver():
+    '''
+    Return a new instance of the network driver, connected.
+    Executed by the connection broker, to open its channels.
+    '''
+    driver = _get_driver()
+    driver.open()
+    return driver
+
+
+def _driver_alive(driver):
+    '''
+    Check if a connection opened by the broker is still alive.
+    '''
+    try:
+        return driver.is_alive().get('is_alive', False)
+    except NotImplementedError:
+        return True
+
+
+def _get_utils(opts):
+    '''
+    Return the Salt utils, loaded here when the Salt release does not provide
+    them to the Proxy Modules.
+    '''
+    if '__utils__' in globals():
+        return __utils__
+    if 'UTILS' not in NETWORK_DEVICE:
+        NETWORK_DEVICE['UTILS'] = salt.loader.utils(opts)
+    return NETWORK_DEVICE['UTILS']
+
+
+def _cache_key(method, params):
+    '''
+    Return the key of the cached result, for a method called with certain parameters.
+    '''
+    return (method, repr(sorted(params.items())))
+
 # ----------------------------------------------------------------------------------------------------------------------
 # Proxy functions
 # ----------------------------------------------------------------------------------------------------------------------
@@ -125,23 +275,44 @@ def init(opts):
     NETWORK_DEVICE['PASSWORD'] = proxy_dict.get('passwd') or proxy_dict.get('password') or proxy_dict.get('pass')
     NETWORK_DEVICE['TIMEOUT'] = proxy_dict.get('timeout', 60)
     NETWORK_DEVICE['OPTIONAL_ARGS'] = proxy_dict.get('optional_args', {})
+    NETWORK_DEVICE['GETTERS_CACHE'] = proxy_dict.get('getters_cache', {})
+    NETWORK_DEVICE['MULTIPROCESSING'] = opts.get('multiprocessing', True)
+    if NETWORK_DEVICE['GETTERS_CACHE'] and NETWORK_DEVICE['MULTIPROCESSING']:
+        log.warning('The getters cache is not used, as the proxy minion runs with multiprocessing enabled')
 
-    NETWORK_DEVICE['UP'] = False
+    NETWORK_DEVICE['MULTI_CALL_SESSIONS'] = proxy_dict.get('multi_call_sessions', 1)
 
-    _driver_ = napalm_base.get_network_driver(NETWORK_DEVICE.get('DRIVER_NAME'))
-    # get driver object form NAPALM
+    NETWORK_DEVICE['UP'] = False
+    NETWORK_DEVICE['BROKER'] = None
 
     if 'config_lock' not in NETWORK_DEVICE['OPTIONAL_ARGS'].keys():
         NETWORK_DEVICE['OPTIONAL_ARGS']['config_lock'] = False
 
+    if proxy_dict.get('connection_broker', False):
+        try:
+            NETWORK_DEVICE['BROKER'] = _get_utils(opts)['conn_broker.start'](
+                opts,
+                'napalm',
+                _open_driver,
+                channels=proxy_dict.get('connection_broker_channels', 1),
+                close='close',
+                check=_driver_alive
+            )
+        except Exception as error:
+            log.error('Cannot start the connection broker for {hostname}: {error}'.format(
+                hostname=NETWORK_DEVICE.get('HOSTNAME', ''),
+                error=error
+            ))
+            return True
+        # forwards the method calls to the connection broker
+        NETWORK_DEVICE['DRIVER'] = _get_utils(opts)['conn_broker.client'](opts, 'napalm')
+        NETWORK_DEVICE['UP'] = True
+        DETAILS['initialized'] = True
+        return True
+
     try:
-        NETWORK_DEVICE['DRIVER'] = _driver_(
-            NETWORK_DEVICE.get('HOSTNAME', ''),
-            NETWORK_DEVICE.get('USERNAME', ''),
-            NETWORK_DEVICE.get('PASSWORD', ''),
-            timeout=NETWORK_DEVICE['TIMEOUT'],
-            optional_args=NETWORK_DEVICE['OPTIONAL_ARGS']
-        )
+        # get driver object form NAPALM
+        NETWORK_DEVICE['DRIVER'] = _get_driver()
         NETWORK_DEVICE.get('DRIVER').open()
         # no exception raised here, means connection established
         NETWORK_DEVICE['UP'] = True
@@ -160,6 +331,17 @@ def init(opts):
     return True
 
 
+def alive(opts):
+
+    '''
+    Return the connection status with the network device.
+    '''
+
+    if NETWORK_DEVICE.get('BROKER'):
+        return _get_utils(opts)['conn_broker.alive'](opts, 'napalm', NETWORK_DEVICE['BROKER'])
+    return NETWORK_DEVICE.get('UP', False)
+
+
 def ping():
 
     '''
@@ -217,10 +399,44 @@ def fns():
     }
 
 
+def cache_stats():
+
+    '''
+    Return the number of hits and misses of the getters cache,
+    and the number of results currently cached.
+    '''
+
+    return {
+        'hits': GETTERS_CACHE['hits'],
+        'misses': GETTERS_CACHE['misses'],
+        'entries': len(GETTERS_CACHE['results'])
+    }
+
+
+def cache_flush():
+
+    '''
+    Flush the getters cache.
+    '''
+
+    with GETTERS_CACHE_LOCK:
+        GETTERS_CACHE['generation'] += 1
+        GETTERS_CACHE['results'].clear()
+    return True
+
+
 def shutdown(opts):
     '''
     Closes connection with the device.
     '''
+    cache_flush()
+    if NETWORK_DEVICE.get('BROKER'):
+        return _get_utils(opts)['conn_broker.stop'](opts, 'napalm', NETWORK_DEVICE['BROKER'])
+    for session in NETWORK_DEVICE.pop('SESSIONS', []):
+        try:
+            session.close()
+        except Exception as error:
+            log.error('Cannot close an additional session: {error}'.format(error=error))
     try:
         if not NETWORK_DEVICE.get('UP', False):
             raise Exception('not connected!')
@@ -276,8 +492,74 @@ def call(method, **params):
                                  })
     '''
 
+    return _call(NETWORK_DEVICE.get('DRIVER'), method, **params)
+
+
+def multi_call(*calls):
+
+    '''
+    Calls multiple methods from the network driver instance,
+    and returns a dictionary having the method names as keys,
+    and the output of :func:`call <call>` as values.
+
+    When all the methods are getters, they are executed concurrently,
+    over at most ``multi_call_sessions`` sessions with the device.
+    Otherwise, they are executed one after the other, in the order specified.
+
+    :param calls: the names of the methods, or dictionaries having the method name as key
+        and the parameters as value.
+
+    Example:
+
+    .. code-block:: python
+
+        __proxy__['napalm.multi_call']('get_facts',
+                                       'get_interfaces',
+                                       {'get_route_to': {'destination': '1.1.1.1'}})
+    '''
+
+    methods = []
+    for method_call in calls:
+        if isinstance(method_call, dict):
+            methods.extend([(method, params or {}) for method, params in six.iteritems(method_call)])
+        else:
+            methods.append((method_call, {}))
+
+    sessions_count = min(NETWORK_DEVICE.get('MULTI_CALL_SESSIONS', 1), len(methods))
+    if sessions_count < 2 or not all(method.startswith('get_') for method, _ in methods) or \
+            not NETWORK_DEVICE.get('UP', False):
+        return dict((method, call(method, **params)) for method, params in methods)
+
+    sessions = queue.Queue()
+    for session in _get_sessions(sessions_count):
+        sessions.put(session)
+
+    def _session_call(method_params):
+        method, params = method_params
+        session = sessions.get()
+        try:
+            return method, _call(session, method, **params)
+        finally:
+            sessions.put(session)
+
+    pool = ThreadPool(sessions.qsize())
+    try:
+        return dict(pool.map(_session_call, methods))
+    finally:
+        pool.close()
+
+
+def _call(driver, method, **params):
+
+    '''
+    Calls a specific method from a certain network driver instance.
+    See :func:`call <call>`.
+    '''
+
     result = False
     out = None
+    cache_ttl = 0
+    generation = None
 
     try:
         if not NETWORK_DEVICE.get('UP', False):
@@ -291,7 +573,20 @@ def call(method, **params):
             # thus the NAPALM methods will be called with their defaults
             if warg is None:
                 params.pop(karg)
-        out = getattr(NETWORK_DEVICE.get('DRIVER'), method)(**params)  # calls the method with the specified parameters
+        if not method.startswith('get_'):
+            # any other method may change the state of the device
+            cache_flush()
+        cache_ttl = _get_cache_ttl(method)
+        if cache_ttl:
+            with GETTERS_CACHE_LOCK:
+                generation = GETTERS_CACHE['generation']
+                cached = GETTERS_CACHE['results'].get(_cache_key(method, params))
+                if cached and time.time() - cached[0] < cache_ttl:
+                    GETTERS_CACHE['hits'] += 1
+                    # a copy, as the callers may alter the output
+                    return copy.deepcopy(cached[1])
+                GETTERS_CACHE['misses'] += 1
+        out = getattr(driver, method)(**params)  # calls the method with the specified parameters
         result = True
     except Exception as error:
         # either not connected
@@ -320,8 +615,13 @@ def call(method, **params):
             'traceback': err_tb
         }
 
-    return {
+    ret = {
         'out': out,
         'result': result,
         'comment': ''
     }
+    if cache_ttl:
+        with GETTERS_CACHE_LOCK:
+            if GETTERS_CACHE['generation'] == generation:
+                GETTERS_CACHE['results'][_cache_key(method, params)] = (time.time(), copy.deepcopy(ret))
+    return ret
@@ -53,96 +53,119 @@ def _get_rclient():
     return _rclient
 
 
-# ----------------------------------------------------------------------------------------------------------------------
-# callable functions
-# ----------------------------------------------------------------------------------------------------------------------
+def _fan_out(fun, arg, process, timeout=60):
 
+    """Executes ``fun`` on all devices, and processes the return of each device as soon as it arrives,
+    while still waiting for the others. Returns the non-empty results of ``process``."""
 
-def diff():
+    _client = _get_client()
+    results = {}
 
-    """Returns the differences between the expected device config and the actual config."""
+    for device_ret in _client.cmd_iter('*', fun, arg, expr_form='glob', timeout=timeout):
+        for device, device_data in six.iteritems(device_ret):
+            if not isinstance(device_data, dict) or 'ret' not in device_data:
+                continue
+            result = process(device, device_data['ret'])
+            if result:
+                results[device] = result
 
-    _client = _get_client()
+    return results
 
-    ntp_state_result = _client.cmd('*', 'state.sls', ['router.ntp', 'test=True'], expr_form='glob', timeout=60)
 
-    _ntp_diff = {
+def _state_diff(device, device_states_run):
+
+    """Returns the peers and servers to be added or removed on a device, from the result of the NTP state."""
+
+    _device_diff = {
         'add': {},
         'remove': {}
     }
 
-    for device, device_states_run in six.iteritems(ntp_state_result):
-        for state_run, state_result in six.iteritems(device_states_run):
-            if state_result.get('result') is False:
-                continue
+    if not isinstance(device_states_run, dict):
+        return _device_diff  # e.g. the state SLS cannot be rendered
+
+    for state_run, state_result in six.iteritems(device_states_run):
+        if state_result.get('result') is False:
+            continue
+
+        state_changes = state_result.get('changes', {})
+        peers_change = state_changes.get('peers', {})
+        servers_change = state_changes.get('servers', {})
+
+        if peers_change.get('added'):
+            _device_diff['add']['peers'] = peers_change['added']
+        if peers_change.get('removed'):
+            _device_diff['remove']['peers'] = peers_change['removed']
+        if servers_change.get('added'):
+            _device_diff['add']['servers'] = servers_change['added']
+        if servers_change.get('removed'):
+            _device_diff['remove']['servers'] = servers_change['removed']
+
+    return _device_diff
+
+
+def _sync_status(device, device_ret):
+
+    """Returns ``not_synced`` or ``over_stratum`` when a device requiring NTP sync is not synchronized,
+    or is synchronized only with peers above the expected stratum."""
+
+    device_ntp_stats = device_ret.get('ntp.stats') or {}
+    if not device_ntp_stats.get('result', False):
+        return
+    device_ntp_stats = device_ntp_stats.get('out', {})
+    if not device_ntp_stats:
+        return  # if cannot retrieve for some reason,
+    device_ntp_pillar = (device_ret.get('pillar.items') or {}).get('ntp') or {}
+    sync = device_ntp_pillar.get('synchronized', False)
+    stratum = device_ntp_pillar.get('stratum', 16)
+    if not sync:
+        return  # if this device does not need sync
+    synced_peers = [
+        peer_stats for peer_stats in device_ntp_stats
+        if peer_stats.get('remote', '') and peer_stats.get('synchronized', False)
+    ]
+    # the list of peers synchronized with
+    if not synced_peers:
+        return 'not_synced'
+    under_stratum = [peer_stats.get('remote') for peer_stats in synced_peers if peer_stats.get('stratum', 16) <= stratum]
+    if not under_stratum:
+        return 'over_stratum'
 
-            state_changes = state_result.get('changes', {})
-            peers_change = state_changes.get('peers', {})
-            servers_change = state_changes.get('servers', {})
 
-            add_peers = peers_change.get('added', [])
-            remove_peers = peers_change.get('removed', [])
+# ----------------------------------------------------------------------------------------------------------------------
+# callable functions
+# ----------------------------------------------------------------------------------------------------------------------
 
-            add_servers = servers_change.get('added', [])
-            remove_servers = servers_change.get('removed', [])
 
-            if add_peers:
-                if 'peers' not in _ntp_diff['add'].keys():
-                    _ntp_diff['add']['peers'] = {}
-                _ntp_diff['add']['peers'][device] = add_peers
+def diff():
 
-            if remove_peers:
-                if 'peers' not in _ntp_diff['remove'].keys():
-                    _ntp_diff['remove']['peers'] = {}
-                _ntp_diff['remove']['peers'][device] = remove_peers
+    """Returns the differences between the expected device config and the actual config."""
 
-            if add_servers:
-                if 'servers' not in _ntp_diff['add'].keys():
-                    _ntp_diff['add']['servers'] = {}
-                _ntp_diff['add']['servers'][device] = add_servers
+    ntp_state_diff = _fan_out('state.sls', ['router.ntp', 'test=True'], _state_diff, timeout=60)
 
-            if remove_servers:
-                if 'servers' not in _ntp_diff['remove'].keys():
-                    _ntp_diff['remove']['servers'] = {}
-                _ntp_diff['remove']['servers'][device] = remove_servers
+    _ntp_diff = {
+        'add': {},
+        'remove': {}
+    }
+
+    for device, device_diff in six.iteritems(ntp_state_diff):
+        for action, action_diff in six.iteritems(device_diff):
+            for field, field_diff in six.iteritems(action_diff):
+                if field not in _ntp_diff[action].keys():
+                    _ntp_diff[action][field] = {}
+                _ntp_diff[action][field][device] = field_diff
 
     return _ntp_diff
 
 
 def unsynchronized():
 
-    _client = _get_client()
-    _rclient = _get_rclient()
-    ntp_stats = _client.cmd('*', 'ntp.stats', [], expr_form='glob', timeout=120)
-
-    _not_synced_devices = list()
-    _over_stratum_devices = list()
+    # the pillar is retrieved together with the stats, in the same job: pillar.items compiles it again
+    # on the master (as pillar.show_pillar), hence the changes of the NTP pillar files are considered
+    sync_status = _fan_out(['ntp.stats', 'pillar.items'], [[], []], _sync_status, timeout=120)
 
-    for device, device_ntp_stats in six.iteritems(ntp_stats):
-        if not device_ntp_stats.get('result', False):
-            continue
-        device_ntp_stats = device_ntp_stats.get('out', {})
-        if not device_ntp_stats:
-            continue  # if cannot retrieve for some reason,
-        kwarg={'minion': device}
-        device_pillar = _rclient.cmd('pillar.show_pillar', kwarg=kwarg)
-        sync = device_pillar.get('ntp', {}).get('synchronized', False)
-        stratum = device_pillar.get('ntp', {}).get('stratum', 16)
-        if not sync:
-            continue  # if this device does not need sync
-        synced_peers = [
-            {peer_stats.get('remote'): peer_stats.get('stratum', 16)} \
-            for peer_stats in device_ntp_stats \
-            if peer_stats.get('remote', '') and peer_stats.get('synchronized', False)
-        ]
-        # the list of peers synchronized with
-        if not synced_peers:
-            _not_synced_devices.append(device)
-            continue
-        under_stratum = [synced_peer.keys()[0] for synced_peer in synced_peers if synced_peer.values()[0] <= stratum]
-        if not under_stratum:
-            _over_stratum_devices.append(device)
-            continue
+    _not_synced_devices = [device for device, status in six.iteritems(sync_status) if status == 'not_synced']
+    _over_stratum_devices = [device for device, status in six.iteritems(sync_status) if status == 'over_stratum']
 
     return (_not_synced_devices, _over_stratum_devices)
 
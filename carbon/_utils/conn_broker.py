@@ -0,0 +1,358 @@
+# -*- coding: utf-8 -*-
+'''
+Connection Broker
+=================
+
+.. versionadded:: Fluorine
+
+Utilities to share the connection with a network device between the job
+processes of a Proxy Minion.
+
+The SSH-based Proxy Minions hold a single connection object, that cannot be
+shared across processes, hence they have to run with ``multiprocessing``
+disabled, and the jobs against the same device are executed one after another.
+The connection broker is a separate process, started by the Proxy Minion, that
+owns one or more connections (channels) with the network device, and executes
+the method calls received from the job processes over a local Unix socket.
+The calls are queued until a channel is available, so the job processes no
+longer need to establish their own connection. When a ``check`` callable is
+provided, each channel is checked before it is used, and reopened when the
+network device closed it (e.g., after an idle timeout).
+
+Usage example (from a Proxy Module):
+
+.. code-block:: python
+
+    broker = __utils__['conn_broker.start'](opts, 'netmiko', ConnectHandler, connection_args, channels=2)
+    output = __utils__['conn_broker.call'](opts, 'netmiko', 'send_command', 'show version')
+    __utils__['conn_broker.stop'](opts, 'netmiko', broker)
+'''
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+# Import python libs
+import os
+import sys
+import time
+import signal
+import socket
+import struct
+import logging
+import multiprocessing
+
+# Import salt libs
+from salt.ext.six.moves import cPickle as pickle  # pylint: disable=import-error
+from salt.ext.six.moves import queue  # pylint: disable=import-error
+from salt.ext.six.moves import socketserver  # pylint: disable=import-error
+from salt.exceptions import CommandExecutionError
+
+log = logging.getLogger(__name__)
+
+# -----------------------------------------------------------------------------
+# global variables
+# -----------------------------------------------------------------------------
+
+# each message is prefixed by its length
+_HEADER = struct.Struct(str('!I'))
+# pickle protocol understood by both Python 2 and 3
+_PICKLE_PROTOCOL = 2
+# for how many seconds to wait for the broker to open the channels
+_START_TIMEOUT = 300
+
+# -----------------------------------------------------------------------------
+# helper functions -- will not be exported
+# -----------------------------------------------------------------------------
+
+
+def _socket_path(opts, name):
+    '''
+    Return the path to the Unix socket of the broker.
+    '''
+    return os.path.join(opts['sock_dir'], '{name}-{id}.sock'.format(name=name, id=opts['id']))
+
+
+def _send(sock, obj):
+    '''
+    Send a message over the socket.
+    '''
+    data = pickle.dumps(obj, _PICKLE_PROTOCOL)
+    sock.sendall(_HEADER.pack(len(data)) + data)
+
+
+def _running(pid):
+    '''
+    Check if a process is running, including the processes not started by the
+    current one (e.g., from a job process forked by the Proxy Minion).
+    '''
+    try:
+        os.kill(pid, 0)
+    except OSError:
+        return False
+    return True
+
+
+def _is_child(process):
+    '''
+    Check if the broker process has been started by the current process.
+    '''
+    return getattr(process, 'broker_parent', None) == os.getpid()
+
+
+def _recv_exactly(sock, size):
+    '''
+    Read exactly ``size`` bytes from the socket, or ``None`` when the socket
+    has been closed.
+    '''
+    data = b''
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            return None
+        data += chunk
+    return data
+
+
+def _recv(sock):
+    '''
+    Receive a message from the socket, or ``None`` when the socket has been
+    closed.
+    '''
+    header = _recv_exactly(sock, _HEADER.size)
+    if header is None:
+        return None
+    data = _recv_exactly(sock, _HEADER.unpack(header)[0])
+    if data is None:
+        return None
+    return pickle.loads(data)
+
+
+class _BrokerServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    '''
+    Unix socket server, serving each client from a separate thread.
+    '''
+    daemon_threads = True
+
+
+class _BrokerHandler(socketserver.BaseRequestHandler):
+    '''
+    Execute the method calls received from a client, on the first channel
+    available.
+    '''
+
+    def _get_channel(self):
+        '''
+        Return the first channel available, reopened when no longer alive.
+        '''
+        channel = self.server.channels.get()
+        if self.server.check is None:
+            return channel
+        try:
+            healthy = self.server.check(channel)
+        except Exception:  # pylint: disable=broad-except
+            healthy = False
+        if healthy:
+            return channel
+        log.info('Reopening a channel closed by the network device')
+        try:
+            getattr(channel, self.server.close)()
+        except Exception:  # pylint: disable=broad-except
+            log.debug('Unable to close the channel', exc_info=True)
+        try:
+            return self.server.factory(**self.server.factory_kwargs)
+        except Exception:
+            # put the dead channel back, to be reopened by the next call
+            self.server.channels.put(channel)
+            raise
+
+    def handle(self):
+        while True:
+            request = _recv(self.request)
+            if request is None:
+                return
+            method, args, kwargs = request
+            if method is None:
+                # ping, answered without waiting for a channel
+                _send(self.request, (True, True))
+                continue
+            try:
+                channel = self._get_channel()
+            except Exception as err:  # pylint: disable=broad-except
+                log.debug('Unable to reopen the channel', exc_info=True)
+                _send(self.request, (False, 'Unable to reopen the channel: {0}'.format(err)))
+                continue
+            try:
+                response = (True, getattr(channel, method)(*args, **kwargs))
+            except Exception as err:  # pylint: disable=broad-except
+                log.debug('Error while executing %s', method, exc_info=True)
+                response = (False, '{0}: {1}'.format(err.__class__.__name__, err))
+            finally:
+                self.server.channels.put(channel)
+            try:
+                _send(self.request, response)
+            except (pickle.PicklingError, TypeError, AttributeError) as err:
+                _send(self.request, (False, 'Unable to serialize the result of {0}: {1}'.format(method, err)))
+
+
+def _serve(path, factory, factory_kwargs, channels, close, check, ready):
+    '''
+    The main function of the broker process: open the channels, then serve
+    the calls received over the Unix socket, until terminated.
+    '''
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    channel_queue = queue.Queue()
+    for _ in range(channels):
+        channel_queue.put(factory(**factory_kwargs))
+    if os.path.exists(path):
+        os.remove(path)
+    # the socket is created readable and writable by the owner only, as the
+    # messages received are unpickled
+    umask = os.umask(0o177)
+    try:
+        server = _BrokerServer(path, _BrokerHandler)
+    finally:
+        os.umask(umask)
+    server.channels = channel_queue
+    server.factory = factory
+    server.factory_kwargs = factory_kwargs
+    server.close = close
+    server.check = check
+    ready.set()
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        while not channel_queue.empty():
+            channel = channel_queue.get()
+            try:
+                getattr(channel, close)()
+            except Exception:  # pylint: disable=broad-except
+                log.debug('Unable to close the channel', exc_info=True)
+
+# -----------------------------------------------------------------------------
+# callable functions
+# -----------------------------------------------------------------------------
+
+
+class Client(object):
+    '''
+    Object forwarding the method calls to the broker, so it can be used
+    instead of the connection object.
+    '''
+
+    def __init__(self, opts, name):
+        self.opts = opts
+        self.name = name
+
+    def __getattr__(self, method):
+        def _call(*args, **kwargs):
+            return call(self.opts, self.name, method, *args, **kwargs)
+        return _call
+
+
+def start(opts, name, factory, factory_kwargs=None, channels=1, close='disconnect', check=None):
+    '''
+    Start the broker process, and return it after the channels have been
+    opened.
+
+    opts
+        The Proxy Minion opts.
+
+    name
+        The name of the broker, e.g., the Proxy Module name.
+
+    factory
+        Callable returning a new connection with the network device.
+
+    factory_kwargs
+        Key-value arguments sent to ``factory``.
+
+    channels: ``1``
+        How many connections to open with the network device.
+
+    close: ``disconnect``
+        The name of the method closing the connection.
+
+    check
+        Callable receiving a connection, and returning ``False`` when it is
+        no longer alive. The connections are checked before each call, and
+        reopened when closed by the network device.
+    '''
+    path = _socket_path(opts, name)
+    ready = multiprocessing.Event()
+    process = multiprocessing.Process(target=_serve,
+                                      name='ConnectionBroker-{0}-{1}'.format(name, opts['id']),
+                                      args=(path, factory, factory_kwargs or {}, channels, close, check, ready))
+    process.daemon = True
+    process.broker_parent = os.getpid()
+    process.start()
+    waited = 0
+    while not ready.wait(1):
+        waited += 1
+        if not process.is_alive() or waited >= _START_TIMEOUT:
+            process.terminate()
+            raise CommandExecutionError('Unable to start the {0} connection broker'.format(name))
+    log.debug('Started the %s connection broker (PID %d), listening on %s', name, process.pid, path)
+    return process
+
+
+def call(opts, name, method, *args, **kwargs):
+    '''
+    Execute a method of the connection object, through the broker.
+    When ``method`` is ``None``, only check that the broker is answering.
+    '''
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(_socket_path(opts, name))
+        _send(sock, (method, args, kwargs))
+        response = _recv(sock)
+    except socket.error as err:
+        raise CommandExecutionError('Unable to reach the {0} connection broker: {1}'.format(name, err))
+    finally:
+        sock.close()
+    if response is None:
+        raise CommandExecutionError('The {0} connection broker closed the connection'.format(name))
+    success, ret = response
+    if not success:
+        raise CommandExecutionError(ret)
+    return ret
+
+
+def client(opts, name):
+    '''
+    Return an object forwarding the method calls to the broker.
+    '''
+    return Client(opts, name)
+
+
+def alive(opts, name, process):
+    '''
+    Check if the broker process is still running, and answering the calls.
+    Can be executed from any process, not only from the one that started the
+    broker.
+    '''
+    if process is None or not _running(process.pid):
+        return False
+    try:
+        return call(opts, name, None)
+    except CommandExecutionError:
+        log.debug('The %s connection broker is not answering', name, exc_info=True)
+        return False
+
+
+def stop(opts, name, process):
+    '''
+    Stop the broker process, closing the channels with the network device.
+    '''
+    if process is not None and _running(process.pid):
+        os.kill(process.pid, signal.SIGTERM)
+        if _is_child(process):
+            process.join(30)
+        else:
+            waited = 0
+            while _running(process.pid) and waited < 30:
+                time.sleep(1)
+                waited += 1
+    path = _socket_path(opts, name)
+    if os.path.exists(path):
+        os.remove(path)
+    return True
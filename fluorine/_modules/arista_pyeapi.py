@@ -160,7 +160,8 @@ def _prepare_connection(**kwargs):
     Prepare the connection with the remote network device, and clean up the key
     value pairs, removing the args used for the connection init.
     '''
-    pyeapi_kwargs = __salt__['config.get']('pyeapi', {})
+    # a copy, so the CLI args are not merged into the opts/pillar
+    pyeapi_kwargs = dict(__salt__['config.get']('pyeapi', {}))
     pyeapi_kwargs.update(kwargs)  # merge the CLI args with the opts/pillar
     init_kwargs, fun_kwargs = __utils__['args.prepare_kwargs'](pyeapi_kwargs, PYEAPI_INIT_KWARGS)
     if 'transport' not in init_kwargs:
@@ -18,12 +18,23 @@ See http://www.pennington.net/py/ciscoconfparse/index.html for further details.
 
 This module depends on the Python library with the same name,
 ``ciscoconfparse`` - to install execute: ``pip install ciscoconfparse``.
+
+.. note::
+    The functions returning the lines as text (``find_lines``,
+    ``find_lines_w_child``, ``find_lines_wo_child``, and ``filter_lines``) are
+    executed using the native line index from the
+    :py:mod:`iosconfig <salt.modules.iosconfig>` module, which is faster than
+    the ``ciscoconfparse`` object model, and available even when
+    ``ciscoconfparse`` is not installed. Only the functions returning
+    ``ciscoconfparse`` objects require the library.
 '''
 # Import Python Libs
 from __future__ import absolute_import, unicode_literals, print_function
 
 # Import Salt modules
 from salt.ext import six
+import salt.utils.args
+from salt.utils.decorators import depends
 from salt.exceptions import SaltException
 
 try:
@@ -38,36 +49,73 @@ except ImportError:
 
 __virtualname__ = 'ciscoconfparse'
 
+# the functions that can be executed by query_many
+_QUERY_FUNCTIONS = (
+    'find_objects',
+    'find_lines',
+    'find_objects_w_child',
+    'find_lines_w_child',
+    'find_objects_wo_child',
+    'find_lines_wo_child',
+    'filter_lines'
+)
+
 # ------------------------------------------------------------------------------
 # property functions
 # ------------------------------------------------------------------------------
 
 
 def __virtual__():
-    return HAS_CISCOCONFPARSE
+    return __virtualname__
 
 # ------------------------------------------------------------------------------
 # helper functions -- will not be exported
 # ------------------------------------------------------------------------------
 
 
-def _get_ccp(config=None, config_path=None, saltenv='base'):
+def _get_config(config=None, config_path=None, saltenv='base'):
     '''
+    Return the configuration, loading it from ``config_path`` when specified.
     '''
     if config_path:
         config = __salt__['cp.get_file_str'](config_path, saltenv=saltenv)
         if config is False:
             raise SaltException('{} is not available'.format(config_path))
+    return config
+
+
+def _get_config_text(config=None, config_path=None, saltenv='base'):
+    '''
+    Return the configuration as text, to be used with the native line index
+    from the iosconfig module, for multiple queries.
+    '''
+    config = _get_config(config=config, config_path=config_path, saltenv=saltenv)
+    if HAS_CISCOCONFPARSE and isinstance(config, ciscoconfparse.CiscoConfParse):
+        config = config.ioscfg
+    if not isinstance(config, six.string_types):
+        config = '\n'.join(config)
+    return config
+
+
+def _get_ccp(config=None, config_path=None, saltenv='base'):
+    '''
+    Return the CiscoConfParse object for the configuration.
+    '''
+    config = _get_config(config=config, config_path=config_path, saltenv=saltenv)
+    if isinstance(config, ciscoconfparse.CiscoConfParse):
+        # already parsed
+        return config
+    # a new object for each call, as the callers may modify the line objects
     if isinstance(config, six.string_types):
         config = config.splitlines()
-    ccp = ciscoconfparse.CiscoConfParse(config)
-    return ccp
+    return ciscoconfparse.CiscoConfParse(list(config))
 
 # ------------------------------------------------------------------------------
 # callable functions
 # ------------------------------------------------------------------------------
 
 
+@depends(HAS_CISCOCONFPARSE)
 def find_objects(config=None, config_path=None, regex=None, saltenv='base'):
     '''
     Return all the line objects that match the expression in the ``regex``
@@ -149,13 +197,13 @@ def find_lines(config=None, config_path=None, regex=None, saltenv='base'):
             -  ip address 172.20.0.1 255.255.255.0
             -  no ip address
     '''
-    lines = find_objects(config=config,
-                         config_path=config_path,
-                         regex=regex,
-                         saltenv=saltenv)
-    return [line.text for line in lines]
+    return __salt__['iosconfig.find_lines'](config=_get_config_text(config=config,
+                                                                    config_path=config_path,
+                                                                    saltenv=saltenv),
+                                            regex=regex)
 
 
+@depends(HAS_CISCOCONFPARSE)
 def find_objects_w_child(config=None,
                          config_path=None,
                          parent_regex=None,
@@ -252,15 +300,15 @@ def find_lines_w_child(config=None,
         salt '*' ciscoconfparse.find_lines_w_child config_path=https://bit.ly/2mAdq7z parent_line='line con' child_line='stopbits'
         salt '*' ciscoconfparse.find_lines_w_child config_path=https://bit.ly/2uIRxau parent_regex='ge-(.*)' child_regex='unit \d+'
    '''
-    lines = find_objects_w_child(config=config,
-                                 config_path=config_path,
-                                 parent_regex=parent_regex,
-                                 child_regex=child_regex,
-                                 ignore_ws=ignore_ws,
-                                 saltenv=saltenv)
-    return [line.text for line in lines]
+    return __salt__['iosconfig.find_lines_w_child'](config=_get_config_text(config=config,
+                                                                            config_path=config_path,
+                                                                            saltenv=saltenv),
+                                                    parent_regex=parent_regex,
+                                                    child_regex=child_regex,
+                                                    ignore_ws=ignore_ws)
 
 
+@depends(HAS_CISCOCONFPARSE)
 def find_objects_wo_child(config=None,
                           config_path=None,
                           parent_regex=None,
@@ -362,13 +410,12 @@ def find_lines_wo_child(config=None,
 
         salt '*' ciscoconfparse.find_lines_wo_child config_path=https://bit.ly/2mAdq7z parent_line='line con' child_line='stopbits'
     '''
-    lines = find_objects_wo_child(config=config,
-                                  config_path=config_path,
-                                  parent_regex=parent_regex,
-                                  child_regex=child_regex,
-                                  ignore_ws=ignore_ws,
-                                  saltenv=saltenv)
-    return [line.text for line in lines]
+    return __salt__['iosconfig.find_lines_wo_child'](config=_get_config_text(config=config,
+                                                                             config_path=config_path,
+                                                                             saltenv=saltenv),
+                                                     parent_regex=parent_regex,
+                                                     child_regex=child_regex,
+                                                     ignore_ws=ignore_ws)
 
 
 def filter_lines(config=None,
@@ -422,22 +469,103 @@ def filter_lines(config=None,
             }
         ]
     '''
-    ret = []
-    ccp = _get_ccp(config=config, config_path=config_path, saltenv=saltenv)
-    parent_lines = ccp.find_objects(parent_regex)
-    for parent_line in parent_lines:
-        child_lines = parent_line.re_search_children(child_regex)
-        if child_lines:
-            for child_line in child_lines:
-                ret.append({
-                    'match': True,
-                    'parent': parent_line.text,
-                    'child': child_line.text
-                })
+    return __salt__['iosconfig.filter_lines'](config=_get_config_text(config=config,
+                                                                      config_path=config_path,
+                                                                      saltenv=saltenv),
+                                              parent_regex=parent_regex,
+                                              child_regex=child_regex)
+
+
+def query_many(config=None, config_path=None, queries=None, saltenv='base'):
+    '''
+    Execute multiple queries against the same configuration, which is loaded
+    and parsed only once, and return the results of all the queries, as a
+    dictionary having the query names as keys.
+
+    config
+        The configuration sent as text.
+
+        .. note::
+            This argument is ignored when ``config_path`` is specified.
+
+    config_path
+        The absolute or remote path to the file with the configuration to be
+        parsed. This argument supports the usual Salt filesystem URIs, e.g.,
+        ``salt://``, ``https://``, ``ftp://``, ``s3://``, etc.
+
+    queries
+        Dictionary of queries, having the query names as keys. Each query is
+        a dictionary with the name of the function to execute under the ``fun``
+        key, and the arguments of the function, e.g., ``regex``,
+        ``parent_regex``, ``child_regex``, or ``ignore_ws``. The available
+        functions are: ``find_objects``, ``find_lines``, ``find_objects_w_child``,
+        ``find_lines_w_child``, ``find_objects_wo_child``, ``find_lines_wo_child``,
+        and ``filter_lines``.
+
+    saltenv: ``base``
+        Salt fileserver environment from which to retrieve the file. This
+        argument is ignored when ``config_path`` is not a ``salt://`` URL.
+
+    CLI Example:
+
+    .. code-block:: bash
+
+        salt '*' ciscoconfparse.query_many config_path=https://bit.ly/2mAdq7z queries="{'addresses': {'fun': 'find_lines', 'regex': 'ip address'}, 'shutdown': {'fun': 'find_lines_w_child', 'parent_regex': 'interface', 'child_regex': 'shutdown'}}"
+
+    Usage example:
+
+    .. code-block:: python
+
+        results = __salt__['ciscoconfparse.query_many'](config_path='salt://path/to/config.txt',
+                                                        queries={
+                                                            'addresses': {
+                                                                'fun': 'find_lines',
+                                                                'regex': 'ip address'
+                                                            },
+                                                            'shutdown': {
+                                                                'fun': 'filter_lines',
+                                                                'parent_regex': 'interface',
+                                                                'child_regex': 'shutdown'
+                                                            }
+                                                        })
+
+    Output example (for the CLI example above):
+
+    .. code-block:: yaml
+
+        addresses:
+            -  ip address dhcp
+            -  ip address 172.20.0.1 255.255.255.0
+            -  no ip address
+        shutdown:
+            - interface GigabitEthernet2
+            - interface GigabitEthernet3
+    '''
+    # the text is indexed once by iosconfig, and parsed once by ciscoconfparse
+    # when any find_objects query is executed (the object is not shared with
+    # the other calls, as the callers may modify the line objects)
+    config = _get_config_text(config=config, config_path=config_path, saltenv=saltenv)
+    ccp = None
+    ret = {}
+    for name, query in six.iteritems(queries or {}):
+        query = dict(query)
+        fun = query.pop('fun', None)
+        if fun not in _QUERY_FUNCTIONS:
+            raise SaltException('Invalid function for the {} query: {}'.format(name, fun))
+        if fun.startswith('find_objects') and not HAS_CISCOCONFPARSE:
+            raise SaltException('The {} query requires the ciscoconfparse library'.format(name))
+        for arg in ('config', 'config_path', 'saltenv'):
+            query.pop(arg, None)
+        fun_args = salt.utils.args.get_function_argspec(globals()[fun]).args
+        invalid_args = sorted(arg for arg in query if arg not in fun_args)
+        if invalid_args:
+            raise SaltException('Invalid arguments for the {} query ({}): {}'.format(name,
+                                                                                    fun,
+                                                                                    ', '.join(invalid_args)))
+        if fun.startswith('find_objects'):
+            if ccp is None:
+                ccp = ciscoconfparse.CiscoConfParse(config.splitlines())
+            ret[name] = globals()[fun](config=ccp, **query)
         else:
-            ret.append({
-                'match': False,
-                'parent': parent_line.text,
-                'child': None
-            })
+            ret[name] = globals()[fun](config=config, **query)
     return ret
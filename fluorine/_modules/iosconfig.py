@@ -7,17 +7,26 @@ Cisco IOS configuration manipulation helpers
 This module provides a collection of helper functions for Cisco IOS style
 configuration manipulation. This module does not have external dependencies
 and can be used from any Proxy or regular Minion.
+
+Besides text, the configuration can be passed to the ``config`` arguments
+as an iterable of lines, e.g., the iterator returned by
+:mod:`net.config_lines <salt.modules.napalm_network.config_lines>`, so very
+large configurations are parsed without loading the entire text in memory.
 '''
 # Import Python Libs
 from __future__ import absolute_import, unicode_literals, print_function
 
 # Import python stdlib
+import re
+import copy
 import difflib
+import hashlib
+import itertools
 
 # Import Salt modules
 from salt.ext import six
 import salt.utils.dictupdate
-import salt.utils.dictdiffer
+import salt.utils.stringutils
 from salt.utils.odict import OrderedDict
 from salt.exceptions import SaltException
 
@@ -28,6 +37,10 @@ from salt.exceptions import SaltException
 __virtualname__ = 'iosconfig'
 __proxyenabled__ = ['*']
 
+_EMPTY_BLOCK_HASH = hashlib.sha1(b'').digest()
+# how many parsed configurations to keep in memory
+_CACHE_SIZE = 4
+
 # ------------------------------------------------------------------------------
 # helper functions -- will not be exported
 # ------------------------------------------------------------------------------
@@ -67,52 +80,251 @@ def _attach_data_to_path_tags(obj, path, data, list_=False):
     obj_tmp[path_item]["#standalone"] = True
 
 
-def _parse_text_config(config_lines,
-                       with_tags=False,
-                       current_indent=0,
-                       nested=False):
+def _hash_block(block, hashes):
+    '''
+    Return the hash of a block, computed from the lines and the hashes of
+    its children.
+    '''
+    if not block:
+        return _EMPTY_BLOCK_HASH
+    return hashlib.sha1(b''.join([
+        salt.utils.stringutils.to_bytes(line) + b'\n' + hashes[id(children)]
+        for line, children in six.iteritems(block)
+    ])).digest()
+
+
+def _attach_block(struct_cfg, stack, with_tags=False, hashes=None):
+    '''
+    Pop the last block from the stack and attach it to its parent, once all
+    its children have been parsed.
+    '''
+    _, line, block = stack.pop()
+    parent = stack[-1][2] if stack else struct_cfg
+    if with_tags:
+        _attach_data_to_path_tags(parent, line, block, bool(stack))
+    else:
+        _attach_data_to_path(parent, line, block)
+        if hashes is not None:
+            # when the line was already there, the block has been merged
+            # into the existing one, which needs to be hashed again
+            hashes[id(parent[line])] = _hash_block(parent[line], hashes)
+
+
+def _parse_text_config(config_lines, with_tags=False, hashes=None):
+    '''
+    Parse the configuration lines into a tree, in a single pass.
+    A line is a child of the closest previous line having a lower indentation.
+
+    When ``hashes`` is a dictionary, it is populated with the hash of each
+    block (including the tree itself), indexed by the ``id`` of the block.
+    Two blocks having the same hash have the same content.
+    '''
     struct_cfg = OrderedDict()
-    while config_lines:
-        line = config_lines.pop(0)
+    # the blocks still open, as (indentation, line, children) tuples,
+    # in increasing order of indentation
+    stack = []
+    for line in config_lines:
         if not line.strip() or line.lstrip().startswith('!'):
             # empty or comment
             continue
         current_line = line.lstrip()
         leading_spaces = len(line) - len(current_line)
-        if leading_spaces > current_indent:
-            current_block = _parse_text_config(config_lines,
-                                               current_indent=leading_spaces,
-                                               with_tags=with_tags,
-                                               nested=True)
-            if with_tags:
-                _attach_data_to_path_tags(struct_cfg,
-                                          current_line,
-                                          current_block,
-                                          nested)
-            else:
-                _attach_data_to_path(struct_cfg, current_line, current_block)
-        elif leading_spaces < current_indent:
-            config_lines.insert(0, line)
-            break
-        else:
-            if not nested:
-                current_block = _parse_text_config(config_lines,
-                                                   current_indent=leading_spaces,
-                                                   with_tags=with_tags,
-                                                   nested=True)
-                if with_tags:
-                    _attach_data_to_path_tags(struct_cfg,
-                                              current_line,
-                                              current_block,
-                                              nested)
-                else:
-                    _attach_data_to_path(struct_cfg, current_line, current_block)
-            else:
-                config_lines.insert(0, line)
-                break
+        while stack and stack[-1][0] >= leading_spaces:
+            _attach_block(struct_cfg, stack, with_tags=with_tags, hashes=hashes)
+        stack.append((leading_spaces, current_line, OrderedDict()))
+    while stack:
+        _attach_block(struct_cfg, stack, with_tags=with_tags, hashes=hashes)
+    if hashes is not None and not with_tags:
+        hashes[id(struct_cfg)] = _hash_block(struct_cfg, hashes)
     return struct_cfg
 
 
+def _get_config(config=None, path=None, saltenv='base'):
+    '''
+    Return the configuration text (or iterable of lines), loading it from
+    ``path`` when specified.
+    '''
+    if path:
+        config = __salt__['cp.get_file_str'](path, saltenv=saltenv)
+        if config is False:
+            raise SaltException('{} is not available'.format(path))
+    return config
+
+
+def _get_config_lines(config=None, path=None, saltenv='base'):
+    '''
+    Return the configuration as an iterable of lines.
+    '''
+    config = _get_config(config=config, path=path, saltenv=saltenv)
+    if isinstance(config, six.string_types):
+        return config.splitlines()
+    return config
+
+
+def _get_cached(name, config, build):
+    '''
+    Return the object built by ``build`` from the configuration lines.
+    The most recently built objects are cached in ``__context__``, indexed by
+    the hash of the configuration text: the object returned is shared, and
+    must not be modified. When the configuration is not sent as text, but as
+    an iterable of lines, the object is built without being cached.
+    '''
+    if not isinstance(config, six.string_types):
+        return build(config)
+    key = hashlib.sha1(salt.utils.stringutils.to_bytes(config)).hexdigest()
+    cache = __context__.setdefault('iosconfig.{}'.format(name), OrderedDict())
+    if key in cache:
+        # move to the end, as the most recently used
+        cache[key] = cache.pop(key)
+        return cache[key]
+    cache[key] = build(config.splitlines())
+    while len(cache) > _CACHE_SIZE:
+        cache.popitem(last=False)
+    return cache[key]
+
+
+def _build_tree_hashes(config_lines):
+    '''
+    Return the configuration tree, together with the hashes of its blocks.
+    '''
+    hashes = {}
+    return _parse_text_config(config_lines, hashes=hashes), hashes
+
+
+def _get_tree_hashes(config=None, path=None, saltenv='base'):
+    '''
+    Return the configuration tree, together with the hashes of its blocks,
+    from the cache. The tree returned must not be modified.
+    '''
+    config = _get_config(config=config, path=path, saltenv=saltenv)
+    return _get_cached('trees', config, _build_tree_hashes)
+
+
+def _build_index(config_lines):
+    '''
+    Return the flat index of the configuration lines, as a dictionary of lists,
+    having one element per line (the empty lines are skipped):
+
+    - ``lines``: the configuration lines, as text.
+    - ``indents``: the indentation of the lines.
+    - ``parents``: the position of the parent line, ``-1`` for the top level lines.
+    - ``ends``: the position after the last descendant of the line, i.e., the
+      descendants of the line ``i`` are the lines from ``i + 1`` to ``ends[i] - 1``
+      (besides the comment lines not having a parent), and its children are the
+      lines ``i + 1``, ``ends[i + 1]`` etc.
+
+    As with ``ciscoconfparse``, the comment lines are never parents, and they
+    don't end the block they are found in. An indented comment is a child of
+    the closest previous line having a lower indentation, unless the line right
+    above the comment is indented more than the comment.
+    '''
+    lines, indents, parents, ends = [], [], [], []
+    # the positions of the lines whose descendants are still being indexed
+    stack = []
+    for line in config_lines:
+        if not line.strip():
+            continue
+        indent = len(line) - len(line.lstrip())
+        if line.lstrip().startswith('!'):
+            parent = -1
+            if indent and indents and indents[-1] <= indent:
+                parent = next((position for position in reversed(stack) if indents[position] < indent), -1)
+            parents.append(parent)
+            lines.append(line)
+            indents.append(indent)
+            ends.append(len(lines))
+            continue
+        while stack and indents[stack[-1]] >= indent:
+            ends[stack.pop()] = len(lines)
+        parents.append(stack[-1] if stack else -1)
+        stack.append(len(lines))
+        lines.append(line)
+        indents.append(indent)
+        ends.append(None)
+    for position in stack:
+        ends[position] = len(lines)
+    return {
+        'lines': lines,
+        'indents': indents,
+        'parents': parents,
+        'ends': ends
+    }
+
+
+def _get_index(config=None, path=None, saltenv='base'):
+    '''
+    Return the flat index of the configuration lines, from the cache.
+    '''
+    config = _get_config(config=config, path=path, saltenv=saltenv)
+    return _get_cached('indexes', config, _build_index)
+
+
+def _search_lines(index, regex, ignore_ws=False):
+    '''
+    Return the positions of the lines matching the regular expression.
+    '''
+    if ignore_ws:
+        regex = re.sub(r'\s+', r'\\s+', regex)
+    lines = index['lines']
+    return list(itertools.compress(six.moves.range(len(lines)),
+                                   six.moves.map(re.compile(regex).search, lines)))
+
+
+def _search_children(index, parent_regex, child_regex, ignore_ws=False):
+    '''
+    Return the positions of the lines matching ``parent_regex``, and a dictionary
+    having as keys the positions of the parent lines with children matching
+    ``child_regex``, and the positions of the matched children as values.
+    '''
+    parents = _search_lines(index, parent_regex, ignore_ws=ignore_ws)
+    children = {}
+    for child in _search_lines(index, child_regex, ignore_ws=ignore_ws):
+        children.setdefault(index['parents'][child], []).append(child)
+    return parents, children
+
+
+def _diff_tree(old_tree, old_hashes, new_tree, new_hashes):
+    '''
+    Return the blocks from the ``old_tree`` and the ``new_tree`` that differ,
+    in the same format as :py:func:`salt.utils.dictdiffer.deep_diff`.
+    The blocks having the same hash are skipped, without comparing them.
+    '''
+    ret = {}
+    old_diff = OrderedDict()
+    new_diff = OrderedDict()
+    stack = [(old_tree, new_tree, old_diff, new_diff, None)]
+    while stack:
+        old, new, old_ret, new_ret, changed = stack.pop()
+        if changed is not None:
+            # all the children of the changed blocks have been compared,
+            # discard the blocks that are the same, except the order
+            for key in changed:
+                if not old_ret[key] and not new_ret[key]:
+                    old_ret.pop(key)
+                    new_ret.pop(key)
+            continue
+        changed = []
+        for key, value in six.iteritems(old):
+            if key not in new:
+                old_ret[key] = value
+            elif old_hashes[id(value)] != new_hashes[id(new[key])]:
+                old_ret[key] = OrderedDict()
+                changed.append(key)
+        for key, value in six.iteritems(new):
+            if key not in old:
+                new_ret[key] = value
+            elif key in old_ret:
+                new_ret[key] = OrderedDict()
+        stack.append((None, None, old_ret, new_ret, changed))
+        stack.extend([(old[key], new[key], old_ret[key], new_ret[key], None) for key in changed])
+    if old_diff:
+        ret['old'] = old_diff
+    if new_diff:
+        ret['new'] = new_diff
+    # the diff references blocks from the (cached) trees
+    return copy.deepcopy(ret)
+
+
 def _get_diff_text(old, new):
     '''
     Returns the diff of two text blobs.
@@ -122,16 +334,122 @@ def _get_diff_text(old, new):
     return ''.join([x.replace('\r', '') for x in diff])
 
 
+def _group_opcodes(opcodes, context=3):
+    '''
+    Group the opcodes into hunks, with up to ``context`` lines of context,
+    the same way as :py:meth:`difflib.SequenceMatcher.get_grouped_opcodes`.
+    '''
+    codes = list(opcodes) or [('equal', 0, 1, 0, 1)]
+    if codes[0][0] == 'equal':
+        tag, i1, i2, j1, j2 = codes[0]
+        codes[0] = tag, max(i1, i2 - context), i2, max(j1, j2 - context), j2
+    if codes[-1][0] == 'equal':
+        tag, i1, i2, j1, j2 = codes[-1]
+        codes[-1] = tag, i1, min(i2, i1 + context), j1, min(j2, j1 + context)
+    group = []
+    for tag, i1, i2, j1, j2 in codes:
+        if tag == 'equal' and i2 - i1 > 2 * context:
+            group.append((tag, i1, min(i2, i1 + context), j1, min(j2, j1 + context)))
+            yield group
+            group = []
+            i1, j1 = max(i1, i2 - context), max(j1, j2 - context)
+        group.append((tag, i1, i2, j1, j2))
+    if group and not (len(group) == 1 and group[0][0] == 'equal'):
+        yield group
+
+
+def _format_range(start, stop):
+    '''
+    Return the range of a hunk, in the unified diff format.
+    '''
+    beginning = start + 1
+    length = stop - start
+    if length == 1:
+        return '{}'.format(beginning)
+    if not length:
+        beginning -= 1
+    return '{},{}'.format(beginning, length)
+
+
+def _get_diff_tree_text(old_tree, old_hashes, new_tree, new_hashes):
+    '''
+    Returns the diff, as text, of two config trees.
+    The top level blocks are matched using their hashes, and only the lines
+    of the blocks that differ are compared.
+    '''
+    old_lines, old_offsets = _print_config_blocks(old_tree)
+    new_lines, new_offsets = _print_config_blocks(new_tree)
+    old_blocks = [(key, old_hashes[id(value)]) for key, value in six.iteritems(old_tree)]
+    new_blocks = [(key, new_hashes[id(value)]) for key, value in six.iteritems(new_tree)]
+    line_opcodes = []
+    blocks_matcher = difflib.SequenceMatcher(None, old_blocks, new_blocks, autojunk=False)
+    for tag, i1, i2, j1, j2 in blocks_matcher.get_opcodes():
+        i1, i2, j1, j2 = old_offsets[i1], old_offsets[i2], new_offsets[j1], new_offsets[j2]
+        if tag == 'equal':
+            line_opcodes.append((tag, i1, i2, j1, j2))
+            continue
+        lines_matcher = difflib.SequenceMatcher(None, old_lines[i1:i2], new_lines[j1:j2])
+        line_opcodes.extend([(line_tag, i1 + k1, i1 + k2, j1 + l1, j1 + l2)
+                             for line_tag, k1, k2, l1, l2 in lines_matcher.get_opcodes()])
+    opcodes = []
+    for opcode in line_opcodes:
+        if opcode[0] == 'equal' and opcodes and opcodes[-1][0] == 'equal':
+            # merge the consecutive equal ranges
+            opcodes[-1] = ('equal', opcodes[-1][1], opcode[2], opcodes[-1][3], opcode[4])
+        else:
+            opcodes.append(opcode)
+    diff = []
+    for group in _group_opcodes(opcodes):
+        if not diff:
+            diff.extend(['--- \n', '+++ \n'])
+        diff.append('@@ -{} +{} @@\n'.format(_format_range(group[0][1], group[-1][2]),
+                                             _format_range(group[0][3], group[-1][4])))
+        for tag, i1, i2, j1, j2 in group:
+            if tag == 'equal':
+                diff.extend([' ' + line for line in old_lines[i1:i2]])
+                continue
+            diff.extend(['-' + line for line in old_lines[i1:i2]])
+            diff.extend(['+' + line for line in new_lines[j1:j2]])
+    return ''.join(diff)
+
+
+def _print_config_lines(tree, indentation=0):
+    '''
+    Return the list of lines of the config from a config tree.
+    '''
+    lines = []
+    stack = [(indentation, six.iteritems(tree))]
+    while stack:
+        indent, items = stack[-1]
+        for key, value in items:
+            lines.append('{indent}{line}\n'.format(indent=' '*indent, line=key))
+            if value:
+                stack.append((indent + 1, six.iteritems(value)))
+                break
+        else:
+            stack.pop()
+    return lines
+
+
+def _print_config_blocks(tree):
+    '''
+    Return the list of lines of the config from a config tree, together with
+    the index of the first line of each top level block.
+    '''
+    lines = []
+    offsets = []
+    for key, value in six.iteritems(tree):
+        offsets.append(len(lines))
+        lines.extend(_print_config_lines(OrderedDict([(key, value)])))
+    offsets.append(len(lines))
+    return lines, offsets
+
+
 def _print_config_text(tree, indentation=0):
     '''
     Return the config as text from a config tree.
     '''
-    config = ''
-    for key, value in six.iteritems(tree):
-        config += '{indent}{line}\n'.format(indent=' '*indentation, line=key)
-        if value:
-            config += _print_config_text(value, indentation=indentation+1)
-    return config
+    return ''.join(_print_config_lines(tree, indentation=indentation))
 
 # ------------------------------------------------------------------------------
 # callable functions
@@ -171,11 +489,7 @@ def tree(config=None,
         salt '*' iosconfig.tree path=salt://path/to/my/config.txt
         salt '*' iosconfig.tree path=https://bit.ly/2mAdq7z
     '''
-    if path:
-        config = __salt__['cp.get_file_str'](path, saltenv=saltenv)
-        if config is False:
-            raise SaltException('{} is not available'.format(path))
-    config_lines = config.splitlines()
+    config_lines = _get_config_lines(config=config, path=path, saltenv=saltenv)
     return _parse_text_config(config_lines, with_tags=with_tags)
 
 
@@ -206,7 +520,7 @@ def clean(config=None, path=None, saltenv='base'):
         salt '*' iosconfig.clean path=salt://path/to/my/config.txt
         salt '*' iosconfig.clean path=https://bit.ly/2mAdq7z
     '''
-    config_tree = tree(config=config, path=path, saltenv=saltenv)
+    config_tree, _ = _get_tree_hashes(config=config, path=path, saltenv=saltenv)
     return _print_config_text(config_tree)
 
 
@@ -252,9 +566,10 @@ def merge_tree(initial_config=None,
     merge_tree = tree(config=merge_config,
                       path=merge_path,
                       saltenv=saltenv)
-    initial_tree = tree(config=initial_config,
-                        path=initial_path,
-                        saltenv=saltenv)
+    # the initial tree is copied when merging
+    initial_tree, _ = _get_tree_hashes(config=initial_config,
+                                       path=initial_path,
+                                       saltenv=saltenv)
     return salt.utils.dictupdate.merge(initial_tree, merge_tree)
 
 
@@ -346,11 +661,14 @@ def merge_diff(initial_config=None,
     '''
     if initial_path:
         initial_config = __salt__['cp.get_file_str'](initial_path, saltenv=saltenv)
+    elif not isinstance(initial_config, six.string_types):
+        # the initial config is used twice
+        initial_config = '\n'.join(initial_config)
     candidate_config = merge_text(initial_config=initial_config,
                                   merge_config=merge_config,
                                   merge_path=merge_path,
                                   saltenv=saltenv)
-    clean_running_dict = tree(config=initial_config)
+    clean_running_dict, _ = _get_tree_hashes(config=initial_config)
     clean_running = _print_config_text(clean_running_dict)
     return _get_diff_text(clean_running, candidate_config)
 
@@ -395,13 +713,13 @@ def diff_tree(candidate_config=None,
 
         salt '*' iosconfig.diff_tree candidate_path=salt://path/to/candidate.cfg running_path=salt://path/to/running.cfg
     '''
-    candidate_tree = tree(config=candidate_config,
-                          path=candidate_path,
-                          saltenv=saltenv)
-    running_tree = tree(config=running_config,
-                        path=running_path,
-                        saltenv=saltenv)
-    return salt.utils.dictdiffer.deep_diff(running_tree, candidate_tree)
+    candidate_tree, candidate_hashes = _get_tree_hashes(config=candidate_config,
+                                                        path=candidate_path,
+                                                        saltenv=saltenv)
+    running_tree, running_hashes = _get_tree_hashes(config=running_config,
+                                                    path=running_path,
+                                                    saltenv=saltenv)
+    return _diff_tree(running_tree, running_hashes, candidate_tree, candidate_hashes)
 
 
 def diff_text(candidate_config=None,
@@ -443,10 +761,207 @@ def diff_text(candidate_config=None,
 
         salt '*' iosconfig.diff_text candidate_path=salt://path/to/candidate.cfg running_path=salt://path/to/running.cfg
     '''
-    candidate_text = clean(config=candidate_config,
-                           path=candidate_path,
-                           saltenv=saltenv)
-    running_text = clean(config=running_config,
-                         path=running_path,
-                         saltenv=saltenv)
-    return _get_diff_text(running_text, candidate_text)
+    candidate_tree, candidate_hashes = _get_tree_hashes(config=candidate_config,
+                                                        path=candidate_path,
+                                                        saltenv=saltenv)
+    running_tree, running_hashes = _get_tree_hashes(config=running_config,
+                                                    path=running_path,
+                                                    saltenv=saltenv)
+    if candidate_hashes[id(candidate_tree)] == running_hashes[id(running_tree)]:
+        return ''
+    return _get_diff_tree_text(running_tree, running_hashes, candidate_tree, candidate_hashes)
+
+
+def find_lines(config=None, path=None, regex=None, saltenv='base'):
+    '''
+    .. versionadded:: Fluorine
+
+    Return all the lines (as text) that match the expression in the ``regex``
+    argument, at any indentation level. This function provides the same
+    output as :py:func:`ciscoconfparse.find_lines
+    <salt.modules.ciscoconfparse_mod.find_lines>`, without depending on the
+    ``ciscoconfparse`` library.
+
+    config
+        The configuration sent as text. This argument is ignored when ``path``
+        is configured.
+
+    path
+        Absolute or remote path from where to load the configuration text. This
+        argument allows any URI supported by
+        :py:func:`cp.get_url <salt.modules.cp.get_url>`), e.g., ``salt://``,
+        ``https://``, ``s3://``, ``ftp:/``, etc.
+
+    regex
+        The regular expression to match the lines against.
+
+    saltenv: ``base``
+        Salt fileserver environment from which to retrieve the file.
+        Ignored if ``path`` is not a ``salt://`` URL.
+
+    CLI Example:
+
+    .. code-block:: bash
+
+        salt '*' iosconfig.find_lines path=https://bit.ly/2mAdq7z regex='ip address'
+    '''
+    index = _get_index(config=config, path=path, saltenv=saltenv)
+    return [index['lines'][line] for line in _search_lines(index, regex)]
+
+
+def find_lines_w_child(config=None,
+                       path=None,
+                       parent_regex=None,
+                       child_regex=None,
+                       ignore_ws=False,
+                       saltenv='base'):
+    '''
+    .. versionadded:: Fluorine
+
+    Return the lines (as text) matching the regular expression ``parent_regex``
+    that have children lines matching ``child_regex``. This function provides
+    the same output as :py:func:`ciscoconfparse.find_lines_w_child
+    <salt.modules.ciscoconfparse_mod.find_lines_w_child>`, without depending
+    on the ``ciscoconfparse`` library.
+
+    config
+        The configuration sent as text. This argument is ignored when ``path``
+        is configured.
+
+    path
+        Absolute or remote path from where to load the configuration text. This
+        argument allows any URI supported by
+        :py:func:`cp.get_url <salt.modules.cp.get_url>`), e.g., ``salt://``,
+        ``https://``, ``s3://``, ``ftp:/``, etc.
+
+    parent_regex
+        The regular expression to match the parent lines against.
+
+    child_regex
+        The regular expression to match the child lines against.
+
+    ignore_ws: ``False``
+        Whether to ignore the white spaces.
+
+    saltenv: ``base``
+        Salt fileserver environment from which to retrieve the file.
+        Ignored if ``path`` is not a ``salt://`` URL.
+
+    CLI Example:
+
+    .. code-block:: bash
+
+        salt '*' iosconfig.find_lines_w_child path=https://bit.ly/2mAdq7z parent_regex='line con' child_regex='stopbits'
+    '''
+    index = _get_index(config=config, path=path, saltenv=saltenv)
+    parents, children = _search_children(index, parent_regex, child_regex, ignore_ws=ignore_ws)
+    return [index['lines'][parent] for parent in parents if parent in children]
+
+
+def find_lines_wo_child(config=None,
+                        path=None,
+                        parent_regex=None,
+                        child_regex=None,
+                        ignore_ws=False,
+                        saltenv='base'):
+    '''
+    .. versionadded:: Fluorine
+
+    Return the lines (as text) matching the regular expression ``parent_regex``
+    whose children lines do *not* match ``child_regex``. This function provides
+    the same output as :py:func:`ciscoconfparse.find_lines_wo_child
+    <salt.modules.ciscoconfparse_mod.find_lines_wo_child>`, without depending
+    on the ``ciscoconfparse`` library.
+
+    config
+        The configuration sent as text. This argument is ignored when ``path``
+        is configured.
+
+    path
+        Absolute or remote path from where to load the configuration text. This
+        argument allows any URI supported by
+        :py:func:`cp.get_url <salt.modules.cp.get_url>`), e.g., ``salt://``,
+        ``https://``, ``s3://``, ``ftp:/``, etc.
+
+    parent_regex
+        The regular expression to match the parent lines against.
+
+    child_regex
+        The regular expression to match the child lines against.
+
+    ignore_ws: ``False``
+        Whether to ignore the white spaces.
+
+    saltenv: ``base``
+        Salt fileserver environment from which to retrieve the file.
+        Ignored if ``path`` is not a ``salt://`` URL.
+
+    CLI Example:
+
+    .. code-block:: bash
+
+        salt '*' iosconfig.find_lines_wo_child path=https://bit.ly/2mAdq7z parent_regex='line con' child_regex='stopbits'
+    '''
+    index = _get_index(config=config, path=path, saltenv=saltenv)
+    parents, children = _search_children(index, parent_regex, child_regex, ignore_ws=ignore_ws)
+    return [index['lines'][parent] for parent in parents if parent not in children]
+
+
+def filter_lines(config=None,
+                 path=None,
+                 parent_regex=None,
+                 child_regex=None,
+                 saltenv='base'):
+    '''
+    .. versionadded:: Fluorine
+
+    Return a list of detailed matches, for the configuration blocks whose parent
+    matches ``parent_regex``, and the child matches ``child_regex``. This
+    function provides the same output as :py:func:`ciscoconfparse.filter_lines
+    <salt.modules.ciscoconfparse_mod.filter_lines>`, without depending on the
+    ``ciscoconfparse`` library.
+
+    config
+        The configuration sent as text. This argument is ignored when ``path``
+        is configured.
+
+    path
+        Absolute or remote path from where to load the configuration text. This
+        argument allows any URI supported by
+        :py:func:`cp.get_url <salt.modules.cp.get_url>`), e.g., ``salt://``,
+        ``https://``, ``s3://``, ``ftp:/``, etc.
+
+    parent_regex
+        The regular expression to match the parent lines against.
+
+    child_regex
+        The regular expression to match the child lines against.
+
+    saltenv: ``base``
+        Salt fileserver environment from which to retrieve the file.
+        Ignored if ``path`` is not a ``salt://`` URL.
+
+    CLI Example:
+
+    .. code-block:: bash
+
+        salt '*' iosconfig.filter_lines path=https://bit.ly/2mAdq7z parent_regex='Gigabit' child_regex='shutdown'
+    '''
+    index = _get_index(config=config, path=path, saltenv=saltenv)
+    lines = index['lines']
+    parents, children = _search_children(index, parent_regex, child_regex)
+    ret = []
+    for parent in parents:
+        if parent not in children:
+            ret.append({
+                'match': False,
+                'parent': lines[parent],
+                'child': None
+            })
+            continue
+        ret.extend([{
+            'match': True,
+            'parent': lines[parent],
+            'child': lines[child]
+        } for child in children[parent]])
+    return ret
@@ -10,8 +10,12 @@ Helpers for the NAPALM modules.
 from __future__ import absolute_import, unicode_literals, print_function
 
 # Import python stdlib
+import os
+import time
 import inspect
 import logging
+import threading
+from multiprocessing.pool import ThreadPool
 
 # import NAPALM utils
 import salt.utils.napalm
@@ -40,12 +44,6 @@ try:
 except ImportError:
     HAS_JXMLEASE = False
 
-try:
-    import ciscoconfparse  # pylint: disable=unused-import
-    HAS_CISCOCONFPARSE = True
-except ImportError:
-    HAS_CISCOCONFPARSE = False
-
 try:
     import scp  # pylint: disable=unused-import
     HAS_SCP = True
@@ -60,6 +58,23 @@ __virtualname__ = 'napalm'
 __proxyenabled__ = ['*']
 # uses NAPALM-based proxy to interact with network devices
 
+# for how many seconds the configuration retrieved from the device
+# can be reused by the config_* functions, within the same job
+DEFAULT_CONFIG_CACHE_TTL = 60
+# how many snapshots of the running configuration to keep
+DEFAULT_CONFIG_SNAPSHOTS = 10
+# how many SSH sessions napalm.commands can open in parallel (by default, the
+# commands are executed over the existing connection)
+DEFAULT_COMMANDS_CHANNELS = 1
+
+# the arguments of the Netmiko send_command method
+_NETMIKO_SEND_COMMAND_ARGS = ('expect_string', 'delay_factor', 'max_loops', 'auto_find_prompt',
+                              'strip_prompt', 'strip_command', 'normalize', 'use_textfsm')
+
+# the configuration retrieved by the config_* functions: each job is executed
+# in a separate thread (or process), hence the cache is scoped to the job
+_CONFIG_CACHE = threading.local()
+
 log = logging.getLogger(__file__)
 
 # ----------------------------------------------------------------------------------------------------------------------
@@ -118,6 +133,53 @@ def _get_netmiko_args(optional_args):
     return netmiko_optional_args
 
 
+def _netmiko_send_commands(conn_kwargs, commands, send_kwargs):
+    '''
+    Open a new SSH session, and execute the commands one after another.
+    '''
+    conn = __salt__['netmiko.get_connection'](**conn_kwargs)
+    try:
+        return [conn.send_command(cmd, **send_kwargs) for cmd in commands]
+    finally:
+        conn.disconnect()
+
+
+def _config_cache():
+    '''
+    Return the configuration cache of the current job.
+    '''
+    if getattr(_CONFIG_CACHE, 'pid', None) != os.getpid():
+        # not inherited from the parent process
+        _CONFIG_CACHE.pid = os.getpid()
+        _CONFIG_CACHE.sources = {}
+    return _CONFIG_CACHE.sources
+
+
+def _get_config(*sources):
+    '''
+    Return the configuration text for each of the ``sources``, retrieved from
+    the device using ``net.config``, or from the configuration cache when
+    retrieved by the current job less than ``napalm_config_cache_ttl``
+    seconds ago.
+    '''
+    ttl = __salt__['config.get']('napalm_config_cache_ttl', DEFAULT_CONFIG_CACHE_TTL)
+    cache = _config_cache()
+    now = time.time()
+    for source in sources:
+        if now - cache.get(source, (0, None))[0] < ttl:
+            continue
+        ret = __salt__['net.config'](source=source)
+        if not ret.get('result'):
+            raise CommandExecutionError(ret.get('comment') or 'Unable to retrieve the configuration')
+        cache[source] = (now, ret['out'][source])
+        if source == 'running':
+            __utils__['config_snapshots.add'](__opts__,
+                                              ret['out']['running'],
+                                              max_versions=__salt__['config.get']('napalm_config_snapshots',
+                                                                                  DEFAULT_CONFIG_SNAPSHOTS))
+    return dict((source, cache[source][1]) for source in sources)
+
+
 def _inject_junos_proxy(napalm_device):
     '''
     Inject the junos.conn key into the __proxy__, reusing the existing NAPALM
@@ -615,16 +677,48 @@ def netmiko_commands(*commands, **kwargs):
     use_textfsm: ``False``
         Process command output through TextFSM template (default: ``False``).
 
+    channels: ``1``
+        The number of SSH sessions to open in parallel. The commands are
+        distributed across the sessions, and the output is returned in the
+        order of the commands. When ``1``, the commands are executed over the
+        existing connection.
+
+        .. note::
+            Each additional session requires a new SSH connection to be
+            established, therefore this is worth only for many commands, or
+            commands that are slow to return.
+
     CLI Example:
 
     .. code-block:: bash
 
         salt '*' napalm.netmiko_commands 'show version' 'show interfaces'
-    '''
-    conn = netmiko_conn(**kwargs)
-    ret = []
-    for cmd in commands:
-        ret.append(conn.send_command(cmd))
+        salt '*' napalm.netmiko_commands 'show version' 'show interfaces' 'show ip route' channels=3
+    '''
+    channels = min(int(kwargs.pop('channels', 1)), len(commands))
+    send_kwargs = dict((karg, warg) for karg, warg in six.iteritems(kwargs)
+                       if karg in _NETMIKO_SEND_COMMAND_ARGS)
+    if channels <= 1:
+        conn = netmiko_conn(**kwargs)
+        ret = []
+        for cmd in commands:
+            ret.append(conn.send_command(cmd, **send_kwargs))
+        return ret
+    # the same connection arguments as netmiko_conn
+    conn_kwargs = kwargs.copy()
+    conn_kwargs.update(netmiko_args())
+    # distribute the commands across the sessions: the session N executes the
+    # commands N, N + channels, N + 2 * channels etc.
+    chunks = [commands[index::channels] for index in range(channels)]
+    pool = ThreadPool(channels)
+    try:
+        outputs = pool.map(lambda chunk: _netmiko_send_commands(conn_kwargs, chunk, send_kwargs), chunks)
+    finally:
+        pool.close()
+        pool.join()
+    ret = [None] * len(commands)
+    for index, output in enumerate(outputs):
+        ret[index::channels] = output
     return ret
 
 
@@ -695,8 +789,10 @@ def netmiko_config(*config_commands, **kwargs):
     '''
     netmiko_kwargs = netmiko_args()
     kwargs.update(netmiko_kwargs)
-    return __salt__['netmiko.send_config'](config_commands=config_commands,
-                                           **kwargs)
+    ret = __salt__['netmiko.send_config'](config_commands=config_commands,
+                                          **kwargs)
+    config_cache_clear()
+    return ret
 
 
 @proxy_napalm_wrap
@@ -831,7 +927,9 @@ def junos_commit(**kwargs):
     prep = _junos_prep_fun(napalm_device)  # pylint: disable=undefined-variable
     if not prep['result']:
         return prep
-    return __salt__['junos.commit'](**kwargs)
+    ret = __salt__['junos.commit'](**kwargs)
+    config_cache_clear()
+    return ret
 
 
 @proxy_napalm_wrap
@@ -1170,13 +1268,15 @@ def pyeapi_config(commands=None,
         salt '*' napalm.pyeapi_config 'ntp server 1.2.3.4'
    '''
     pyeapi_kwargs = pyeapi_nxos_api_args(**kwargs)
-    return __salt__['pyeapi.config'](commands=commands,
-                                     config_file=config_file,
-                                     template_engine=template_engine,
-                                     context=context,
-                                     defaults=defaults,
-                                     saltenv=saltenv,
-                                     **pyeapi_kwargs)
+    ret = __salt__['pyeapi.config'](commands=commands,
+                                    config_file=config_file,
+                                    template_engine=template_engine,
+                                    context=context,
+                                    defaults=defaults,
+                                    saltenv=saltenv,
+                                    **pyeapi_kwargs)
+    config_cache_clear()
+    return ret
 
 
 @proxy_napalm_wrap
@@ -1260,13 +1360,15 @@ def nxos_api_config(commands=None,
         salt '*' napalm.nxos_api_config config_file=https://bit.ly/2LGLcDy context="{'servers': ['1.2.3.4']}"
     '''
     nxos_api_kwargs = pyeapi_nxos_api_args(**kwargs)
-    return __salt__['nxos_api.config'](commands=commands,
-                                       config_file=config_file,
-                                       template_engine=template_engine,
-                                       context=context,
-                                       defaults=defaults,
-                                       saltenv=saltenv,
-                                       **nxos_api_kwargs)
+    ret = __salt__['nxos_api.config'](commands=commands,
+                                      config_file=config_file,
+                                      template_engine=template_engine,
+                                      context=context,
+                                      defaults=defaults,
+                                      saltenv=saltenv,
+                                      **nxos_api_kwargs)
+    config_cache_clear()
+    return ret
 
 
 @proxy_napalm_wrap
@@ -1316,6 +1418,11 @@ def rpc(command, **kwargs):
         The RPC command to execute. This depends on the nature of the operating
         system.
 
+        .. versionchanged:: Fluorine
+            When a list of commands is passed, they are executed through
+            :py:func:`napalm.commands <salt.modules.napalm_mod.commands>`, and
+            the list of outputs is returned, in the order of the commands.
+
     kwargs
         Key-value arguments to be sent to the underlying Execution function.
 
@@ -1341,6 +1448,8 @@ def rpc(command, **kwargs):
         salt '*' napalm.rpc 'show version'
         salt '*' napalm.rpc get-interfaces
     '''
+    if isinstance(command, (list, tuple)):
+        return commands(*command, **kwargs)
     default_map = {
         'junos': 'napalm.junos_rpc',
         'eos': 'napalm.pyeapi_run_commands',
@@ -1352,7 +1461,122 @@ def rpc(command, **kwargs):
     return __salt__[fun](command, **kwargs)
 
 
-@depends(HAS_CISCOCONFPARSE)
+@proxy_napalm_wrap
+def commands(*commands, **kwargs):
+    '''
+    .. versionadded:: Fluorine
+
+    Execute one or more (show) commands on the network device, using the
+    fastest transport available for the platform, and return the list of
+    outputs, one for each command, in the order of the commands:
+
+    - ``eos``: all the commands are sent in a single eAPI request, via
+      :py:func:`napalm.pyeapi_run_commands <salt.modules.napalm_mod.pyeapi_run_commands>`.
+      Each output is the structured document returned by the device, or the
+      text, when ``raw_text`` is ``True``.
+    - ``nxos``: all the commands are sent in a single NX-API request, via
+      :py:func:`napalm.nxos_api_rpc <salt.modules.napalm_mod.nxos_api_rpc>`.
+      Each output is the structured document (the ``body`` of the NX-API
+      response), or the text, when ``raw_text`` is ``True``.
+    - ``junos``: the RPC requests are executed one after another, over the
+      existing NETCONF session, via
+      :py:func:`napalm.junos_rpc <salt.modules.napalm_mod.junos_rpc>`. Each
+      output is the RPC reply, as a dictionary, or the text, when
+      ``raw_text`` is ``True``.
+    - any other platform: the commands are executed via
+      :py:func:`napalm.netmiko_commands <salt.modules.napalm_mod.netmiko_commands>`,
+      and each output is the text returned by the device. By default, the
+      commands are executed over the existing connection; they can be
+      distributed across several SSH sessions opened in parallel, using the
+      ``channels`` argument, or the ``napalm_commands_channels`` configuration
+      option / Pillar (default: ``1``).
+
+    commands
+        The commands to execute.
+
+    raw_text: ``False``
+        Return the text output of the commands, instead of structured data,
+        when the platform supports both.
+
+    kwargs
+        Key-value arguments to be sent to the underlying Execution function.
+
+    CLI Example:
+
+    .. code-block:: bash
+
+        salt '*' napalm.commands 'show version' 'show interfaces' 'show ip route'
+        salt '*' napalm.commands 'show version' 'show interfaces' raw_text=True
+    '''
+    raw_text = kwargs.pop('raw_text', False)
+    if not commands:
+        return []
+    if __grains__['os'] == 'eos':
+        if raw_text:
+            kwargs['encoding'] = 'text'
+        return pyeapi_run_commands(*commands, **kwargs)
+    if __grains__['os'] == 'nxos':
+        method, key = ('cli_ascii', 'msg') if raw_text else ('cli', 'body')
+        ret = []
+        for response in nxos_api_rpc(list(commands), method=method, **kwargs):
+            if response.get('error'):
+                error = response['error']
+                raise CommandExecutionError('Unable to execute {0}: {1}'.format(
+                    response['command'],
+                    (error.get('data') or {}).get('msg') or error.get('message')))
+            ret.append((response.get('result') or {}).get(key))
+        return ret
+    if __grains__['os'] == 'junos':
+        if raw_text:
+            kwargs['format'] = 'text'
+        ret = []
+        for cmd in commands:
+            rpc_ret = junos_rpc(cmd, **kwargs)
+            if not rpc_ret['result']:
+                raise CommandExecutionError('Unable to execute {0}: {1}'.format(cmd, rpc_ret['comment']))
+            ret.append(rpc_ret['out'])
+        return ret
+    kwargs.setdefault('channels', __salt__['config.get']('napalm_commands_channels',
+                                                         DEFAULT_COMMANDS_CHANNELS))
+    return netmiko_commands(*commands, **kwargs)
+
+
+def config_cache_clear(source=None):
+    '''
+    .. versionadded:: Fluorine
+
+    Clear the cache of the configuration retrieved from the device by the
+    ``config_*`` functions. The configuration is retrieved again from the
+    device on the next call.
+
+    The configuration is cached only for the duration of the job, up to
+    ``napalm_config_cache_ttl`` seconds (default: ``60``), and the cache is
+    cleared whenever the configuration is loaded, committed, discarded or
+    rolled back through Salt.
+    Set ``napalm_config_cache_ttl`` to ``0`` to always retrieve the
+    configuration from the device.
+
+    source
+        Clear only the cache of this configuration source, e.g., ``candidate``.
+        When not specified, the cache is cleared for all the sources, and the
+        most recent snapshot of the running configuration (see
+        :mod:`net.config_snapshots <salt.modules.napalm_network.config_snapshots>`)
+        is invalidated.
+
+    CLI Example:
+
+    .. code-block:: bash
+
+        salt '*' napalm.config_cache_clear
+    '''
+    if source:
+        _config_cache().pop(source, None)
+        return True
+    _config_cache().clear()
+    __utils__['config_snapshots.invalidate'](__opts__)
+    return True
+
+
 def config_find_lines(regex, source='running'):
     r'''
     .. versionadded:: Fluorine
@@ -1374,12 +1598,11 @@ def config_find_lines(regex, source='running'):
 
         salt '*' napalm.config_find_lines '^interface Ethernet1\d'
     '''
-    config_txt = __salt__['net.config'](source=source)['out'][source]
+    config_txt = _get_config(source)[source]
     return __salt__['ciscoconfparse.find_lines'](config=config_txt,
                                                  regex=regex)
 
 
-@depends(HAS_CISCOCONFPARSE)
 def config_lines_w_child(parent_regex, child_regex, source='running'):
     r'''
      .. versionadded:: Fluorine
@@ -1389,9 +1612,10 @@ def config_lines_w_child(parent_regex, child_regex, source='running'):
     The configuration is read from the network device interrogated.
 
     .. note::
-        This function is only available only when the underlying library
+        This function uses the underlying library
         `ciscoconfparse <http://www.pennington.net/py/ciscoconfparse/index.html>`_
-        is installed. See
+        when installed, otherwise the native line index from the
+        :py:mod:`iosconfig module <salt.modules.iosconfig>`. See
         :py:func:`ciscoconfparse module <salt.modules.ciscoconfparse_mod>` for
         more details.
 
@@ -1412,13 +1636,12 @@ def config_lines_w_child(parent_regex, child_regex, source='running'):
         salt '*' napalm.config_lines_w_child '^interface' 'ip address'
         salt '*' napalm.config_lines_w_child '^interface' 'shutdown' source=candidate
     '''
-    config_txt = __salt__['net.config'](source=source)['out'][source]
+    config_txt = _get_config(source)[source]
     return __salt__['ciscoconfparse.find_lines_w_child'](config=config_txt,
                                                          parent_regex=parent_regex,
                                                          child_regex=child_regex)
 
 
-@depends(HAS_CISCOCONFPARSE)
 def config_lines_wo_child(parent_regex, child_regex, source='running'):
     '''
       .. versionadded:: Fluorine
@@ -1429,9 +1652,10 @@ def config_lines_wo_child(parent_regex, child_regex, source='running'):
     The configuration is read from the network device interrogated.
 
     .. note::
-        This function is only available only when the underlying library
+        This function uses the underlying library
         `ciscoconfparse <http://www.pennington.net/py/ciscoconfparse/index.html>`_
-        is installed. See
+        when installed, otherwise the native line index from the
+        :py:mod:`iosconfig module <salt.modules.iosconfig>`. See
         :py:func:`ciscoconfparse module <salt.modules.ciscoconfparse_mod>` for
         more details.
 
@@ -1452,13 +1676,12 @@ def config_lines_wo_child(parent_regex, child_regex, source='running'):
         salt '*' napalm.config_lines_wo_child '^interface' 'ip address'
         salt '*' napalm.config_lines_wo_child '^interface' 'shutdown' source=candidate
     '''
-    config_txt = __salt__['net.config'](source=source)['out'][source]
+    config_txt = _get_config(source)[source]
     return __salt__['ciscoconfparse.find_lines_wo_child'](config=config_txt,
                                                           parent_regex=parent_regex,
                                                           child_regex=child_regex)
 
 
-@depends(HAS_CISCOCONFPARSE)
 def config_filter_lines(parent_regex, child_regex, source='running'):
     r'''
     .. versionadded:: Fluorine
@@ -1476,9 +1699,10 @@ def config_filter_lines(parent_regex, child_regex, source='running'):
       will be ``None``.
 
     .. note::
-        This function is only available only when the underlying library
+        This function uses the underlying library
         `ciscoconfparse <http://www.pennington.net/py/ciscoconfparse/index.html>`_
-        is installed. See
+        when installed, otherwise the native line index from the
+        :py:mod:`iosconfig module <salt.modules.iosconfig>`. See
         :py:func:`ciscoconfparse module <salt.modules.ciscoconfparse_mod>` for
         more details.
 
@@ -1499,7 +1723,7 @@ def config_filter_lines(parent_regex, child_regex, source='running'):
         salt '*' napalm.config_filter_lines '^interface' 'ip address'
         salt '*' napalm.config_filter_lines '^interface' 'shutdown' source=candidate
     '''
-    config_txt = __salt__['net.config'](source=source)['out'][source]
+    config_txt = _get_config(source)[source]
     return __salt__['ciscoconfparse.filter_lines'](config=config_txt,
                                                    parent_regex=parent_regex,
                                                    child_regex=child_regex)
@@ -1526,7 +1750,7 @@ def config_tree(source='running', with_tags=False):
 
         salt '*' napalm.config_tree
     '''
-    config_txt = __salt__['net.config'](source=source)['out'][source]
+    config_txt = _get_config(source)[source]
     return __salt__['iosconfig.tree'](config=config_txt)
 
 
@@ -1564,7 +1788,7 @@ def config_merge_tree(source='running',
 
         salt '*' napalm.config_merge_tree merge_path=salt://path/to/merge.cfg
     '''
-    config_txt = __salt__['net.config'](source=source)['out'][source]
+    config_txt = _get_config(source)[source]
     return __salt__['iosconfig.merge_tree'](initial_config=config_txt,
                                             merge_config=merge_config,
                                             merge_path=merge_path,
@@ -1606,7 +1830,7 @@ def config_merge_text(source='running',
 
         salt '*' napalm.config_merge_text merge_path=salt://path/to/merge.cfg
     '''
-    config_txt = __salt__['net.config'](source=source)['out'][source]
+    config_txt = _get_config(source)[source]
     return __salt__['iosconfig.merge_text'](initial_config=config_txt,
                                             merge_config=merge_config,
                                             merge_path=merge_path,
@@ -1647,7 +1871,7 @@ def config_merge_diff(source='running',
 
         salt '*' napalm.config_merge_diff merge_path=salt://path/to/merge.cfg
     '''
-    config_txt = __salt__['net.config'](source=source)['out'][source]
+    config_txt = _get_config(source)[source]
     return __salt__['iosconfig.merge_diff'](initial_config=config_txt,
                                             merge_config=merge_config,
                                             merge_path=merge_path,
@@ -1708,7 +1932,7 @@ def config_diff_tree(source1='candidate',
         salt '*' napalm.config_diff_tree
         salt '*' napalm.config_diff_tree running startup
     '''
-    get_config = __salt__['net.config']()['out']
+    get_config = _get_config(source1, source2)
     candidate_cfg = get_config[source1]
     running_cfg = get_config[source2]
     return __salt__['iosconfig.diff_tree'](candidate_config=candidate_cfg,
@@ -1764,7 +1988,7 @@ def config_diff_text(source1='candidate',
         # Would compare the running config with the configuration available at
         # https://bit.ly/2mAdq7z
     '''
-    get_config = __salt__['net.config']()['out']
+    get_config = _get_config(source1, source2)
     candidate_cfg = get_config[source1]
     running_cfg = get_config[source2]
     return __salt__['iosconfig.diff_text'](candidate_config=candidate_cfg,
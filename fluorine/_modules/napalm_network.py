@@ -22,9 +22,15 @@ Dependencies
 # Import Python libs
 from __future__ import absolute_import, unicode_literals, print_function
 
+import re
+import json
 import time
+import hashlib
 import logging
 import datetime
+import tempfile
+import posixpath
+from collections import OrderedDict
 
 log = logging.getLogger(__name__)
 
@@ -32,6 +38,7 @@ log = logging.getLogger(__name__)
 from salt.ext import six
 import salt.utils.files
 import salt.utils.napalm
+import salt.utils.stringutils
 import salt.utils.versions
 import salt.utils.templates
 
@@ -51,6 +58,27 @@ __proxyenabled__ = ['*']
 __virtual_aliases__ = ('napalm_net',)
 # uses NAPALM-based proxy to interact with network devices
 
+# the size (in bytes) up to which the configuration returned by config_lines
+# is kept in memory, before being written to a temporary file on the disk
+DEFAULT_CONFIG_SPOOL_SIZE = 1024 * 1024
+# the size of the chunks written into the spooled file
+_CONFIG_SPOOL_CHUNK_SIZE = 64 * 1024
+# for how many seconds a snapshot of the running configuration can be reused
+# as the backup restored by revert_in / revert_at (disabled by default, as the
+# changes not made through Salt are not detected)
+DEFAULT_CONFIG_SNAPSHOT_TTL = 0
+# how many snapshots of the running configuration to keep
+DEFAULT_CONFIG_SNAPSHOTS = 10
+# how many rendered templates to keep in memory (disabled by default); the
+# rendered output is cached, as the Salt renderers build a new Jinja
+# environment for every template, and don't expose the compiled templates
+DEFAULT_TEMPLATE_CACHE_SIZE = 0
+# the templates pulled in by a Jinja template (include, import, extends, from,
+# and the Salt import_yaml, import_json, import_text tags)
+_JINJA_DEPENDENCY_RE = re.compile(r'{%[-+]?\s*(?:include|import|import_yaml|import_json|import_text|extends|from)'
+                                  r'\s+([^\s%]+)')
+_STRING_LITERAL_RE = re.compile(r'^([\'"])(.+)\1$')
+
 # ----------------------------------------------------------------------------------------------------------------------
 # property functions
 # ----------------------------------------------------------------------------------------------------------------------
@@ -158,6 +186,373 @@ def _explicit_close(napalm_device):
             log.error('Please report.')
 
 
+def _spool_config(config_txt):
+    '''
+    Write the configuration text, in chunks, into a spooled temporary file
+    and return the file, rewound.
+    '''
+    spool_size = __salt__['config.get']('napalm_config_spool_size', DEFAULT_CONFIG_SPOOL_SIZE)
+    spool = tempfile.SpooledTemporaryFile(max_size=spool_size)
+    for start in six.moves.range(0, len(config_txt), _CONFIG_SPOOL_CHUNK_SIZE):
+        spool.write(salt.utils.stringutils.to_bytes(config_txt[start:start + _CONFIG_SPOOL_CHUNK_SIZE]))
+    spool.seek(0)
+    return spool
+
+
+def _iter_config_lines(spool):
+    '''
+    Iterate over the lines (without the line endings) of the spooled
+    configuration, then close the file.
+    '''
+    try:
+        for line in spool:
+            yield salt.utils.stringutils.to_unicode(line).rstrip('\r\n')
+    finally:
+        spool.close()
+
+
+def _get_running_config():
+    '''
+    Retrieve the running configuration from the device and store it as a new
+    snapshot. The most recent snapshot is reused instead only when
+    ``napalm_config_snapshot_ttl`` is set, and the snapshot is still valid:
+    the configuration changes not made through Salt are not detected.
+    '''
+    ttl = __salt__['config.get']('napalm_config_snapshot_ttl', DEFAULT_CONFIG_SNAPSHOT_TTL)
+    running_config = __utils__['config_snapshots.latest'](__opts__, ttl=ttl) if ttl else None
+    if running_config is None:
+        running_config = __salt__['net.config'](source='running')['out']['running']
+        __utils__['config_snapshots.add'](__opts__,
+                                          running_config,
+                                          max_versions=__salt__['config.get']('napalm_config_snapshots',
+                                                                              DEFAULT_CONFIG_SNAPSHOTS))
+    return running_config
+
+
+def _read_template(template_name, saltenv='base'):
+    '''
+    Return the source of a ``salt://`` or local template, or ``None`` when
+    not available.
+    '''
+    if template_name.startswith('salt://'):
+        # fetched again from the fileserver only when changed
+        return __salt__['cp.get_file_str'](template_name, saltenv=saltenv) or None
+    if __salt__['file.file_exists'](template_name):
+        return __salt__['file.read'](template_name)
+    return None
+
+
+def _template_dependency_name(template_name, dependency):
+    '''
+    Return the ``salt://`` URL of a template pulled in by another template,
+    or ``None`` when it cannot be determined.
+    '''
+    if dependency.startswith('salt://'):
+        return dependency
+    if dependency.startswith(('./', '../')):
+        # relative to the including template
+        if not template_name or not template_name.startswith('salt://'):
+            return None
+        return 'salt://' + posixpath.normpath(posixpath.join(posixpath.dirname(template_name[7:]), dependency))
+    return 'salt://' + dependency.lstrip('/')
+
+
+def _template_source_hash(template_name,
+                          template_source=None,
+                          template_hash=None,
+                          template_engine='jinja',
+                          saltenv='base'):
+    '''
+    Return the hash of the template source, together with the sources of the
+    templates it pulls in through the Jinja ``include``, ``import``,
+    ``extends`` etc. tags, recursively. Returns ``None`` when the hash cannot
+    be determined (e.g., the name of an included template is computed at
+    render time, or remote templates when ``template_hash`` is not specified).
+    '''
+    if template_source is None and not template_name.startswith('salt://') and\
+            not __salt__['file.file_exists'](template_name):
+        # remote template: the included templates cannot be determined
+        # without fetching it
+        if template_hash and isinstance(template_hash, dict):
+            return template_hash.get('hsum')
+        if template_hash and isinstance(template_hash, six.string_types) and\
+                not template_hash.startswith(('salt://', 'file://')):
+            return template_hash
+        return None
+    sources = []
+    pending = [(template_name, template_source)]
+    seen = set([template_name])
+    while pending:
+        name, source = pending.pop(0)
+        if source is None:
+            source = _read_template(name, saltenv=saltenv)
+            if source is None:
+                return None
+        sources.append([name, source])
+        if template_engine != 'jinja':
+            continue
+        for dependency in _JINJA_DEPENDENCY_RE.findall(source):
+            literal = _STRING_LITERAL_RE.match(dependency)
+            dependency_name = _template_dependency_name(name, literal.group(2)) if literal else None
+            if dependency_name is None:
+                log.debug('Unable to determine the templates included by %s', name or 'the inline template')
+                return None
+            if dependency_name not in seen:
+                seen.add(dependency_name)
+                pending.append((dependency_name, None))
+    return hashlib.sha1(salt.utils.stringutils.to_bytes(json.dumps(sources))).hexdigest()
+
+
+def _template_cache_key(source_hash, template_engine, context, defaults, saltenv):
+    '''
+    Return the key of the rendered template in the cache: the hash of the
+    template source together with everything that is sent to the rendering
+    system. Returns ``None`` when the rendering context cannot be serialized.
+    '''
+    if not source_hash:
+        return None
+    try:
+        rendering_input = json.dumps([source_hash,
+                                      template_engine,
+                                      saltenv,
+                                      context,
+                                      defaults,
+                                      __grains__,
+                                      __pillar__],
+                                     sort_keys=True,
+                                     default=repr)
+    except (TypeError, ValueError):
+        return None
+    return hashlib.sha1(salt.utils.stringutils.to_bytes(rendering_input)).hexdigest()
+
+
+def _template_cache_get(key):
+    '''
+    Return the rendered template from the cache, or ``None``, and update the
+    cache statistics.
+    '''
+    stats = __context__.setdefault('net.template_cache_stats', {'hits': 0, 'misses': 0})
+    cache = __context__.setdefault('net.template_cache', OrderedDict())
+    if key not in cache:
+        stats['misses'] += 1
+        return None
+    stats['hits'] += 1
+    # move to the end, as the most recently used
+    cache[key] = cache.pop(key)
+    return cache[key]
+
+
+def _template_cache_store(key, rendered, cache_size):
+    '''
+    Store the rendered template in the cache, evicting the least recently
+    used templates.
+    '''
+    cache = __context__.setdefault('net.template_cache', OrderedDict())
+    cache[key] = rendered
+    while len(cache) > cache_size:
+        cache.popitem(last=False)
+
+
+def _render_template(template_name,
+                     template_source=None,
+                     context=None,
+                     defaults=None,
+                     template_engine='jinja',
+                     saltenv='base',
+                     template_hash=None,
+                     template_hash_name=None,
+                     skip_verify=False):
+    '''
+    Render the configuration template(s) using the Salt rendering system.
+    Returns a dictionary having the rendered text under the ``out`` key.
+    '''
+    _rendered = ''
+    _loaded = {
+        'result': True,
+        'comment': '',
+        'out': None
+    }
+    if template_engine not in salt.utils.templates.TEMPLATE_REGISTRY:
+        _loaded.update({
+            'result': False,
+            'comment': 'Invalid templating engine! Choose between: {tpl_eng_opts}'.format(
+                tpl_eng_opts=', '.join(list(salt.utils.templates.TEMPLATE_REGISTRY.keys()))
+            )
+        })
+        return _loaded  # exit
+
+    template_cache_size = __salt__['config.get']('napalm_template_cache_size',
+                                                 DEFAULT_TEMPLATE_CACHE_SIZE)
+    # if needed to render the template send as inline arg
+    if template_source:
+        cache_key = None
+        if template_cache_size:
+            source_hash = _template_source_hash(None,
+                                                template_source=template_source,
+                                                template_engine=template_engine,
+                                                saltenv=saltenv)
+            cache_key = _template_cache_key(source_hash, template_engine, context, defaults, saltenv)
+        _rendered = _template_cache_get(cache_key) if cache_key else None
+        if _rendered is None:
+            # render the content
+            _rendered = __salt__['file.apply_template_on_contents'](
+                contents=template_source,
+                template=template_engine,
+                context=context,
+                defaults=defaults,
+                saltenv=saltenv
+            )
+            if not isinstance(_rendered, six.string_types):
+                if 'result' in _rendered:
+                    _loaded['result'] = _rendered['result']
+                else:
+                    _loaded['result'] = False
+                if 'comment' in _rendered:
+                    _loaded['comment'] = _rendered['comment']
+                else:
+                    _loaded['comment'] = 'Error while rendering the template.'
+                return _loaded
+            if cache_key:
+                _template_cache_store(cache_key, _rendered, template_cache_size)
+    else:
+        # render the file - either local, either remote
+        if not isinstance(template_name, (list, tuple)):
+            template_name = [template_name]
+        if template_hash_name and not isinstance(template_hash_name, (list, tuple)):
+            template_hash_name = [template_hash_name]
+        elif not template_hash_name:
+            template_hash_name = [None] * len(template_name)
+        if template_hash and isinstance(template_hash, six.string_types) and not\
+                (template_hash.startswith('salt://') or template_hash.startswith('file://')):
+            # If the template hash is passed as string, and it's not a file
+            # (starts with the salt:// or file:// URI), then make it a list
+            # of 1 element (for the iteration below)
+            template_hash = [template_hash]
+        elif template_hash and isinstance(template_hash, six.string_types) and\
+                (template_hash.startswith('salt://') or template_hash.startswith('file://')):
+            # If the template hash is a file URI, then provide the same value
+            # for each of the templates in the list, as probably they all
+            # share the same hash file, otherwise the user should provide
+            # this as a list
+            template_hash = [template_hash] * len(template_name)
+        elif not template_hash:
+            template_hash = [None] * len(template_name)
+        for tpl_index, tpl_name in enumerate(template_name):
+            tpl_hash = template_hash[tpl_index]
+            tpl_hash_name = template_hash_name[tpl_index]
+            cache_key = None
+            if template_cache_size:
+                source_hash = _template_source_hash(tpl_name,
+                                                    template_hash=tpl_hash,
+                                                    template_engine=template_engine,
+                                                    saltenv=saltenv)
+                cache_key = _template_cache_key(source_hash,
+                                                template_engine,
+                                                context,
+                                                defaults,
+                                                saltenv)
+                _tpl_rendered = _template_cache_get(cache_key) if cache_key else None
+                if _tpl_rendered is not None:
+                    # same template source, rendered with the same data
+                    _rendered += _tpl_rendered
+                    continue
+            _rand_filename = __salt__['random.hash'](tpl_name, 'md5')
+            _temp_file = __salt__['file.join']('/tmp', _rand_filename)
+            _managed = __salt__['file.get_managed'](name=_temp_file,
+                                                    source=tpl_name,
+                                                    source_hash=tpl_hash,
+                                                    source_hash_name=tpl_hash_name,
+                                                    user=None,
+                                                    group=None,
+                                                    mode=None,
+                                                    attrs=None,
+                                                    template=template_engine,
+                                                    context=context,
+                                                    defaults=defaults,
+                                                    saltenv=saltenv,
+                                                    skip_verify=skip_verify)
+            if not isinstance(_managed, (list, tuple)) and isinstance(_managed, six.string_types):
+                _loaded['comment'] += _managed
+                _loaded['result'] = False
+            elif isinstance(_managed, (list, tuple)) and not len(_managed) > 0:
+                _loaded['result'] = False
+                _loaded['comment'] += 'Error while rendering the template.'
+            elif isinstance(_managed, (list, tuple)) and not len(_managed[0]) > 0:
+                _loaded['result'] = False
+                _loaded['comment'] += _managed[-1]  # contains the error message
+            if _loaded['result']:  # all good
+                _temp_tpl_file = _managed[0]
+                _temp_tpl_file_exists = __salt__['file.file_exists'](_temp_tpl_file)
+                if not _temp_tpl_file_exists:
+                    _loaded['result'] = False
+                    _loaded['comment'] += 'Error while rendering the template.'
+                    return _loaded
+                _tpl_rendered = __salt__['file.read'](_temp_tpl_file)
+                __salt__['file.remove'](_temp_tpl_file)
+                _rendered += _tpl_rendered
+                if cache_key:
+                    _template_cache_store(cache_key, _tpl_rendered, template_cache_size)
+            else:
+                return _loaded  # exit
+    _loaded['out'] = _rendered
+    return _loaded
+
+
+def _split_diff_hunks(diff):
+    '''
+    Split the configuration diff into hunks. A hunk starts at a header line
+    (e.g., ``@@ -1,4 +1,5 @@`` or ``[edit system]``), or, when the diff has
+    no headers, at each line that is not indented.
+    '''
+    lines = [line for line in diff.splitlines() if not line.startswith(('---', '+++'))]
+    has_headers = any(line.startswith(('@@', '[edit')) for line in lines)
+    hunks = []
+    for line in lines:
+        if has_headers:
+            new_hunk = line.startswith(('@@', '[edit'))
+        else:
+            new_hunk = line[1:2] not in (' ', '\t')
+        if new_hunk or not hunks:
+            hunks.append([])
+        hunks[-1].append(line)
+    return ['\n'.join(hunk) for hunk in hunks]
+
+
+def _attribute_diff(diff, rendered):
+    '''
+    Attribute each hunk of the configuration diff to the template that caused
+    it: the template whose rendered configuration contains most of the lines
+    added or removed by the hunk. A line found as such in the rendered
+    configuration (or negated, e.g., ``no ntp server 1.2.3.4``) weighs more
+    than a line only found as a substring (e.g., in the curly-brace syntax
+    rendered on a single line). ``rendered`` is an ordered dictionary of the
+    rendered configuration, indexed by the name of the template. Returns a
+    dictionary with the diff of each template; the hunks that cannot be
+    attributed are attributed to the first template.
+    '''
+    rendered_lines = OrderedDict()
+    for name, config in six.iteritems(rendered):
+        rendered_lines[name] = set(line.strip() for line in config.splitlines())
+    attributed = OrderedDict((name, []) for name in rendered)
+    if not attributed:
+        return {}
+    for hunk in _split_diff_hunks(diff or ''):
+        changed = [line[1:].strip() for line in hunk.splitlines() if line.startswith(('+', '-'))]
+        changed = [line for line in changed if line]
+        best_name, best_score = next(iter(attributed)), 0
+        for name, lines in six.iteritems(rendered_lines):
+            score = 0
+            for line in changed:
+                if line in lines or 'no {}'.format(line) in lines:
+                    score += 2
+                elif line in rendered[name]:
+                    score += 1
+            if score > best_score:
+                best_name, best_score = name, score
+        attributed[best_name].append(hunk)
+    return dict((name, '\n'.join(hunks)) for name, hunks in six.iteritems(attributed))
+
+
 def _config_logic(napalm_device,
                   loaded_result,
                   test=False,
@@ -193,6 +588,8 @@ def _config_logic(napalm_device,
         current_jid = '{0:%Y%m%d%H%M%S%f}'.format(datetime.datetime.now())
 
     loaded_result['already_configured'] = False
+    # the candidate configuration has been changed
+    __salt__['napalm.config_cache_clear'](source='candidate')
 
     loaded_result['loaded_config'] = ''
     if debug:
@@ -299,7 +696,7 @@ def _config_logic(napalm_device,
                             return loaded_result
                 else:
                     temp_file = salt.utils.files.mkstemp()
-                    running_config = __salt__['net.config'](source='running')['out']['running']
+                    running_config = _get_running_config()
                     with salt.utils.files.fopen(temp_file, 'w') as fp_:
                         fp_.write(running_config)
                     committed = _safe_commit_config(loaded_result, napalm_device)
@@ -1242,6 +1639,54 @@ def config(source=None, **kwargs):  # pylint: disable=unused-argument
     )
 
 
+@salt.utils.napalm.proxy_napalm_wrap
+def config_lines(source='running', **kwargs):  # pylint: disable=unused-argument
+    '''
+    .. versionadded:: Fluorine
+
+    Return the configuration of the network device as an iterator over its
+    lines, under the ``out`` key. Unlike :mod:`net.config <salt.modules.napalm_network.config>`,
+    the configuration is not kept as a string: it is written into a spooled
+    temporary file, held in memory up to ``napalm_config_spool_size`` bytes
+    (default: 1MB) and moved to the disk beyond that, then read line by line.
+
+    The iterator can be consumed only once, and is mostly valuable when
+    invoked from other Salt components (i.e., execution modules, states,
+    templates etc.), e.g., it can be passed as the ``config`` argument to the
+    :mod:`iosconfig <salt.modules.iosconfig>` and
+    :mod:`ciscoconfparse <salt.modules.ciscoconfparse_mod>` functions.
+    When executed as a job (e.g., from the CLI), the return must be
+    serializable, hence the list of lines is returned instead.
+
+    source: ``running``
+        Which configuration type to retrieve: ``running``, ``candidate``,
+        or ``startup``.
+
+    Usage example:
+
+    .. code-block:: python
+
+        config_lines = __salt__['net.config_lines'](source='running')['out']
+        config_tree = __salt__['iosconfig.tree'](config=config_lines)
+    '''
+    ret = salt.utils.napalm.call(
+        napalm_device,  # pylint: disable=undefined-variable
+        'get_config',
+        **{
+            'retrieve': source
+        }
+    )
+    if not ret.get('result', False):
+        return ret
+    # releasing the string as soon as it is spooled
+    config_lines = _iter_config_lines(_spool_config(ret.pop('out')[source]))
+    if kwargs.get('__pub_jid'):
+        # executed as a job, the return is serialized
+        config_lines = list(config_lines)
+    ret['out'] = config_lines
+    return ret
+
+
 @salt.utils.napalm.proxy_napalm_wrap
 def optics(**kwargs):  # pylint: disable=unused-argument
     '''
@@ -1811,6 +2256,26 @@ def load_template(template_name=None,
             It is more recommended to use the ``context`` argument to avoid
             conflicts between CLI arguments and template variables.
 
+    .. note::
+        When the ``napalm_template_cache_size`` option is set (default: ``0``,
+        i.e., disabled), the most recently rendered templates are kept in
+        memory, indexed by the hash of the template source together with the
+        context, defaults, grains and pillar data. A template is then rendered
+        again only when the source or any of these changed. For Jinja
+        templates, the sources of the templates pulled in through
+        ``include``, ``import``, ``extends``, ``from`` and ``import_yaml``
+        (``import_json``, ``import_text``) are part of the hash as well; the
+        templates whose included template names are computed at render time
+        are not cached. The ``salt://`` templates are downloaded from the
+        fileserver only when changed. Remote templates are cached only when
+        ``template_hash`` is specified, and the templates they pull in are not
+        tracked. Do not enable this option when the templates execute
+        functions whose result may change between runs.
+        The cache hit rate is returned by
+        :mod:`net.template_cache_stats <salt.modules.napalm_network.template_cache_stats>`.
+
+        .. versionadded:: Fluorine
+
     :return: a dictionary having the following keys:
 
     - result (bool): if the config was applied successfully. It is ``False``
@@ -1930,87 +2395,18 @@ def load_template(template_name=None,
         if context is None:
             context = {}
         context.update(template_vars)
-        # if needed to render the template send as inline arg
-        if template_source:
-            # render the content
-            _rendered = __salt__['file.apply_template_on_contents'](
-                contents=template_source,
-                template=template_engine,
-                context=context,
-                defaults=defaults,
-                saltenv=saltenv
-            )
-            if not isinstance(_rendered, six.string_types):
-                if 'result' in _rendered:
-                    _loaded['result'] = _rendered['result']
-                else:
-                    _loaded['result'] = False
-                if 'comment' in _rendered:
-                    _loaded['comment'] = _rendered['comment']
-                else:
-                    _loaded['comment'] = 'Error while rendering the template.'
-                return _loaded
-        else:
-            # render the file - either local, either remote
-            if not isinstance(template_name, (list, tuple)):
-                template_name = [template_name]
-            if template_hash_name and not isinstance(template_hash_name, (list, tuple)):
-                template_hash_name = [template_hash_name]
-            elif not template_hash_name:
-                template_hash_name = [None] * len(template_name)
-            if template_hash and isinstance(template_hash, six.string_types) and not\
-                    (template_hash.startswith('salt://') or template_hash.startswith('file://')):
-                # If the template hash is passed as string, and it's not a file
-                # (starts with the salt:// or file:// URI), then make it a list
-                # of 1 element (for the iteration below)
-                template_hash = [template_hash]
-            elif template_hash and isinstance(template_hash, six.string_types) and\
-                    (template_hash.startswith('salt://') or template_hash.startswith('file://')):
-                # If the template hash is a file URI, then provide the same value
-                # for each of the templates in the list, as probably they all
-                # share the same hash file, otherwise the user should provide
-                # this as a list
-                template_hash = [template_hash] * len(template_name)
-            elif not template_hash:
-                template_hash = [None] * len(template_name)
-            for tpl_index, tpl_name in enumerate(template_name):
-                tpl_hash = template_hash[tpl_index]
-                tpl_hash_name = template_hash_name[tpl_index]
-                _rand_filename = __salt__['random.hash'](tpl_name, 'md5')
-                _temp_file = __salt__['file.join']('/tmp', _rand_filename)
-                _managed = __salt__['file.get_managed'](name=_temp_file,
-                                                        source=tpl_name,
-                                                        source_hash=tpl_hash,
-                                                        source_hash_name=tpl_hash_name,
-                                                        user=None,
-                                                        group=None,
-                                                        mode=None,
-                                                        attrs=None,
-                                                        template=template_engine,
-                                                        context=context,
-                                                        defaults=defaults,
-                                                        saltenv=saltenv,
-                                                        skip_verify=skip_verify)
-                if not isinstance(_managed, (list, tuple)) and isinstance(_managed, six.string_types):
-                    _loaded['comment'] += _managed
-                    _loaded['result'] = False
-                elif isinstance(_managed, (list, tuple)) and not len(_managed) > 0:
-                    _loaded['result'] = False
-                    _loaded['comment'] += 'Error while rendering the template.'
-                elif isinstance(_managed, (list, tuple)) and not len(_managed[0]) > 0:
-                    _loaded['result'] = False
-                    _loaded['comment'] += _managed[-1]  # contains the error message
-                if _loaded['result']:  # all good
-                    _temp_tpl_file = _managed[0]
-                    _temp_tpl_file_exists = __salt__['file.file_exists'](_temp_tpl_file)
-                    if not _temp_tpl_file_exists:
-                        _loaded['result'] = False
-                        _loaded['comment'] += 'Error while rendering the template.'
-                        return _loaded
-                    _rendered += __salt__['file.read'](_temp_tpl_file)
-                    __salt__['file.remove'](_temp_tpl_file)
-                else:
-                    return _loaded  # exit
+        _loaded = _render_template(template_name,
+                                   template_source=template_source,
+                                   context=context,
+                                   defaults=defaults,
+                                   template_engine=template_engine,
+                                   saltenv=saltenv,
+                                   template_hash=template_hash,
+                                   template_hash_name=template_hash_name,
+                                   skip_verify=skip_verify)
+        if not _loaded['result']:
+            return _loaded  # exit
+        _rendered = _loaded['out']
 
         loaded_config = _rendered
         if _loaded['result']:  # all good
@@ -2082,6 +2478,125 @@ def load_template(template_name=None,
                          **template_vars)
 
 
+@salt.utils.napalm.proxy_napalm_wrap
+def load_template_batch(templates,
+                        test=False,
+                        commit=True,
+                        debug=False,
+                        replace=False,
+                        commit_in=None,
+                        commit_at=None,
+                        revert_in=None,
+                        revert_at=None,
+                        inherit_napalm_device=None,  # pylint: disable=unused-argument
+                        **kwargs):
+    '''
+    .. versionadded:: Fluorine
+
+    Render a batch of independent configuration templates, each having its
+    own context, and load the result on the device at once. Compared to
+    executing :mod:`net.load_template <salt.modules.napalm_network.load_template>`
+    for each template, the configuration is loaded, compared and committed
+    (or discarded) only once, while the diff is still attributed to the
+    template that caused the changes.
+
+    templates
+        The list of templates to be rendered, each being a dictionary having
+        the following keys:
+
+        - ``name``: the name of the template in the output (default: the
+          position in the list).
+        - ``template_name``, ``template_source``, ``template_hash``,
+          ``template_hash_name``, ``template_engine``, ``saltenv``,
+          ``skip_verify``, ``context`` and ``defaults``: as documented for
+          :mod:`net.load_template <salt.modules.napalm_network.load_template>`.
+        - any other key is sent to the template, as a variable.
+
+    The rest of the arguments (``test``, ``commit``, ``debug``, ``replace``,
+    ``commit_in``, ``commit_at``, ``revert_in``, ``revert_at``) apply to the
+    whole batch, and are documented in
+    :mod:`net.load_template <salt.modules.napalm_network.load_template>`.
+
+    :return: the same dictionary as
+        :mod:`net.load_template <salt.modules.napalm_network.load_template>`,
+        having the diff of each template under the ``batch`` key.
+
+    CLI Example:
+
+    .. code-block:: bash
+
+        salt '*' net.load_template_batch "[{'name': 'ntp', 'template_name': 'salt://ntp.jinja'}, {'name': 'snmp', 'template_name': 'salt://snmp.jinja', 'context': {'community': 'public'}}]" test=True
+
+    Output Example:
+
+    .. code-block:: python
+
+        {
+            'comment': 'Configuration discarded.',
+            'already_configured': False,
+            'result': True,
+            'diff': '[edit system ntp]+   peer 172.17.17.1;[edit snmp]+   community public;',
+            'loaded_config': '',
+            'batch': {
+                'ntp': '[edit system ntp]+   peer 172.17.17.1;',
+                'snmp': '[edit snmp]+   community public;'
+            }
+        }
+    '''
+    rendered = OrderedDict()
+    template_args = ('template_name', 'template_source', 'template_hash', 'template_hash_name',
+                     'template_engine', 'saltenv', 'skip_verify', 'context', 'defaults')
+    for tpl_index, template in enumerate(templates):
+        template = dict(template)
+        name = template.pop('name', tpl_index)
+        context = dict(template.get('context') or {})
+        context.update(dict((key, val) for key, val in six.iteritems(template) if key not in template_args))
+        _loaded = _render_template(template.get('template_name'),
+                                   template_source=template.get('template_source'),
+                                   context=context,
+                                   defaults=template.get('defaults'),
+                                   template_engine=template.get('template_engine', 'jinja'),
+                                   saltenv=template.get('saltenv', 'base'),
+                                   template_hash=template.get('template_hash'),
+                                   template_hash_name=template.get('template_hash_name'),
+                                   skip_verify=template.get('skip_verify', False))
+        if not _loaded['result']:
+            _loaded['comment'] = 'Unable to render {name}: {comment}'.format(name=name,
+                                                                             comment=_loaded['comment'])
+            return _loaded  # exit
+        rendered[name] = _loaded['out']
+    loaded_config = ''.join(config if config.endswith('\n') else config + '\n'
+                              for config in rendered.values() if config)
+    fun = 'load_merge_candidate'
+    if replace:  # replace requested
+        fun = 'load_replace_candidate'
+    if salt.utils.napalm.not_always_alive(__opts__):
+        # do not close the connection after loading the config
+        # this will be handled in _config_logic
+        napalm_device['CLOSE'] = False  # pylint: disable=undefined-variable
+    _loaded = salt.utils.napalm.call(
+        napalm_device,  # pylint: disable=undefined-variable
+        fun,
+        **{
+            'config': loaded_config
+        }
+    )
+    loaded_result = _config_logic(napalm_device,  # pylint: disable=undefined-variable
+                                  _loaded,
+                                  test=test,
+                                  debug=debug,
+                                  replace=replace,
+                                  commit_config=commit,
+                                  loaded_config=loaded_config,
+                                  commit_at=commit_at,
+                                  commit_in=commit_in,
+                                  revert_in=revert_in,
+                                  revert_at=revert_at,
+                                  **kwargs)
+    loaded_result['batch'] = _attribute_diff(loaded_result.get('diff'), rendered)
+    return loaded_result
+
+
 @salt.utils.napalm.proxy_napalm_wrap
 def commit(inherit_napalm_device=None, **kwargs):  # pylint: disable=unused-argument
 
@@ -2095,11 +2610,13 @@ def commit(inherit_napalm_device=None, **kwargs):  # pylint: disable=unused-argu
         salt '*' net.commit
     '''
 
-    return salt.utils.napalm.call(
+    ret = salt.utils.napalm.call(
         napalm_device,  # pylint: disable=undefined-variable
         'commit_config',
         **{}
     )
+    __salt__['napalm.config_cache_clear']()
+    return ret
 
 
 @salt.utils.napalm.proxy_napalm_wrap
@@ -2115,11 +2632,13 @@ def discard_config(inherit_napalm_device=None, **kwargs):  # pylint: disable=unu
         salt '*' net.discard_config
     """
 
-    return salt.utils.napalm.call(
+    ret = salt.utils.napalm.call(
         napalm_device,  # pylint: disable=undefined-variable
         'discard_config',
         **{}
     )
+    __salt__['napalm.config_cache_clear'](source='candidate')
+    return ret
 
 
 @salt.utils.napalm.proxy_napalm_wrap
@@ -2155,11 +2674,13 @@ def rollback(inherit_napalm_device=None, **kwargs):  # pylint: disable=unused-ar
         salt '*' net.rollback
     '''
 
-    return salt.utils.napalm.call(
+    ret = salt.utils.napalm.call(
         napalm_device,  # pylint: disable=undefined-variable
         'rollback',
         **{}
     )
+    __salt__['napalm.config_cache_clear']()
+    return ret
 
 
 @salt.utils.napalm.proxy_napalm_wrap
@@ -2291,6 +2812,133 @@ def confirm_commit(jid):
     return confirmed
 
 
+def config_snapshots():
+    '''
+    .. versionadded:: Fluorine
+
+    Return the list of snapshots of the running configuration stored on the
+    minion, from the oldest to the most recent. A snapshot is taken whenever
+    the running configuration is retrieved by the ``napalm.config_*``
+    functions, or before a commit that can be reverted (using the
+    ``revert_in`` or ``revert_at`` arguments). Only the most recent snapshot
+    is stored in full, the older ones are stored as deltas.
+
+    By default, the backup restored by ``revert_in`` or ``revert_at`` is
+    always retrieved from the device. Set the ``napalm_config_snapshot_ttl``
+    option to reuse the most recent snapshot taken less than that many
+    seconds ago, unless invalidated by a configuration change made through
+    Salt. Changes made by other means (e.g., directly on the CLI) are not
+    detected, and would be lost on revert.
+
+    The number of snapshots kept is configured using the
+    ``napalm_config_snapshots`` option (default: ``10``).
+
+    CLI Example:
+
+    .. code-block:: bash
+
+        salt '*' net.config_snapshots
+
+    Output Example:
+
+    .. code-block:: yaml
+
+        - version: 9bc4d1b5e1ba5d5ae3a4c3c58c7e0c5e4bc6a3bf
+          timestamp: 1531221312.72
+        - version: 04f1e2ad3b2b6a4e0c3d4fe7d1b5f9ad9c3ac4e1
+          timestamp: 1531224975.37
+    '''
+    return {
+        'result': True,
+        'out': __utils__['config_snapshots.versions'](__opts__),
+        'comment': ''
+    }
+
+
+def config_snapshot(version=None):
+    '''
+    .. versionadded:: Fluorine
+
+    Return the running configuration from a snapshot stored on the minion.
+
+    version
+        The version of the snapshot, as returned by
+        :mod:`net.config_snapshots <salt.modules.napalm_network.config_snapshots>`.
+        Default: the most recent snapshot.
+
+    CLI Example:
+
+    .. code-block:: bash
+
+        salt '*' net.config_snapshot
+        salt '*' net.config_snapshot 04f1e2ad3b2b6a4e0c3d4fe7d1b5f9ad9c3ac4e1
+    '''
+    config = __utils__['config_snapshots.get'](__opts__, version=version)
+    if config is None:
+        return {
+            'result': False,
+            'out': None,
+            'comment': 'Snapshot {} not available'.format(version or '')
+        }
+    return {
+        'result': True,
+        'out': config,
+        'comment': ''
+    }
+
+
+def template_cache_stats():
+    '''
+    .. versionadded:: Fluorine
+
+    Return the statistics of the rendered templates cache used by
+    :mod:`net.load_template <salt.modules.napalm_network.load_template>`,
+    enabled through the ``napalm_template_cache_size`` option.
+
+    CLI Example:
+
+    .. code-block:: bash
+
+        salt '*' net.template_cache_stats
+
+    Output Example:
+
+    .. code-block:: yaml
+
+        hits: 18
+        misses: 2
+        hit_rate: 0.9
+        size: 2
+        max_size: 16
+    '''
+    stats = __context__.get('net.template_cache_stats', {'hits': 0, 'misses': 0})
+    requests = stats['hits'] + stats['misses']
+    return {
+        'hits': stats['hits'],
+        'misses': stats['misses'],
+        'hit_rate': float(stats['hits']) / requests if requests else 0.0,
+        'size': len(__context__.get('net.template_cache', {})),
+        'max_size': __salt__['config.get']('napalm_template_cache_size', DEFAULT_TEMPLATE_CACHE_SIZE)
+    }
+
+
+def template_cache_clear():
+    '''
+    .. versionadded:: Fluorine
+
+    Clear the rendered templates cache, together with its statistics.
+
+    CLI Example:
+
+    .. code-block:: bash
+
+        salt '*' net.template_cache_clear
+    '''
+    __context__.pop('net.template_cache', None)
+    __context__.pop('net.template_cache_stats', None)
+    return True
+
+
 def save_config(source=None,
                 path=None):
     '''
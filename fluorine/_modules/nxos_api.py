@@ -96,6 +96,12 @@ verify: ``True``
     Check https://www.cisco.com/c/en/us/td/docs/switches/datacenter/nexus3000/sw/programmability/6_x/b_Cisco_Nexus_3000_Series_NX-OS_Programmability_Guide/b_Cisco_Nexus_3000_Series_NX-OS_Programmability_Guide_chapter_01.html
     to see how to properly configure the certificate.
 
+max_connections: ``4``
+    The maximum number of HTTP(S) connections kept alive with the NX-API
+    endpoint, and reused by the next requests executed within the same job.
+
+    .. versionadded:: Fluorine
+
 Example (when not running in a ``nxos_api`` Proxy Minion):
 
 .. code-block:: yaml
@@ -251,7 +257,7 @@ def rpc(commands,
         return __proxy__['nxos_api.rpc'](commands, method=method, **nxos_api_kwargs)
     nxos_api_kwargs = __salt__['config.get']('nxos_api', {})
     nxos_api_kwargs.update(**kwargs)
-    return __utils__['nxos_api.rpc'](commands, method=method, **nxos_api_kwargs)
+    return __utils__['nxos_api_session.rpc'](commands, method=method, **nxos_api_kwargs)
 
 
 def show(commands,
@@ -152,9 +152,42 @@ to connect to the network device:
   only when needed, by setting this option to ``False``. By default this option
   is set to ``True`` (maintains the connection with the remote network device)
 
+- ``session_pool_size`` - When ``always_alive`` is ``False``, the maximum
+  number of SSH sessions kept open with the network device, and reused by the
+  calls executed in quick succession (default: ``1``). The calls wait for a
+  session to be released when all of them are busy.
+
+  .. versionadded:: Fluorine
+
+- ``session_idle_timeout`` - When ``always_alive`` is ``False``, close the
+  sessions that have not been used for this many seconds (default: ``60``).
+  Set this option to ``0`` to close the session after each call.
+
+  .. versionadded:: Fluorine
+
+- ``session_max_lifetime`` - When ``always_alive`` is ``False``, close the
+  sessions that have been open for this many seconds, even if they are still
+  used (default: ``600``).
+
+  .. versionadded:: Fluorine
+
 - ``multiprocessing`` - Overrides the :conf_minion:`multiprocessing` option,
   per proxy minion, as the Netmiko communication channel is mainly SSH
-  (default: ``False``)
+  (default: ``False``, or ``True`` when ``connection_broker`` is enabled)
+
+- ``connection_broker`` - Open the connection with the network device from a
+  separate process, that executes the calls received from the job processes
+  over a local Unix socket. This way, the jobs can be executed in parallel
+  processes, without opening their own connection (default: ``False``).
+  When enabled, the ``always_alive`` and ``session_*`` options are ignored.
+
+  .. versionadded:: Fluorine
+
+- ``connection_broker_channels`` - How many connections the broker opens with
+  the network device; the calls are queued until a connection is available
+  (default: ``1``).
+
+  .. versionadded:: Fluorine
 
 Proxy Pillar Example
 --------------------
@@ -181,7 +214,10 @@ Proxy Pillar Example
 from __future__ import absolute_import
 
 # Import python stdlib
+import os
+import time
 import logging
+import threading
 
 # Import third party libs
 try:
@@ -213,6 +249,15 @@ __virtualname__ = 'netmiko'
 log = logging.getLogger(__name__)
 netmiko_device = {}
 
+DEFAULT_SESSION_POOL_SIZE = 1
+DEFAULT_SESSION_IDLE_TIMEOUT = 60
+DEFAULT_SESSION_MAX_LIFETIME = 600
+
+# the sessions open with the network device, and not used at the moment,
+# when always_alive is False
+_SESSIONS = []
+_SESSIONS_LOCK = threading.Lock()
+
 # -----------------------------------------------------------------------------
 # propery functions
 # -----------------------------------------------------------------------------
@@ -226,6 +271,89 @@ def __virtual__():
         return False, 'The netmiko proxy module requires netmiko library to be installed.'
     return __virtualname__
 
+# -----------------------------------------------------------------------------
+# helper functions -- will not be exported
+# -----------------------------------------------------------------------------
+
+
+def _expired(session, now):
+    '''
+    Check if a session has to be closed, as unused or open for too long.
+    '''
+    return now - session['used'] >= netmiko_device['session_idle_timeout'] or\
+        now - session['created'] >= netmiko_device['session_max_lifetime']
+
+
+def _close_sessions(expired_only=True):
+    '''
+    Close the idle sessions, either all of them, or only the expired ones.
+    '''
+    now = time.time()
+    with _SESSIONS_LOCK:
+        closing = [session for session in _SESSIONS
+                   if not expired_only or _expired(session, now) or session['pid'] != os.getpid()]
+        for session in closing:
+            _SESSIONS.remove(session)
+    for session in closing:
+        if session['pid'] != os.getpid():
+            # inherited from the parent process, that still owns the connection
+            continue
+        log.debug('Closing the netmiko session opened at %s', session['created'])
+        try:
+            session['connection'].disconnect()
+        except Exception:  # pylint: disable=broad-except
+            log.debug('Unable to close the netmiko session', exc_info=True)
+
+
+def _acquire_session():
+    '''
+    Return an idle session from the pool, or open a new one.
+    '''
+    netmiko_device['sessions_semaphore'].acquire()
+    _close_sessions()
+    with _SESSIONS_LOCK:
+        session = _SESSIONS.pop() if _SESSIONS else None
+    if session is None:
+        log.debug('Opening a new netmiko session')
+        now = time.time()
+        try:
+            connection = ConnectHandler(**netmiko_device['args'])
+        except Exception:
+            netmiko_device['sessions_semaphore'].release()
+            raise
+        session = {
+            'connection': connection,
+            'created': now,
+            'used': now,
+            'pid': os.getpid()
+        }
+    return session
+
+
+def _release_session(session, failed=False):
+    '''
+    Put the session back into the pool, or close it when it cannot be reused.
+    '''
+    session['used'] = time.time()
+    try:
+        if failed or _expired(session, session['used']):
+            session['connection'].disconnect()
+        else:
+            with _SESSIONS_LOCK:
+                _SESSIONS.append(session)
+    except Exception:  # pylint: disable=broad-except
+        log.debug('Unable to close the netmiko session', exc_info=True)
+    finally:
+        netmiko_device['sessions_semaphore'].release()
+
+
+def _channel_alive(connection):
+    '''
+    Check if the SSH session of a connection opened by the broker is still
+    alive.
+    '''
+    return connection.remote_conn.transport.is_alive()
+
 # -----------------------------------------------------------------------------
 # proxy functions
 # -----------------------------------------------------------------------------
@@ -237,11 +365,32 @@ def init(opts):
     managed through netmiko.
     '''
     proxy_dict = opts.get('proxy', {})
-    opts['multiprocessing'] = proxy_dict.get('multiprocessing', False)
     netmiko_connection_args = proxy_dict.copy()
     netmiko_connection_args.pop('proxytype', None)
+    netmiko_connection_args.pop('multiprocessing', None)
+    connection_broker = netmiko_connection_args.pop('connection_broker', False)
+    broker_channels = netmiko_connection_args.pop('connection_broker_channels', 1)
+    opts['multiprocessing'] = proxy_dict.get('multiprocessing', connection_broker)
     netmiko_device['always_alive'] = netmiko_connection_args.pop('always_alive',
                                                                  opts.get('proxy_always_alive', True))
+    session_pool_size = netmiko_connection_args.pop('session_pool_size', DEFAULT_SESSION_POOL_SIZE)
+    netmiko_device['sessions_semaphore'] = threading.BoundedSemaphore(session_pool_size)
+    netmiko_device['session_idle_timeout'] = netmiko_connection_args.pop('session_idle_timeout',
+                                                                         DEFAULT_SESSION_IDLE_TIMEOUT)
+    netmiko_device['session_max_lifetime'] = netmiko_connection_args.pop('session_max_lifetime',
+                                                                         DEFAULT_SESSION_MAX_LIFETIME)
+    netmiko_device['broker'] = None
+    if connection_broker:
+        netmiko_device['args'] = netmiko_connection_args
+        netmiko_device['broker'] = __utils__['conn_broker.start'](opts,
+                                                                  __virtualname__,
+                                                                  ConnectHandler,
+                                                                  netmiko_connection_args,
+                                                                  channels=broker_channels,
+                                                                  check=_channel_alive)
+        netmiko_device['initialized'] = True
+        netmiko_device['up'] = True
+        return True
     try:
         connection = ConnectHandler(**netmiko_connection_args)
         netmiko_device['connection'] = connection
@@ -262,7 +411,11 @@ def alive(opts):
     Return the connection status with the network device.
     '''
     log.debug('Checking if %s is still alive', opts.get('id', ''))
+    if netmiko_device.get('broker'):
+        return __utils__['conn_broker.alive'](opts, __virtualname__, netmiko_device['broker'])
     if not netmiko_device['always_alive']:
+        # release the sessions unused for a while
+        _close_sessions()
         return True
     if ping() and initialized():
         return netmiko_device['connection'].remote_conn.transport.is_alive()
@@ -287,6 +440,8 @@ def shutdown(opts):
     '''
     Closes connection with the device.
     '''
+    if netmiko_device.get('broker'):
+        return __utils__['conn_broker.stop'](opts, __virtualname__, netmiko_device['broker'])
     return call('disconnect')
 
 
@@ -299,6 +454,9 @@ def conn():
     '''
     Return the connection object.
     '''
+    if netmiko_device.get('broker'):
+        # forwards the method calls to the connection broker
+        return __utils__['conn_broker.client'](__opts__, __virtualname__)
     return netmiko_device.get('connection')
 
 
@@ -314,9 +472,17 @@ def call(method, *args, **kwargs):
     Calls an arbitrary netmiko method.
     '''
     kwargs = clean_kwargs(**kwargs)
+    if netmiko_device.get('broker'):
+        return __utils__['conn_broker.call'](__opts__, __virtualname__, method, *args, **kwargs)
     if not netmiko_device['always_alive']:
-        connection = ConnectHandler(**netmiko_device['args'])
-        ret = getattr(connection, method)(*args, **kwargs)
-        connection.disconnect()
+        if method == 'disconnect':
+            return _close_sessions(expired_only=False)
+        session = _acquire_session()
+        try:
+            ret = getattr(session['connection'], method)(*args, **kwargs)
+        except Exception:
+            _release_session(session, failed=True)
+            raise
+        _release_session(session)
         return ret
     return getattr(netmiko_device['connection'], method)(*args, **kwargs)
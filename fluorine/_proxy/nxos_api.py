@@ -86,6 +86,12 @@ verify: ``True``
     Check https://www.cisco.com/c/en/us/td/docs/switches/datacenter/nexus3000/sw/programmability/6_x/b_Cisco_Nexus_3000_Series_NX-OS_Programmability_Guide/b_Cisco_Nexus_3000_Series_NX-OS_Programmability_Guide_chapter_01.html
     to see how to properly configure the certificate.
 
+max_connections: ``4``
+    The maximum number of HTTP(S) connections kept alive with the NX-API
+    endpoint, and reused by the next requests.
+
+    .. versionadded:: Fluorine
+
 All the arguments may be optional, depending on your setup.
 
 Proxy Pillar Example
@@ -156,7 +162,7 @@ def init(opts):
     # This is not a SSH-based proxy, so it should be safe to enable
     # multiprocessing.
     try:
-        rpc_reply = __utils__['nxos_api.rpc']('show clock', **conn_args)
+        rpc_reply = __utils__['nxos_api_session.rpc']('show clock', **conn_args)
         # Execute a very simple command to confirm we are able to connect properly
         nxos_device['conn_args'] = conn_args
         nxos_device['initialized'] = True
@@ -186,6 +192,7 @@ def shutdown(opts):
     Closes connection with the device.
     '''
     log.debug('Shutting down the nxos_api Proxy Minion %s', opts['id'])
+    __utils__['nxos_api_session.close']()
 
 # -----------------------------------------------------------------------------
 # callable functions
@@ -206,4 +213,4 @@ def rpc(commands, method='cli', **kwargs):
     '''
     conn_args = nxos_device['conn_args']
     conn_args.update(kwargs)
-    return __utils__['nxos_api.rpc'](commands, method=method, **conn_args)
+    return __utils__['nxos_api_session.rpc'](commands, method=method, **conn_args)
@@ -20,12 +20,15 @@ Dependencies
 
 # Import Salt libs
 from __future__ import absolute_import, print_function, unicode_literals
+import uuid
 import logging
 
 log = logging.getLogger(__name__)
 
 # import Salt libs
 import salt.utils.napalm
+from salt.ext import six
+from salt.state import STATE_INTERNAL_KEYWORDS
 
 # ----------------------------------------------------------------------------------------------------------------------
 # state properties
@@ -37,6 +40,26 @@ __virtualname__ = 'netconfig'
 # global variables
 # ----------------------------------------------------------------------------------------------------------------------
 
+# the arguments of the managed state that apply to the whole batch,
+# together with their default values
+_BATCH_FLAGS = (
+    ('test', False),
+    ('commit', True),
+    ('debug', False),
+    ('replace', False),
+    ('commit_in', None),
+    ('commit_at', None),
+    ('revert_in', None),
+    ('revert_at', None)
+)
+# the states having any of these arguments (requisites, onlyif, unless, etc.) are not aggregated
+_BATCH_EXCLUDE = frozenset(keyword for keyword in STATE_INTERNAL_KEYWORDS
+                           if not keyword.startswith('__')) - frozenset(('state', 'fun', 'order', 'saltenv'))
+# state arguments that are not sent to the template
+_STATE_KEYWORDS = (STATE_INTERNAL_KEYWORDS | frozenset(('name', 'names', 'aggregate'))) - frozenset(('saltenv',))
+# the low chunk key identifying the batch a state has been aggregated into
+_BATCH_ID = '__netconfig_batch__'
+
 # ----------------------------------------------------------------------------------------------------------------------
 # property functions
 # ----------------------------------------------------------------------------------------------------------------------
@@ -94,11 +117,101 @@ def _update_config(template_name,
                                          replace=replace,
                                          **template_vars)
 
+
+def _state_tag(low):
+    '''
+    Return the tag of the state, as built by the Salt state system.
+    '''
+    return '{0[state]}_|-{0[__id__]}_|-{0[name]}_|-{0[fun]}'.format(low)
+
+
+def _batch_flags(low):
+    '''
+    Return the values of the arguments that apply to the whole batch.
+    '''
+    return tuple(low.get(flag, default) for flag, default in _BATCH_FLAGS)
+
+
+def _managed_batch(batch, **flags):
+    '''
+    Load the templates of the aggregated ``netconfig.managed`` states at once,
+    and return the result of each state, indexed by the state tag.
+    '''
+    templates = []
+    for low in batch:
+        template = dict((key, val) for key, val in six.iteritems(low)
+                        if not key.startswith('__') and key not in _STATE_KEYWORDS and key not in flags)
+        template['name'] = _state_tag(low)
+        templates.append(template)
+    batch_ret = __salt__['net.load_template_batch'](templates, **flags)
+    results = {}
+    for low in batch:
+        tag = _state_tag(low)
+        loaded = dict(batch_ret)
+        loaded['diff'] = batch_ret.get('batch', {}).get(tag, '')
+        if not batch_ret.get('already_configured', True):
+            # the batch changed the configuration, but maybe not this state
+            loaded['already_configured'] = not loaded['diff']
+        results[tag] = salt.utils.napalm.loaded_ret(salt.utils.napalm.default_ret(low['name']),
+                                                    loaded,
+                                                    flags['test'],
+                                                    flags['debug'])
+    return results
+
 # ----------------------------------------------------------------------------------------------------------------------
 # callable functions
 # ----------------------------------------------------------------------------------------------------------------------
 
 
+def mod_aggregate(low, chunks, running):
+    '''
+    .. versionadded:: Fluorine
+
+    Aggregate the ``netconfig.managed`` states not executed yet, so their
+    templates are loaded on the device at once, by the first of these states:
+    the configuration is loaded, compared and committed (or discarded) only
+    once, while the diff is still attributed to each state.
+
+    Only the states without requisites, and having the same values for
+    ``test``, ``commit``, ``debug``, ``replace``, ``commit_in``, ``commit_at``,
+    ``revert_in`` and ``revert_at`` are aggregated. The states using
+    ``replace`` are never aggregated.
+
+    Enable the aggregation through the ``state_aggregate`` option, or using
+    the ``aggregate`` state argument.
+    '''
+    # the batches are identified by an ID set on the low chunks of their states,
+    # so the batches (and their results) not used by the states of this run,
+    # e.g., when the first state of the batch did not run, are dropped
+    current = set(chunk.get(_BATCH_ID) for chunk in chunks)
+    for key in ('netconfig.batch', 'netconfig.batch_results'):
+        for batch_key in list(__context__.get(key, {})):
+            if batch_key[0] not in current:
+                __context__[key].pop(batch_key)
+    if low.get('fun') != 'managed' or low.get('replace') or any(low.get(arg) for arg in _BATCH_EXCLUDE):
+        return low
+    tag = _state_tag(low)
+    flags = _batch_flags(low)
+    batch = [low]
+    for chunk in chunks:
+        if chunk.get('state') != 'netconfig' or chunk.get('fun') != 'managed' or chunk.get('__agg__'):
+            continue
+        chunk_tag = _state_tag(chunk)
+        if chunk_tag == tag or chunk_tag in running:
+            continue
+        if any(chunk.get(arg) for arg in _BATCH_EXCLUDE) or _batch_flags(chunk) != flags:
+            continue
+        chunk['__agg__'] = True
+        batch.append(chunk)
+    if len(batch) > 1:
+        log.debug('Aggregating %d netconfig.managed states into %s', len(batch), tag)
+        batch_id = uuid.uuid4().hex
+        for chunk in batch:
+            chunk[_BATCH_ID] = batch_id
+        __context__.setdefault('netconfig.batch', {})[(batch_id, tag)] = [dict(chunk) for chunk in batch]
+    return low
+
+
 def replace_pattern(name,
                     pattern,
                     repl,
@@ -486,6 +599,13 @@ def managed(name,
 
     To replace the config, set ``replace`` to ``True``. This option is recommended to be used with caution!
 
+    .. versionadded:: Fluorine
+
+    When the ``state_aggregate`` option is enabled (or the ``aggregate`` argument is set), the independent
+    ``netconfig.managed`` states are executed as a batch: their templates are rendered and loaded on the device at
+    once, then compared and committed (or discarded) only once. The diff is attributed to each state. See
+    :mod:`netconfig.mod_aggregate <salt.states.netconfig.mod_aggregate>` for the states that can be aggregated.
+
     template_name
         Identifies path to the template source. The template can be either stored on the local machine,
         either remotely.
@@ -814,6 +934,15 @@ def managed(name,
     '''
     ret = salt.utils.napalm.default_ret(name)
 
+    tag, batch_id = None, None
+    if '__low__' in globals():
+        tag, batch_id = _state_tag(__low__), __low__.get(_BATCH_ID)
+    template_vars.pop(_BATCH_ID, None)
+    batch_ret = __context__.get('netconfig.batch_results', {}).pop((batch_id, tag), None)
+    if batch_ret is not None:
+        # the configuration has already been loaded by the state running the batch
+        return batch_ret
+
     # the user can override the flags the equivalent CLI args
     # which have higher precedence
     test = __salt__['config.merge']('test', test)
@@ -826,6 +955,22 @@ def managed(name,
     revert_in = __salt__['config.merge']('revert_in', revert_in)
     revert_at = __salt__['config.merge']('revert_at', revert_at)
 
+    batch = __context__.get('netconfig.batch', {}).pop((batch_id, tag), None)
+    if batch:
+        batch_results = _managed_batch(batch,
+                                       test=test,
+                                       commit=commit,
+                                       debug=debug,
+                                       replace=replace,
+                                       commit_in=commit_in,
+                                       commit_at=commit_at,
+                                       revert_in=revert_in,
+                                       revert_at=revert_at)
+        ret = batch_results.pop(tag)
+        __context__.setdefault('netconfig.batch_results', {}).update(
+            ((batch_id, batch_tag), batch_ret) for batch_tag, batch_ret in six.iteritems(batch_results))
+        return ret
+
     config_update_ret = _update_config(template_name=template_name,
                                        template_source=template_source,
                                        template_hash=template_hash,
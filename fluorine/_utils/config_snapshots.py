@@ -0,0 +1,228 @@
+# -*- coding: utf-8 -*-
+'''
+Configuration Snapshots
+=======================
+
+.. versionadded:: Fluorine
+
+Versioned store of the running configuration snapshots of a network device,
+kept on the minion through the :mod:`Salt cache subsystem <salt.cache>`.
+
+Each snapshot is identified by the hash of its content. Only the most recent
+snapshot is stored in full, while the older ones are stored as the delta
+required to rebuild them from the next snapshot. The deltas are computed at
+the level of the configuration blocks (i.e., a top level line together with
+its indented children), so they stay small when only a few sections changed.
+
+The most recent snapshot is considered valid (i.e., it reflects the running
+configuration of the device) until it is explicitly invalidated, when the
+configuration is changed through Salt, or when it is older than the TTL
+requested.
+
+Usage example:
+
+.. code-block:: python
+
+    running_config = __utils__['config_snapshots.latest'](__opts__, ttl=60)
+    if running_config is None:
+        running_config = __salt__['net.config'](source='running')['out']['running']
+        __utils__['config_snapshots.add'](__opts__, running_config)
+'''
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+# Import python libs
+import time
+import difflib
+import hashlib
+import logging
+
+# Import salt libs
+import salt.cache
+import salt.utils.stringutils
+from salt.ext import six
+
+log = logging.getLogger(__name__)
+
+# -----------------------------------------------------------------------------
+# global variables
+# -----------------------------------------------------------------------------
+
+_SNAPSHOTS_BANK = 'napalm/config_snapshots/{minion}'
+_INDEX_KEY = 'index'
+_DEFAULT_MAX_VERSIONS = 10
+
+# -----------------------------------------------------------------------------
+# helper functions -- will not be exported
+# -----------------------------------------------------------------------------
+
+
+def _bank(opts):
+    '''
+    Return the cache bank where the snapshots of this minion are stored.
+    '''
+    return _SNAPSHOTS_BANK.format(minion=opts['id'])
+
+
+def _hash(config):
+    '''
+    Return the hash of the configuration text.
+    '''
+    return hashlib.sha1(salt.utils.stringutils.to_bytes(config)).hexdigest()
+
+
+def _split_blocks(config):
+    '''
+    Split the configuration text into blocks: each top level line together
+    with the indented lines following it. Joining the blocks gives back the
+    original text.
+    '''
+    blocks = []
+    for line in config.splitlines(True):
+        if blocks and line[:1] in (' ', '\t'):
+            blocks[-1] += line
+        else:
+            blocks.append(line)
+    return blocks
+
+
+def _get_delta(new_blocks, old_blocks):
+    '''
+    Return the delta required to rebuild the old configuration from the
+    blocks of the new one: a list of ``[start, end]`` ranges of blocks to be
+    copied from the new configuration, and text to be inserted as is.
+    '''
+    delta = []
+    matcher = difflib.SequenceMatcher(None, new_blocks, old_blocks)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == 'equal':
+            delta.append([i1, i2])
+        elif j2 > j1:
+            delta.append(''.join(old_blocks[j1:j2]))
+    return delta
+
+
+def _apply_delta(new_config, delta):
+    '''
+    Rebuild the old configuration from the new configuration and the delta.
+    '''
+    new_blocks = _split_blocks(new_config)
+    old_config = []
+    for entry in delta:
+        if isinstance(entry, six.string_types):
+            old_config.append(entry)
+        else:
+            old_config.extend(new_blocks[entry[0]:entry[1]])
+    return ''.join(old_config)
+
+# -----------------------------------------------------------------------------
+# callable functions
+# -----------------------------------------------------------------------------
+
+
+def versions(opts):
+    '''
+    Return the list of snapshots, from the oldest to the most recent, each
+    having the ``version`` (i.e., the hash of the configuration) and the
+    ``timestamp`` when the snapshot was taken.
+    '''
+    cache = salt.cache.Cache(opts)
+    index = cache.fetch(_bank(opts), _INDEX_KEY) or {}
+    return index.get('versions', [])
+
+
+def add(opts, config, max_versions=_DEFAULT_MAX_VERSIONS):
+    '''
+    Store the configuration as the most recent snapshot, and return its
+    version. The previous snapshot is replaced by the delta from the new one,
+    and the oldest snapshots are removed, to keep at most ``max_versions``.
+
+    opts
+        The minion opts.
+
+    config
+        The running configuration, as text.
+
+    max_versions: ``10``
+        How many snapshots to keep.
+    '''
+    cache = salt.cache.Cache(opts)
+    bank = _bank(opts)
+    index = cache.fetch(bank, _INDEX_KEY) or {}
+    snapshots = index.get('versions', [])
+    version = _hash(config)
+    if snapshots and snapshots[-1]['version'] == version:
+        # same content, only refresh the timestamp
+        snapshots[-1]['timestamp'] = time.time()
+    else:
+        if snapshots:
+            previous = snapshots[-1]['version']
+            previous_config = cache.fetch(bank, previous).get('config', '')
+            cache.store(bank, previous, {
+                'base': version,
+                'delta': _get_delta(_split_blocks(config), _split_blocks(previous_config))
+            })
+        cache.store(bank, version, {'config': config})
+        snapshots = [snapshot for snapshot in snapshots if snapshot['version'] != version]
+        snapshots.append({'version': version, 'timestamp': time.time()})
+        for snapshot in snapshots[:-max_versions]:
+            cache.flush(bank, snapshot['version'])
+        snapshots = snapshots[-max_versions:]
+    cache.store(bank, _INDEX_KEY, {'versions': snapshots, 'valid': True})
+    log.debug('Stored the running config snapshot %s', version)
+    return version
+
+
+def get(opts, version=None):
+    '''
+    Return the configuration text of a certain snapshot version, or the most
+    recent one when ``version`` is not specified. Returns ``None`` when the
+    version is not available.
+    '''
+    snapshots = versions(opts)
+    if not snapshots:
+        return None
+    cache = salt.cache.Cache(opts)
+    bank = _bank(opts)
+    deltas = []
+    record = cache.fetch(bank, version or snapshots[-1]['version'])
+    # follow the deltas up to the snapshot stored in full
+    while record and 'config' not in record:
+        deltas.append(record['delta'])
+        record = cache.fetch(bank, record['base'])
+    if not record:
+        return None
+    config = record['config']
+    for delta in reversed(deltas):
+        config = _apply_delta(config, delta)
+    return config
+
+
+def latest(opts, ttl=60):
+    '''
+    Return the configuration text of the most recent snapshot, when still
+    valid, i.e., not invalidated, and taken less than ``ttl`` seconds ago.
+    Otherwise, returns ``None``.
+    '''
+    cache = salt.cache.Cache(opts)
+    index = cache.fetch(_bank(opts), _INDEX_KEY) or {}
+    snapshots = index.get('versions', [])
+    if not snapshots or not index.get('valid') or \
+            time.time() - snapshots[-1]['timestamp'] >= ttl:
+        return None
+    log.debug('Using the running config snapshot %s', snapshots[-1]['version'])
+    return get(opts)
+
+
+def invalidate(opts):
+    '''
+    Mark the most recent snapshot as no longer reflecting the running
+    configuration of the device. The snapshot is still available through
+    :func:`get <get>`.
+    '''
+    cache = salt.cache.Cache(opts)
+    bank = _bank(opts)
+    index = cache.fetch(bank, _INDEX_KEY) or {}
+    if index.get('valid'):
+        index['valid'] = False
+        cache.store(bank, _INDEX_KEY, index)
@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+'''
+NX-API Sessions
+===============
+
+.. versionadded:: Fluorine
+
+Utilities to execute RPC requests over the Cisco NX-API, reusing persistent
+HTTP(S) sessions. Compared to :mod:`salt.utils.nxos_api`, which establishes
+a new TCP connection (and TLS handshake) for every request, the connections
+opened here are kept alive and reused by the next requests sent to the same
+endpoint, from the same process.
+
+The number of connections to each endpoint is bounded by the
+``max_connections`` argument (default: ``4``): when all of them are busy,
+the requests wait for a connection to be released.
+
+.. note::
+    The sessions are never shared between processes: a (Proxy) Minion job
+    executed in a separate process opens its own session, reused by all the
+    requests sent within that job.
+
+When the ``requests`` library is not installed, the requests are sent through
+:mod:`salt.utils.nxos_api`.
+'''
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+# Import python libs
+import os
+import json
+import logging
+import threading
+
+# Import salt libs
+import salt.utils.nxos_api
+from salt.ext import six
+from salt.exceptions import SaltException
+
+# Import third party libs
+try:
+    import requests
+    import requests.adapters
+    HAS_REQUESTS = True
+except ImportError:
+    HAS_REQUESTS = False
+
+log = logging.getLogger(__name__)
+
+# -----------------------------------------------------------------------------
+# global variables
+# -----------------------------------------------------------------------------
+
+DEFAULT_MAX_CONNECTIONS = 4
+
+_SESSIONS = {}
+_SESSIONS_LOCK = threading.Lock()
+
+# -----------------------------------------------------------------------------
+# helper functions -- will not be exported
+# -----------------------------------------------------------------------------
+
+
+def _prepare_connection(**nxos_api_kwargs):
+    '''
+    Return the connection arguments, with the defaults filled in.
+    '''
+    init_kwargs = {
+        'transport': nxos_api_kwargs.get('transport') or 'https',
+        'host': nxos_api_kwargs.get('host') or 'localhost',
+        'username': nxos_api_kwargs.get('username'),
+        'password': nxos_api_kwargs.get('password'),
+        'timeout': nxos_api_kwargs.get('timeout') or 60,
+        'rpc_version': nxos_api_kwargs.get('rpc_version') or '2.0',
+        'max_connections': nxos_api_kwargs.get('max_connections') or DEFAULT_MAX_CONNECTIONS
+    }
+    init_kwargs['port'] = nxos_api_kwargs.get('port') or (80 if init_kwargs['transport'] == 'http' else 443)
+    verify = nxos_api_kwargs.get('verify')
+    init_kwargs['verify'] = True if verify is None else verify
+    return init_kwargs
+
+
+def _get_session(init_kwargs):
+    '''
+    Return the session with the NX-API endpoint, opened by the current
+    process, or open a new one.
+    '''
+    key = (os.getpid(),
+           init_kwargs['transport'],
+           init_kwargs['host'],
+           init_kwargs['port'],
+           init_kwargs['username'])
+    with _SESSIONS_LOCK:
+        session = _SESSIONS.get(key)
+        if session is None:
+            log.debug('Opening a new NX-API session with %s', init_kwargs['host'])
+            session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(pool_connections=1,
+                                                    pool_maxsize=init_kwargs['max_connections'],
+                                                    pool_block=True)
+            session.mount('{}://'.format(init_kwargs['transport']), adapter)
+            _SESSIONS[key] = session
+        session.auth = (init_kwargs['username'], init_kwargs['password'])
+        session.verify = init_kwargs['verify']
+    return session
+
+# -----------------------------------------------------------------------------
+# callable functions
+# -----------------------------------------------------------------------------
+
+
+def rpc(commands, method='cli', **kwargs):
+    '''
+    Execute an arbitrary RPC request via the NX-API, and return the list of
+    responses, one for each command. Accepts the same arguments as
+    :func:`salt.utils.nxos_api.rpc`, together with ``max_connections``.
+    '''
+    if not HAS_REQUESTS:
+        return salt.utils.nxos_api.rpc(commands, method=method, **kwargs)
+    init_kwargs = _prepare_connection(**kwargs)
+    url = '{transport}://{host}:{port}/ins'.format(**init_kwargs)
+    if not isinstance(commands, (list, tuple)):
+        commands = [commands]
+    payload = []
+    for index, command in enumerate(commands):
+        payload.append({
+            'jsonrpc': init_kwargs['rpc_version'],
+            'method': method,
+            'params': {
+                'cmd': command,
+                'version': 1
+            },
+            'id': index + 1
+        })
+    session = _get_session(init_kwargs)
+    try:
+        response = session.post(url,
+                                data=json.dumps(payload),
+                                headers={'content-type': 'application/json-rpc'},
+                                timeout=init_kwargs['timeout'])
+    except requests.exceptions.RequestException as err:
+        raise SaltException(six.text_type(err))
+    try:
+        response_list = response.json()
+    except ValueError as err:
+        response_list = None
+        if response.ok:
+            raise SaltException(six.text_type(err))
+    if isinstance(response_list, dict):
+        response_list = [response_list]
+    if not response.ok and not (response_list and
+                                all(isinstance(item, dict) and ('result' in item or 'error' in item)
+                                    for item in response_list)):
+        # not a JSON-RPC reply, e.g., authentication failure or server error
+        raise SaltException('HTTP {}: {}'.format(response.status_code, response.reason))
+    for index, command in enumerate(commands):
+        response_list[index]['command'] = command
+    return response_list
+
+
+def close(host=None):
+    '''
+    Close the NX-API sessions opened by the current process with a certain
+    ``host``, or all of them, when ``host`` is not specified.
+    '''
+    with _SESSIONS_LOCK:
+        for key in list(_SESSIONS):
+            if key[0] == os.getpid() and (host is None or key[2] == host):
+                _SESSIONS.pop(key).close()
@@ -35,7 +35,9 @@ Example output::
 # Import Python libs
 from __future__ import absolute_import
 
-import operator
+import sys
+import types
+import itertools
 from functools import reduce  # pylint: disable=redefined-builtin
 
 # Import salt libs
@@ -45,6 +47,7 @@ from salt.ext.six import string_types
 from salt.utils import get_colors
 from salt.ext.six.moves import map  # pylint: disable=redefined-builtin
 from salt.ext.six.moves import zip  # pylint: disable=redefined-builtin
+from salt.ext.six.moves import zip_longest  # pylint: disable=redefined-builtin
 
 
 __virtualname__ = 'table'
@@ -157,7 +160,7 @@ class TableDisplay(object):
             for row in rows
         ]
 
-        columns = map(None, *reduce(operator.add, logical_rows))
+        columns = map(None, *itertools.chain.from_iterable(logical_rows))
 
         max_widths = [
             max([len(str(item)) for item in column])
@@ -201,6 +204,92 @@ class TableDisplay(object):
                 has_header = False
         return out
 
+    def row_items(self, row):
+
+        '''Return the list of cells of a row, sorted by key when the row is a dictionary.'''
+
+        if isinstance(row, dict):
+            return [str(row[key]) for key in sorted(row)]
+        elif isinstance(row, string_types):
+            return [row]  # encapsulate the row in a single-element list
+        return row
+
+    def wrap_width(self, text, width):
+
+        '''Wrap the text on space, then split the words longer than the column width.'''
+
+        lines = []
+        for line in self.wrapfunc(str(text)).split('\n'):
+            while len(line) > width:
+                lines.append(line[:width])
+                line = line[width:]
+            lines.append(line)
+        return lines
+
+    def stream_rows(self,
+                    rows,
+                    labels,
+                    indent,
+                    widths=None,
+                    sample_size=100):
+
+        '''
+        Generate the lines to be displayed, one by one, without holding all the rows in memory.
+        The column widths are either fixed, using ``widths``, either computed
+        from the labels and the first ``sample_size`` rows.
+        The cells larger than the column width are wrapped.
+        '''
+
+        rows = iter(rows)
+        sample = list(itertools.islice(rows, sample_size))
+        if not sample and not labels:
+            return
+        if isinstance(labels, dict):
+            labels = [labels[key] for key in sorted(labels)]
+        elif not labels and sample and isinstance(sample[0], dict):
+            labels = [str(label).replace('_', ' ').title() for label in sorted(sample[0])]
+        has_header = self.has_header and labels
+        header = [labels] if labels else []
+
+        if not widths:
+            widths = []
+            for row in itertools.chain(header, map(self.row_items, sample)):
+                for pos, item in enumerate(row):
+                    item_width = min(max(len(line) for line in self.wrap_width(item, self.width)), self.width)
+                    if pos < len(widths):
+                        widths[pos] = max(widths[pos], item_width)
+                    else:
+                        widths.append(item_width)
+        widths = [max(width, 1) for width in widths]
+
+        row_separator = self.ustring(
+            indent,
+            self.LIGHT_GRAY,  # pylint: disable=no-member
+            self.row_delimiter * (len(self.prefix) + len(self.suffix) + sum(widths) +
+                                  len(self.delim) * (len(widths) - 1))
+        )
+        justify = self._JUSTIFY_MAP[self.justify.lower()]
+
+        if self.separate_rows:
+            yield row_separator
+        for row in itertools.chain(header, map(self.row_items, itertools.chain(sample, rows))):
+            wrapped = [
+                self.wrap_width(item, width)
+                for (item, width) in zip(row, widths)
+            ]
+            for physical_row in zip_longest(*wrapped, fillvalue=''):
+                yield self.ustring(
+                    indent,
+                    self.WHITE,  # pylint: disable=no-member
+                    self.prefix + self.delim.join([
+                        justify(str(item), width)
+                        for (item, width) in zip(physical_row, widths)
+                    ]) + self.suffix
+                )
+            if self.separate_rows or has_header:
+                yield row_separator
+                has_header = False
+
     def display_rows(self,
                      rows,
                      labels,
@@ -229,18 +318,9 @@ class TableDisplay(object):
                 labels_temp.append(labels[key])
             labels = labels_temp
 
-        if first_row_type is dict:  # and all the others
-            temp_rows = []
-            if not labels:
-                labels = [str(label).replace('_', ' ').title() for label in sorted(rows[0])]
-            for row in rows:
-                temp_row = []
-                for key in sorted(row):
-                    temp_row.append(str(row[key]))
-                temp_rows.append(temp_row)
-            rows = temp_rows
-        elif isinstance(rows[0], string_types):
-            rows = [[row] for row in rows]  # encapsulate each row in a single-element list
+        if first_row_type is dict and not labels:  # and all the others
+            labels = [str(label).replace('_', ' ').title() for label in sorted(rows[0])]
+        rows = [self.row_items(row) for row in rows]
 
         labels_and_rows = [labels] + rows if labels else rows
         has_header = self.has_header and labels
@@ -322,6 +402,10 @@ def output(ret, **kwargs):
         * rows_key: display the rows under a specific key.
         * labels_key: use the labels under a certain key. Otherwise will try to use the dictionary keys (if any).
         * title: display title when only one table is selected (using the ``rows_key`` argument).
+        * stream: write the lines to the standard output as they are rendered, instead of returning them.
+          The rows can be a generator, and are not held in memory. Default: False.
+        * widths: list of fixed column widths, when streaming.
+        * sample_size: number of rows used to compute the column widths, when streaming. Default: ``100``.
     '''
     # Prefer kwargs before opts
     base_indent = kwargs.get('nested_indent', 0) \
@@ -355,6 +439,26 @@ def output(ret, **kwargs):
             )
         )
 
+    if kwargs.get('stream') or __opts__.get('out.table.stream'):
+        rows = None
+        labels = None
+        if isinstance(ret, dict) and rows_key in ret:
+            rows = ret[rows_key]
+            labels = ret.get(labels_key) if labels_key else None
+        elif isinstance(ret, (list, tuple, types.GeneratorType)) and not rows_key:
+            rows = ret
+        if rows is not None:
+            lines = table.stream_rows(rows,
+                                      labels,
+                                      base_indent + 4,
+                                      widths=kwargs.get('widths') or __opts__.get('out.table.widths'),
+                                      sample_size=kwargs.get('sample_size') or
+                                      __opts__.get('out.table.sample_size', 100))
+            for line in itertools.chain(out, lines):
+                sys.stdout.write(line + '\n')
+                sys.stdout.flush()
+            return ''
+
     return '\n'.join(table.display(ret,
                                    base_indent,
                                    out,
@@ -66,6 +66,12 @@ Configuration
     outputter: table
         Specify the outputter name when displaying on the CLI. Default: `table`.
 
+    cache_ttl: 300
+        For how many seconds the mine data is cached on the master, so consecutive
+        executions of the runner don't load it again from the mine.
+        The cache is invalidated earlier when any of the targeted minions updates its mine.
+        Default: `300` seconds. When `0`, the mine data is loaded on every execution.
+
     Configuration example:
 
     .. code-block: yaml
@@ -74,6 +80,7 @@ Configuration
           bgp:
             tgt: 'edge*'
             tgt_type: 'glob'
+            cache_ttl: 600
             return_fields:
                 - up
                 - connection_state
@@ -87,10 +94,16 @@ from __future__ import print_function
 from __future__ import absolute_import
 from __future__ import unicode_literals
 
+# Import python libs
+import json
+import time
+import bisect
+
 # Import third party libs
 try:
     from netaddr import IPNetwork
     from netaddr import IPAddress
+    from netaddr.core import AddrFormatError
     # pylint: disable=unused-import
     from napalm_base import helpers as napalm_helpers
     # pylint: enable=unused-import
@@ -117,6 +130,9 @@ _DEFAULT_TARGET = '*'
 _DEFAULT_EXPR_FORM = 'glob'
 _DEFAULT_DISPLAY = True
 _DEFAULT_OUTPUTTER = 'table'
+_DEFAULT_CACHE_TTL = 300
+# larger tables are rendered and flushed line by line, using column widths from a sample of rows
+_STREAM_ROWS = 1000
 _DEFAULT_INCLUDED_FIELDS = [
     'device',
     'as_number',
@@ -136,6 +152,19 @@ _DEFAULT_LABELS_MAPPING = {
     'export_policy': 'Policy OUT'
 }
 
+# will cache the mine data, as (timestamp, mine data), to avoid loading it several times.
+_CACHE = {}
+# lookup tables built once per mine snapshot, see ``_get_index``.
+_INDEX = {}
+# placeholder in the columns, for the fields a neighbor does not have.
+_MISSING = object()
+_AGGREGATE_FUNCTIONS = {
+    'sum': sum,
+    'min': min,
+    'max': max,
+    'count': len
+}
+
 # -----------------------------------------------------------------------------
 # property functions
 # -----------------------------------------------------------------------------
@@ -162,6 +191,7 @@ def _get_bgp_runner_opts():
         'display': runner_opts.get('display', _DEFAULT_DISPLAY),
         'return_fields': _DEFAULT_INCLUDED_FIELDS + runner_opts.get('return_fields', _DEFAULT_RETURN_FIELDS),
         'outputter': runner_opts.get('outputter', _DEFAULT_OUTPUTTER),
+        'cache_ttl': runner_opts.get('cache_ttl', _DEFAULT_CACHE_TTL),
     }
 
 
@@ -172,19 +202,229 @@ def _get_mine(opts=None):
     if not opts:
         # not a massive improvement, but better than recomputing the runner opts dict
         opts = _get_bgp_runner_opts()
-    return __salt__['mine.get'](opts['tgt'],
-                                'bgp.neighbors',
-                                tgt_type=opts['tgt_type'])
+    cache_key = (opts['tgt'], opts['tgt_type'])
+    if cache_key in _CACHE and _CACHE[cache_key][1] and opts['cache_ttl'] and \
+            time.time() - _CACHE[cache_key][0] < opts['cache_ttl']:
+        return _CACHE[cache_key][1]
+
+    def _fetch():
+        return __salt__['mine.get'](opts['tgt'],
+                                    'bgp.neighbors',
+                                    tgt_type=opts['tgt_type'])
+
+    _CACHE[cache_key] = (time.time(), __utils__['mine_cache.get'](__opts__,
+                                                                  'bgp.neighbors',
+                                                                  _fetch,
+                                                                  tgt=opts['tgt'],
+                                                                  tgt_type=opts['tgt_type'],
+                                                                  ttl=opts['cache_ttl']))
+    return _CACHE[cache_key][1]
+
+
+def _build_index(get_bgp_neighbors_all):
+    '''
+    Flatten the ``bgp.neighbors`` mine into a list of rows
+    ``(minion, vrf, asn, neighbor)``, and index the neighbors remote addresses.
+
+    The rows are also stored column by column under ``columns``, one list per field,
+    starting with ``device``, ``vrf`` and ``as_number``; the columns of the neighbors
+    fields are built when first needed, see ``_get_column``.
+    For each filtered field, ``selections`` maps every value to the set of positions
+    having that value, so the filters are evaluated as set operations.
+
+    The addresses are indexed separately per IP version, as a sorted array
+    of integers: the addresses under a certain prefix are then a contiguous slice
+    (the subtree of that prefix), found using two binary searches.
+    The rows without a remote address are listed under ``unaddressed``.
+    '''
+    index = {
+        'rows': [],
+        'columns': {
+            'device': [],
+            'vrf': [],
+            'as_number': []
+        },
+        'selections': {},
+        'addresses': {},
+        'unaddressed': []
+    }
+    addresses = {4: [], 6: []}
+    for minion, get_bgp_neighbors_minion in six.iteritems(get_bgp_neighbors_all):
+        if not get_bgp_neighbors_minion.get('result'):
+            continue  # ignore empty or failed mines
+        get_bgp_neighbors_minion_out = get_bgp_neighbors_minion.get('out', {})
+        for vrf, vrf_bgp_neighbors in six.iteritems(get_bgp_neighbors_minion_out):
+            for asn, get_bgp_neighbors_minion_asn in six.iteritems(vrf_bgp_neighbors):
+                for neighbor in get_bgp_neighbors_minion_asn:
+                    pos = len(index['rows'])
+                    index['rows'].append((minion, vrf, asn, neighbor))
+                    index['columns']['device'].append(minion)
+                    index['columns']['vrf'].append(vrf)
+                    index['columns']['as_number'].append(asn)
+                    if not neighbor.get('remote_address'):
+                        index['unaddressed'].append(pos)
+                        continue
+                    try:
+                        neighbor_ip_obj = IPAddress(neighbor['remote_address'])
+                    except (AddrFormatError, ValueError):
+                        continue
+                    addresses[neighbor_ip_obj.version].append((neighbor_ip_obj.value, pos))
+    for version, version_addresses in six.iteritems(addresses):
+        version_addresses.sort()
+        index['addresses'][version] = (
+            [address for address, _ in version_addresses],
+            [pos for _, pos in version_addresses]
+        )
+    return index
+
+
+def _get_index(get_bgp_neighbors_all):
+    '''
+    Return the lookup tables for this mine snapshot, building them only once.
+    '''
+    cached = _INDEX.get('neighbors')
+    if cached and cached[0] is get_bgp_neighbors_all:
+        return cached[1]
+    index = _build_index(get_bgp_neighbors_all)
+    _INDEX['neighbors'] = (get_bgp_neighbors_all, index)
+    return index
+
+
+def _lookup_address_range(index, version, first, last):
+    '''
+    Return the positions of the neighbors whose remote address is between ``first`` and ``last``.
+    '''
+    if version not in index['addresses']:
+        return []
+    keys, positions = index['addresses'][version]
+    return positions[bisect.bisect_left(keys, first):bisect.bisect_right(keys, last)]
+
+
+def _lookup_networks(index, ipnets):
+    '''
+    Return the positions of the neighbors within any of the IP networks ``ipnets``.
+    '''
+    # the neighbors without a remote address cannot be filtered by network
+    positions = set(index['unaddressed'])
+    for ipnet_obj in ipnets:
+        positions.update(_lookup_address_range(index, ipnet_obj.version, ipnet_obj.first, ipnet_obj.last))
+    return positions
+
+
+def _lookup_ip(index, neighbor_ip):
+    '''
+    Return the positions of the neighbors having the remote address ``neighbor_ip``.
+    '''
+    try:
+        neighbor_ip_obj = IPAddress(neighbor_ip)
+    except (AddrFormatError, ValueError):
+        return set()
+    return set(_lookup_address_range(index, neighbor_ip_obj.version, neighbor_ip_obj.value, neighbor_ip_obj.value))
+
+
+def _get_column(index, field):
+    '''
+    Return the list of values of a certain field, for all the neighbors.
+    '''
+    if field not in index['columns']:
+        index['columns'][field] = [neighbor.get(field, _MISSING) for _, _, _, neighbor in index['rows']]
+    return index['columns'][field]
+
+
+def _hashable(value):
+    '''
+    Return a hashable key for a field value: lists become tuples, dicts become JSON strings.
+    '''
+    if isinstance(value, (list, tuple)):
+        return tuple(_hashable(item) for item in value)
+    if isinstance(value, dict):
+        return json.dumps(value, sort_keys=True, default=str)
+    return value
+
+
+def _get_selections(index, field):
+    '''
+    Return the sets of positions for each value of a certain field.
+    '''
+    if field not in index['selections']:
+        selections = {}
+        for pos, value in enumerate(_get_column(index, field)):
+            selections.setdefault(value, set()).add(pos)
+        index['selections'][field] = selections
+    return index['selections'][field]
+
+
+def _select_values(index, field, values, missing=False):
+    '''
+    Return the positions of the neighbors having any of the ``values`` for ``field``.
+    When ``missing`` is ``True``, include the neighbors not having that field.
+    '''
+    try:
+        selections = _get_selections(index, field)
+        positions = set()
+        for value in values:
+            positions |= selections.get(value, set())
+        if missing:
+            positions |= selections.get(_MISSING, set())
+        return positions
+    except TypeError:
+        # unhashable values, compare one by one
+        return set(
+            pos for pos, value in enumerate(_get_column(index, field))
+            if value in values or (missing and value is _MISSING)
+        )
+
+
+def _select(index, asns=None, device=None, neighbor_ip=None, ipnets=None, filters=None):
+    '''
+    Return the sorted positions of the neighbors matching all the filters.
+    The filters on the neighbors fields match the neighbors not having that field.
+    '''
+    positions = None
+    selections = []
+    if neighbor_ip:
+        selections.append(_lookup_ip(index, neighbor_ip))
+    if ipnets:
+        selections.append(_lookup_networks(index, ipnets))
+    if device:
+        selections.append(_select_values(index, 'device', [device]))
+    if asns:
+        selections.append(_select_values(index, 'as_number', asns))
+    for field, value in six.iteritems(filters or {}):
+        selections.append(_select_values(index, field, [value], missing=True))
+    for selection in selections:
+        positions = selection if positions is None else positions & selection
+    if positions is None:
+        return list(range(len(index['rows'])))
+    return sorted(positions)
+
+
+def _get_networks(ipnet):
+    '''
+    Return the list of IP networks from a list, or a comma separated string.
+    '''
+    if isinstance(ipnet, six.string_types):
+        ipnet = ipnet.split(',')
+    elif ipnet and not isinstance(ipnet, (list, tuple)):
+        ipnet = [ipnet]
+    return [IPNetwork(net.strip() if isinstance(net, six.string_types) else net) for net in (ipnet or [])]
+
 
+def _get_label(field):
+    '''
+    Return the label of a field, as displayed in the table header.
+    '''
+    if field in _DEFAULT_LABELS_MAPPING:
+        return _DEFAULT_LABELS_MAPPING[field]
+    # transform from 'previous_connection_state' to 'Previous Connection State'
+    return ' '.join(map(lambda word: word.title(), field.split('_')))
 
-def _compare_match(dict1, dict2):
+
+def _clean_kwargs(kwargs):
     '''
-    Compare two dictionaries and return a boolean value if their values match.
+    Remove the __pub args, not used in this runner (yet).
     '''
-    for karg, warg in six.iteritems(dict1):
-        if karg in dict2 and dict2[karg] != warg:
-            return False
-    return True
+    return dict((karg, warg) for karg, warg in six.iteritems(kwargs) if not karg.startswith('__pub'))
 
 
 def _display_runner(rows, labels, title, display=_DEFAULT_DISPLAY):
@@ -199,7 +439,11 @@ def _display_runner(rows, labels, title, display=_DEFAULT_DISPLAY):
                                          __opts__,
                                          title=title,
                                          rows_key='rows',
-                                         labels_key='labels')
+                                         labels_key='labels',
+                                         stream=len(rows) > _STREAM_ROWS)
+            if len(rows) > _STREAM_ROWS:
+                # the lines have already been written to the standard output
+                return
         else:
             ret = salt.output.out_format(rows,
                                          bgp_runner_opts.get('outputter'),
@@ -233,6 +477,8 @@ def neighbors(*asns, **kwargs):
 
     network
         Search neighbors within a certain IP network.
+        Multiple networks can be specified as a list, or separated by comma,
+        in which case the neighbors within any of them are selected.
 
     title
         Custom title.
@@ -252,6 +498,7 @@ def neighbors(*asns, **kwargs):
         salt-run bgp.neighbors multipath=True
         salt-run bgp.neighbors up=False export_policy=my-export-policy multihop=False
         salt-run bgp.neighbors network=192.168.0.0/16
+        salt-run bgp.neighbors network=192.168.0.0/16,2001:db8::/32
 
     Output example:
 
@@ -281,31 +528,22 @@ def neighbors(*asns, **kwargs):
     display = kwargs.pop('display', opts['display'])
 
     # cleaning up the kwargs
-    # __pub args not used in this runner (yet)
-    kwargs_copy = {}
-    kwargs_copy.update(kwargs)
-    for karg, _ in six.iteritems(kwargs_copy):
-        if karg.startswith('__pub'):
-            kwargs.pop(karg)
+    kwargs = _clean_kwargs(kwargs)
     if not asns and not kwargs:
         if display:
             print('Please specify at least an AS Number or an output filter')
         return []
     device = kwargs.pop('device', None)
     neighbor_ip = kwargs.pop('ip', None)
-    ipnet = kwargs.pop('network', None)
-    ipnet_obj = IPNetwork(ipnet) if ipnet else None
+    ipnets = _get_networks(kwargs.pop('network', None))
+    ipnet = ', '.join([str(net) for net in ipnets])
     # any other key passed on the CLI can be used as a filter
 
     rows = []
     # building the labels
     labels = {}
     for field in opts['return_fields']:
-        if field in _DEFAULT_LABELS_MAPPING:
-            labels[field] = _DEFAULT_LABELS_MAPPING[field]
-        else:
-            # transform from 'previous_connection_state' to 'Previous Connection State'
-            labels[field] = ' '.join(map(lambda word: word.title(), field.split('_')))
+        labels[field] = _get_label(field)
     display_fields = list(set(opts['return_fields']) - set(_DEFAULT_INCLUDED_FIELDS))
     get_bgp_neighbors_all = _get_mine(opts=opts)
 
@@ -324,49 +562,134 @@ def neighbors(*asns, **kwargs):
                 attrmap=', '.join(map(lambda key: '{key}={value}'.format(key=key, value=kwargs[key]), kwargs))
             ))
         title = '\n'.join(title_parts)
-    for minion, get_bgp_neighbors_minion in six.iteritems(get_bgp_neighbors_all):  # pylint: disable=too-many-nested-blocks
-        if not get_bgp_neighbors_minion.get('result'):
-            continue  # ignore empty or failed mines
-        if device and minion != device:
-            # when requested to display only the neighbors on a certain device
+    index = _get_index(get_bgp_neighbors_all)
+    for pos in _select(index, asns=asns, device=device, neighbor_ip=neighbor_ip, ipnets=ipnets, filters=kwargs):
+        minion, vrf, asn, neighbor = index['rows'][pos]  # pylint: disable=unused-variable
+        row = {
+            'device': minion,
+            'neighbor_address': neighbor.get('remote_address'),
+            'as_number': asn
+        }
+        if 'connection_stats' in display_fields:
+            connection_stats = '{state} {active}/{received}/{accepted}/{damped}'.format(
+                state=neighbor.get('connection_state', -1),
+                active=neighbor.get('active_prefix_count', -1),
+                received=neighbor.get('received_prefix_count', -1),
+                accepted=neighbor.get('accepted_prefix_count', -1),
+                damped=neighbor.get('suppressed_prefix_count', -1),
+            )
+            row['connection_stats'] = connection_stats
+        for field in display_fields:
+            if field in neighbor:
+                row[field] = neighbor[field]
+        rows.append(row)
+    return _display_runner(rows, labels, title, display=display)
+
+
+def aggregate(*asns, **kwargs):
+    '''
+    Aggregate a numeric field of the BGP neighbors from the mines of the ``bgp.neighbors`` function,
+    grouping the neighbors by another field.
+
+    .. versionadded:: Nitrogen
+
+    Arguments:
+
+    *asns
+        A list of AS numbers to aggregate for.
+
+    field: ``received_prefix_count``
+        The neighbors field to aggregate.
+
+    group_by: ``as_number``
+        The field to group the neighbors by: ``device``, ``vrf``, ``as_number``
+        or any field from the output of the `neighbors` function
+        from the :mod:`NAPALM BGP module <salt.modules.napalm_bgp>`.
+
+    fun: ``sum``
+        The aggregation function: ``sum``, ``min``, ``max`` or ``count``.
+        ``count`` returns the number of neighbors in each group.
+
+    title
+        Custom title.
+
+    display: True
+        Display on the screen or return structured object? Default: `True`, will return on the CLI.
+
+    The ``device``, ``ip`` and ``network`` filters, as well as any field from the output
+    of the `neighbors` function can be used to select the neighbors,
+    as in :func:`neighbors <neighbors>`.
+
+    CLI Example:
+
+    .. code-block:: bash
+
+        salt-run bgp.aggregate
+        salt-run bgp.aggregate 13335 15169 field=accepted_prefix_count
+        salt-run bgp.aggregate group_by=device fun=count up=False
+
+    Output example:
+
+    .. code-block:: text
+
+        Sum of received_prefix_count per as_number
+        ___________________________________________________
+        | AS Number | Sum of Received Prefix Count        |
+        ___________________________________________________
+        |   13335   |                1194                 |
+        ___________________________________________________
+        |   15169   |                 204                 |
+        ___________________________________________________
+    '''
+    opts = _get_bgp_runner_opts()
+    title = kwargs.pop('title', None)
+    display = kwargs.pop('display', opts['display'])
+    kwargs = _clean_kwargs(kwargs)
+    field = kwargs.pop('field', 'received_prefix_count')
+    group_by = kwargs.pop('group_by', 'as_number')
+    fun = kwargs.pop('fun', 'sum')
+    if fun not in _AGGREGATE_FUNCTIONS:
+        if display:
+            print('Please specify a valid aggregation function: {funs}'.format(
+                funs=', '.join(sorted(_AGGREGATE_FUNCTIONS))
+            ))
+        return []
+    device = kwargs.pop('device', None)
+    neighbor_ip = kwargs.pop('ip', None)
+    ipnets = _get_networks(kwargs.pop('network', None))
+
+    index = _get_index(_get_mine(opts=opts))
+    positions = _select(index, asns=asns, device=device, neighbor_ip=neighbor_ip, ipnets=ipnets, filters=kwargs)
+    group_column = _get_column(index, group_by)
+    value_column = _get_column(index, field)
+    groups = {}
+    for pos in positions:
+        group = group_column[pos]
+        if group is _MISSING:
             continue
-        get_bgp_neighbors_minion_out = get_bgp_neighbors_minion.get('out', {})
-        for vrf, vrf_bgp_neighbors in get_bgp_neighbors_minion_out.iteritems():  # pylint: disable=unused-variable
-            for asn, get_bgp_neighbors_minion_asn in vrf_bgp_neighbors.iteritems():
-                if asns and asn not in asns:
-                    # if filtering by AS number(s),
-                    # will ignore if this AS number key not in that list
-                    # and continue the search
-                    continue
-                for neighbor in get_bgp_neighbors_minion_asn:
-                    if kwargs and not _compare_match(kwargs, neighbor):
-                        # requested filtering by neighbors stats
-                        # but this one does not correspond
-                        continue
-                    if neighbor_ip and neighbor_ip != neighbor.get('remote_address'):
-                        # requested filtering by neighbors IP addr
-                        continue
-                    if ipnet_obj and neighbor.get('remote_address'):
-                        neighbor_ip_obj = IPAddress(neighbor.get('remote_address'))
-                        if neighbor_ip_obj not in ipnet_obj:
-                            # Neighbor not in this network
-                            continue
-                    row = {
-                        'device': minion,
-                        'neighbor_address': neighbor.get('remote_address'),
-                        'as_number': asn
-                    }
-                    if 'connection_stats' in display_fields:
-                        connection_stats = '{state} {active}/{received}/{accepted}/{damped}'.format(
-                            state=neighbor.get('connection_state', -1),
-                            active=neighbor.get('active_prefix_count', -1),
-                            received=neighbor.get('received_prefix_count', -1),
-                            accepted=neighbor.get('accepted_prefix_count', -1),
-                            damped=neighbor.get('suppressed_prefix_count', -1),
-                        )
-                        row['connection_stats'] = connection_stats
-                    for field in display_fields:
-                        if field in neighbor:
-                            row[field] = neighbor[field]
-                    rows.append(row)
+        # multi-valued fields (lists, dicts) are grouped by a hashable key, displaying the original value
+        _, values = groups.setdefault(_hashable(group), (group, []))
+        if fun == 'count':
+            values.append(pos)
+        elif isinstance(value_column[pos], six.integer_types + (float,)):
+            values.append(value_column[pos])
+
+    if fun == 'count':
+        value_label = 'Number of Neighbors'
+        title = title or 'Number of neighbors per {group_by}'.format(group_by=group_by)
+    else:
+        value_label = '{fun} of {field}'.format(fun=fun.title(), field=_get_label(field))
+        title = title or '{fun} of {field} per {group_by}'.format(fun=fun.title(), field=field, group_by=group_by)
+    labels = {
+        group_by: _get_label(group_by),
+        'value': value_label
+    }
+    rows = [
+        {
+            group_by: group,
+            'value': _AGGREGATE_FUNCTIONS[fun](values)
+        }
+        for group, values in sorted(six.itervalues(groups), key=lambda group: str(group[0]))
+        if values
+    ]
     return _display_runner(rows, labels, title, display=display)
@@ -53,6 +53,12 @@ Configuration
     outputter: table
         Specify the outputter name when displaying on the CLI. Default: `table`.
 
+    cache_ttl: 300
+        For how many seconds the mine data is cached on the master, so consecutive
+        executions of the runner don't load it again from the mine.
+        The cache is invalidated earlier when any of the targeted minions updates its mine.
+        Default: `300` seconds. When `0`, the mine data is cached only during the runner execution.
+
     Configuration example:
 
     .. code-block: yaml
@@ -61,6 +67,7 @@ Configuration
           net.find:
             target: 'edge*'
             expr_form: 'glob'
+            cache_ttl: 600
             ignore_interfaces:
               - lo0
               - em1
@@ -73,6 +80,11 @@ from __future__ import print_function
 from __future__ import absolute_import
 from __future__ import unicode_literals
 
+# Import python libs
+import time
+import bisect
+import collections
+
 # Import salt lib
 import salt.output
 from salt.ext import six
@@ -97,14 +109,29 @@ _DEFAULT_IGNORE_INTF = []
 # 'lo0', 'em1', 'em0', 'jsrv', 'fxp0'
 _DEFAULT_DISPLAY = True
 _DEFAULT_OUTPUTTER = 'table'
+_DEFAULT_CACHE_TTL = 300
+# larger tables are rendered and flushed line by line, using column widths from a sample of rows
+_STREAM_ROWS = 1000
 
 
 # -----------------------------------------------------------------------------
 # global variables
 # -----------------------------------------------------------------------------
 
-# will cache several details to avoid loading them several times from the mines.
+# will cache several details to avoid loading them several times from the mines,
+# as (timestamp, mine data) tuples.
 _CACHE = {}
+# lookup tables built once per mine snapshot, see ``_get_index``.
+_INDEX = {}
+# substring matches computed by ``multi_find`` for all the patterns at once,
+# as (lookup table, matches) tuples.
+_MATCHES = {}
+# the lookup tables used during ``multi_find``, not rebuilt even when the mine
+# cache expires in the meanwhile, so the matches above stay valid.
+_PINNED_INDEX = {}
+# the minimum number of patterns for which matching all of them at once using
+# the Aho-Corasick automaton is faster than checking each pattern using ``in``.
+_AUTOMATON_MIN_PATTERNS = 8
 
 # -----------------------------------------------------------------------------
 # helper functions -- will not be exported
@@ -131,6 +158,7 @@ def _get_net_runner_opts():
         'ignore_interfaces': runner_opts.get('ignore_interfaces', _DEFAULT_IGNORE_INTF),
         'display': runner_opts.get('display', _DEFAULT_DISPLAY),
         'outputter': runner_opts.get('outputter', _DEFAULT_OUTPUTTER),
+        'cache_ttl': runner_opts.get('cache_ttl', _DEFAULT_CACHE_TTL),
     }
 
 
@@ -138,22 +166,52 @@ def _get_mine(fun):
     '''
     Return the mine function from all the targeted minions.
     Just a small helper to avoid redundant pieces of code.
+
+    The mine data is kept in memory and in the mine snapshot cache for ``cache_ttl`` seconds.
     '''
-    if fun in _CACHE and _CACHE[fun]:
-        return _CACHE[fun]
     net_runner_opts = _get_net_runner_opts()
-    _CACHE[fun] = __salt__['mine.get'](net_runner_opts.get('target'),
-                                       fun,
-                                       tgt_type=net_runner_opts.get('expr_form'))
-    return _CACHE[fun]
-
-
-def _display_runner(rows, labels, title, display=_DEFAULT_DISPLAY):
+    cache_ttl = net_runner_opts.get('cache_ttl')
+    if fun in _CACHE and _CACHE[fun][1]:
+        cached_at, cached_mine = _CACHE[fun]
+        if not cache_ttl or time.time() - cached_at < cache_ttl:
+            return cached_mine
+
+    def _fetch():
+        return __salt__['mine.get'](net_runner_opts.get('target'),
+                                    fun,
+                                    tgt_type=net_runner_opts.get('expr_form'))
+
+    _CACHE[fun] = (time.time(), __utils__['mine_cache.get'](__opts__,
+                                                            fun,
+                                                            _fetch,
+                                                            tgt=net_runner_opts.get('target'),
+                                                            tgt_type=net_runner_opts.get('expr_form'),
+                                                            ttl=cache_ttl))
+    return _CACHE[fun][1]
+
+
+def _display_runner(rows, labels, title, display=_DEFAULT_DISPLAY, count=None):
     '''
     Display or return the rows.
+
+    The rows can be a generator, in which case ``count`` is the number of rows
+    it yields: the large tables are streamed by the table outputter without
+    holding all the rows in memory.
     '''
+    stream = (len(rows) if count is None else count) > _STREAM_ROWS
     if display:
         net_runner_opts = _get_net_runner_opts()
+        if net_runner_opts.get('outputter') == 'table' and stream:
+            # the lines are written to the standard output as they are rendered
+            salt.output.out_format({'rows': rows, 'labels': labels},
+                                   'table',
+                                   __opts__,
+                                   title=title,
+                                   rows_key='rows',
+                                   labels_key='labels',
+                                   stream=True)
+            return
+        rows = list(rows)
         if net_runner_opts.get('outputter') == 'table':
             ret = salt.output.out_format({'rows': rows, 'labels': labels},
                                          'table',
@@ -167,7 +225,7 @@ def _display_runner(rows, labels, title, display=_DEFAULT_DISPLAY):
                                          __opts__)
         print(ret)
     else:
-        return rows
+        return list(rows)
 
 
 def _get_network_obj(addr):
@@ -182,59 +240,450 @@ def _get_network_obj(addr):
     return ip_netw
 
 
-def _find_interfaces_ip(mac):
+def _get_index(name, builder, *funs):
     '''
-    Helper to search the interfaces IPs using the MAC address.
+    Return the lookup tables for the mine functions ``funs``,
+    built using ``builder``. The tables are built only once per mine snapshot
+    and rebuilt only when the mine data returned by ``_get_mine`` changes.
     '''
-    try:
-        mac = napalm_helpers.convert(napalm_helpers.mac, mac)
-    except AddrFormatError:
-        return ('', '', [])
+    if name in _PINNED_INDEX:
+        return _PINNED_INDEX[name]
+    mines = tuple(_get_mine(fun) for fun in funs)
+    cached = _INDEX.get(name)
+    if cached and len(cached[0]) == len(mines) and \
+            all(old is new for old, new in zip(cached[0], mines)):
+        return cached[1]
+    index = builder(*mines)
+    _INDEX[name] = (mines, index)
+    return index
+
+
+def _index_add(table, key, pos):
+    '''
+    Register the position ``pos`` under ``key`` in a lookup table.
+    '''
+    table.setdefault(key, []).append(pos)
 
-    all_interfaces = _get_mine('net.interfaces')
-    all_ipaddrs = _get_mine('net.ipaddrs')
+
+def _batch_matches(batch, table):
+    '''
+    Return the matches computed by ``multi_find`` under the ``batch`` name,
+    only when computed against this very lookup table.
+    '''
+    matched = _MATCHES.get(batch)
+    if matched and matched[0] is table:
+        return matched[1]
+    return {}
+
+
+def _index_substring(table, pattern, batch=None):
+    '''
+    Return the positions registered under the keys containing ``pattern``.
+    Only the distinct keys are scanned, not every single entry.
+    When searching for multiple patterns, the keys are matched once for all the patterns,
+    and the result is made available under the ``batch`` name.
+    '''
+    batch_matches = _batch_matches(batch, table)
+    if pattern in batch_matches:
+        keys = batch_matches[pattern]
+    else:
+        keys = _match_patterns([pattern], [(key, (key,)) for key in table])[pattern]
+    positions = []
+    for key in keys:
+        positions.extend(table[key])
+    return positions
+
+
+def _build_automaton(patterns):
+    '''
+    Build the Aho-Corasick automaton matching all the patterns at once:
+    the transitions, the failure links and the patterns ending in each state.
+    '''
+    goto = [{}]
+    fail = [0]
+    out = [set()]
+    for pattern in patterns:
+        state = 0
+        for char in pattern:
+            if char not in goto[state]:
+                goto.append({})
+                fail.append(0)
+                out.append(set())
+                goto[state][char] = len(goto) - 1
+            state = goto[state][char]
+        out[state].add(pattern)
+    queue = collections.deque(goto[0].values())
+    while queue:
+        state = queue.popleft()
+        for char, next_state in six.iteritems(goto[state]):
+            queue.append(next_state)
+            fallback = fail[state]
+            while fallback and char not in goto[fallback]:
+                fallback = fail[fallback]
+            fail[next_state] = goto[fallback].get(char, 0)
+            out[next_state] |= out[fail[next_state]]
+    return goto, fail, out
+
+
+def _search_automaton(automaton, text):
+    '''
+    Return the patterns of the automaton found in ``text``, in a single pass.
+    '''
+    goto, fail, out = automaton
+    found = set()
+    state = 0
+    for char in text:
+        while state and char not in goto[state]:
+            state = fail[state]
+        state = goto[state].get(char, 0)
+        if out[state]:
+            found |= out[state]
+    return found
+
+
+def _match_patterns(patterns, haystacks):
+    '''
+    Return, for each pattern, the set of positions whose texts contain that pattern.
+    ``haystacks`` is an iterable of ``(position, texts)`` tuples, walked only once.
+    '''
+    patterns = set(pattern for pattern in patterns if pattern)
+    matches = dict((pattern, set()) for pattern in patterns)
+    if len(patterns) < _AUTOMATON_MIN_PATTERNS:
+        # the automaton is walked char by char, slower than a few ``in`` checks
+        for pos, texts in haystacks:
+            for pattern in patterns:
+                if any(pattern in text for text in texts):
+                    matches[pattern].add(pos)
+        return matches
+    automaton = _build_automaton(patterns)
+    for pos, texts in haystacks:
+        for text in texts:
+            for pattern in _search_automaton(automaton, text):
+                matches[pattern].add(pos)
+    return matches
+
+
+def _index_pattern(index, pattern, batch):
+    '''
+    Return the positions whose lowercased ``search`` fields contain ``pattern``.
+    '''
+    ptl = pattern.lower()
+    batch_matches = _batch_matches(batch, index)
+    if ptl in batch_matches:
+        return batch_matches[ptl]
+    return _match_patterns([ptl], enumerate(index['search']))[ptl]
+
+
+def _index_intersect(positions, candidates):
+    '''
+    Narrow down the selected positions, ``None`` meaning no selection yet.
+    '''
+    if positions is None:
+        return set(candidates)
+    return positions.intersection(candidates)
+
+
+def _index_rows(index, positions):
+    '''
+    Generate a copy of the rows found at ``positions``, preserving the mine order.
+    '''
+    return (dict(index['rows'][pos]) for pos in sorted(positions))
+
+
+def _build_interfaces_index(all_interfaces, all_ipaddrs):
+    '''
+    Build the lookup tables for the ``net.interfaces`` and ``net.ipaddrs`` mines:
+
+    - ``entries``: one tuple per interface, with the pre-computed details
+    - ``search``: the lowercased description of each interface
+    - ``device``, ``interface``, ``mac``: positions in ``entries``
+    - ``ipaddrs``: IP addresses per (device, interface)
+    - ``ip``: the first (device, interface) having a certain IP address
+    - ``networks``: positions in ``entries`` per IP version and prefix length,
+      keyed by the first address of the network, used for the ``ipnet`` lookups
+    '''
+    index = {
+        'entries': [],
+        'search': [],
+        'device': {},
+        'interface': {},
+        'mac': {},
+        'ipaddrs': {},
+        'ip': {},
+        'networks': {},
+        'network_keys': {}
+    }
+    device_groups = {}
+    for device, device_ipaddrs in six.iteritems(all_ipaddrs):
+        for intrf, interface_ipaddrs in six.iteritems(device_ipaddrs.get('out', {})):
+            ip_addresses = {}
+            ip_addresses.update(interface_ipaddrs.get('ipv4', {}))
+            ip_addresses.update(interface_ipaddrs.get('ipv6', {}))
+            ips = ['{0}/{1}'.format(ip_addr, addr_details.get('prefix_length', '32'))
+                   for ip_addr, addr_details in six.iteritems(ip_addresses)]
+            index['ipaddrs'][(device, intrf)] = ips
+            if not device_ipaddrs.get('result', False):
+                continue
+            for ip_addr in ip_addresses:
+                index['ip'].setdefault(ip_addr, (device, intrf))
+            # the IP addresses of the units are displayed under the physical interface
+            device_groups.setdefault(device, {}).setdefault(intrf.split('.')[0], []).append(ips)
 
     for device, device_interfaces in six.iteritems(all_interfaces):
-        if not device_interfaces.get('result', False):
+        if not device_interfaces or not device_interfaces.get('result', False):
             continue
-        for interface, interface_details in six.iteritems(device_interfaces.get('out', {})):
+        for interface_name, interface_details in six.iteritems(device_interfaces.get('out', {})):
+            if not interface_details:
+                continue
             try:
                 interface_mac = napalm_helpers.convert(napalm_helpers.mac, interface_details.get('mac_address'))
             except AddrFormatError:
-                continue
-            if mac != interface_mac:
-                continue
-            interface_ipaddrs = all_ipaddrs.get(device, {}).get('out', {}).get(interface, {})
-            ip_addresses = interface_ipaddrs.get('ipv4', {})
-            ip_addresses.update(interface_ipaddrs.get('ipv6', {}))
-            interface_ips = ['{0}/{1}'.format(ip_addr,
-                                              addr_details.get('prefix_length', '32'))
-                             for ip_addr, addr_details in six.iteritems(ip_addresses)]
-            return device, interface, interface_ips
+                interface_mac = ''
+            device_entry = {
+                'device': device,
+                'interface': interface_name,
+                'interface_description': (interface_details.get('description', '') or ''),
+                'is_up': (interface_details.get('is_up', '') or ''),
+                'is_enabled': (interface_details.get('is_enabled', '') or ''),
+                'speed': (interface_details.get('speed', '') or ''),
+                'mac': interface_mac or '',
+                'ips': []
+            }
+            ips_groups = None
+            if all_ipaddrs.get(device, {}).get('result', False):
+                ips_groups = device_groups.get(device, {}).get(interface_name, [])
+            pos = len(index['entries'])
+            index['entries'].append((device, interface_name, device_entry, ips_groups))
+            index['search'].append((device_entry['interface_description'].lower(),))
+            _index_add(index['device'], device, pos)
+            _index_add(index['interface'], interface_name, pos)
+            if interface_mac:
+                _index_add(index['mac'], interface_mac, pos)
+            for ips in (ips_groups or []):
+                for ip_addr in ips:
+                    if ip_addr == '0.0.0.0/0':
+                        continue
+                    net_obj = _get_network_obj(ip_addr)
+                    if not net_obj:
+                        continue
+                    networks = index['networks'].setdefault((net_obj.version, net_obj.prefixlen), {})
+                    networks.setdefault(net_obj.first, set()).add(pos)
 
-    return ('', '', [])
+    for net_key, networks in six.iteritems(index['networks']):
+        index['network_keys'][net_key] = sorted(networks)
+    return index
 
 
-def _find_interfaces_mac(ip):  # pylint: disable=invalid-name
+def _lookup_network(index, ipnet):
     '''
-    Helper to get the interfaces hardware address using the IP Address.
+    Return the positions of the interfaces having at least one IP network
+    that includes, or is included in, ``ipnet``.
+    The supernets are found by masking ``ipnet`` for each prefix length,
+    while the subnets are selected using a binary search on the sorted networks.
     '''
-    all_interfaces = _get_mine('net.interfaces')
-    all_ipaddrs = _get_mine('net.ipaddrs')
+    positions = set()
+    width = 32 if ipnet.version == 4 else 128
+    for (version, prefixlen), networks in six.iteritems(index['networks']):
+        if version != ipnet.version:
+            continue
+        if prefixlen <= ipnet.prefixlen:
+            shift = width - prefixlen
+            positions.update(networks.get((ipnet.first >> shift) << shift, ()))
+            continue
+        keys = index['network_keys'][(version, prefixlen)]
+        start = bisect.bisect_left(keys, ipnet.first)
+        stop = bisect.bisect_right(keys, ipnet.last)
+        for key in keys[start:stop]:
+            positions.update(networks[key])
+    return positions
 
-    for device, device_ipaddrs in six.iteritems(all_ipaddrs):
-        if not device_ipaddrs.get('result', False):
+
+def _build_arp_index(all_arp):
+    '''
+    Build the lookup tables for the ``net.arp`` mine:
+    the rows, and their positions by device, MAC, IP address and interface.
+    '''
+    index = {
+        'rows': [],
+        'device': {},
+        'mac': {},
+        'ip': {},
+        'interface': {}
+    }
+    for device, device_arp in six.iteritems(all_arp):
+        if not device_arp or not device_arp.get('result', False):
             continue
-        for interface, interface_ipaddrs in six.iteritems(device_ipaddrs.get('out', {})):
-            ip_addresses = interface_ipaddrs.get('ipv4', {}).keys()
-            ip_addresses.extend(interface_ipaddrs.get('ipv6', {}).keys())
-            for ipaddr in ip_addresses:
-                if ip != ipaddr:
-                    continue
-                interface_mac = all_interfaces.get(device, {}).get('out', {}).get(interface, {}).get('mac_address', '')
-                return device, interface, interface_mac
+        for arp_entry in device_arp.get('out', []):
+            pos = len(index['rows'])
+            index['rows'].append({
+                'device': device,
+                'interface': arp_entry.get('interface'),
+                'mac': napalm_helpers.convert(napalm_helpers.mac, arp_entry.get('mac')),
+                'ip': napalm_helpers.convert(napalm_helpers.ip, arp_entry.get('ip')),
+                'age': arp_entry.get('age')
+            })
+            _index_add(index['device'], device, pos)
+            _index_add(index['mac'], (arp_entry.get('mac', '') or '').lower(), pos)
+            _index_add(index['ip'], napalm_helpers.convert(napalm_helpers.ip, arp_entry.get('ip', '')), pos)
+            _index_add(index['interface'], (arp_entry.get('interface', '') or ''), pos)
+    return index
+
+
+def _build_mac_index(all_mac):
+    '''
+    Build the lookup tables for the ``net.mac`` mine:
+    the rows, and their positions by device, MAC, VLAN and interface.
+    '''
+    index = {
+        'rows': [],
+        'device': {},
+        'mac': {},
+        'vlan': {},
+        'interface': {}
+    }
+    for device, device_mac in six.iteritems(all_mac):
+        if not device_mac or not device_mac.get('result', False):
+            continue
+        for mac_entry in device_mac.get('out', []):
+            pos = len(index['rows'])
+            mac = napalm_helpers.convert(napalm_helpers.mac, mac_entry.get('mac'))
+            index['rows'].append({
+                'device': device,
+                'interface': mac_entry.get('interface'),
+                'mac': mac,
+                'vlan': mac_entry.get('vlan'),
+                'static': mac_entry.get('static'),
+                'active': mac_entry.get('active'),
+                'moves': mac_entry.get('moves'),
+                'last_move': mac_entry.get('last_move')
+            })
+            _index_add(index['device'], device, pos)
+            _index_add(index['mac'], mac, pos)
+            _index_add(index['vlan'], str(mac_entry.get('vlan', '')), pos)
+            _index_add(index['interface'], (mac_entry.get('interface', '') or ''), pos)
+    return index
+
+
+def _build_lldp_index(all_lldp):
+    '''
+    Build the lookup tables for the ``net.lldp`` mine:
+    the rows, their positions by device, interface and chassis ID,
+    and the lowercased fields searched when matching a pattern.
+    '''
+    index = {
+        'rows': [],
+        'search': [],
+        'device': {},
+        'interface': {},
+        'chassis': {}
+    }
+    for device, device_lldp in six.iteritems(all_lldp):
+        if not device_lldp or not device_lldp.get('result', False):
+            continue
+        for intrf, interface_lldp in six.iteritems(device_lldp.get('out', {})):
+            for lldp_row in (interface_lldp or []):
+                rsn = (lldp_row.get('remote_system_name', '') or '')
+                rpi = (lldp_row.get('remote_port_id', '') or '')
+                rsd = (lldp_row.get('remote_system_description', '') or '')
+                rpd = (lldp_row.get('remote_port_description', '') or '')
+                rci = (lldp_row.get('remote_chassis_id', '') or '')
+                chassis = napalm_helpers.convert(napalm_helpers.mac, rci)
+                pos = len(index['rows'])
+                index['rows'].append({
+                    'device': device,
+                    'interface': intrf,
+                    'parent_interface': (lldp_row.get('parent_interface', '') or ''),
+                    'remote_chassis_id': chassis,
+                    'remote_port_id': rpi,
+                    'remote_port_descr': rpd,
+                    'remote_system_name': rsn,
+                    'remote_system_descr': rsd
+                })
+                index['search'].append((rsn.lower(), rsd.lower(), rpd.lower(), rci.lower()))
+                _index_add(index['device'], device, pos)
+                _index_add(index['interface'], intrf, pos)
+                _index_add(index['chassis'], chassis, pos)
+    return index
+
+
+def _pattern_type(addr):
+    '''
+    Tell what kind of search pattern is ``addr``, as interpreted by ``find``:
+    ``vlan``, ``mac``, ``ip``, ``network`` or ``text``.
+    '''
+    if isinstance(addr, int):
+        return 'vlan'
+    try:
+        if napalm_helpers.convert(napalm_helpers.mac, addr):
+            return 'mac'
+    except IndexError:
+        pass
+    try:
+        if napalm_helpers.convert(napalm_helpers.ip, addr):
+            return 'ip'
+    except ValueError:
+        pass
+    if _get_network_obj(addr):
+        return 'network'
+    return 'text'
+
+
+def _batch_patterns(patterns):
+    '''
+    Match all the text patterns at once against the interfaces descriptions, the LLDP details,
+    and the interfaces from the MAC and ARP tables, walking each of them only once.
+    Returns the matches to be stored in ``_MATCHES``, together with the lookup tables used.
+    '''
+    lowered = [pattern.lower() for pattern in patterns]
+    interfaces_index = _get_interfaces_index()
+    lldp_index = _get_index('lldp', _build_lldp_index, 'net.lldp')
+    arp_index = _get_index('arp', _build_arp_index, 'net.arp')
+    mac_index = _get_index('mac', _build_mac_index, 'net.mac')
+    return {
+        'interfaces': (interfaces_index, _match_patterns(lowered, enumerate(interfaces_index['search']))),
+        'lldp': (lldp_index, _match_patterns(lowered, enumerate(lldp_index['search']))),
+        'arp_interface': (arp_index['interface'],
+                          _match_patterns(patterns, [(key, (key,)) for key in arp_index['interface']])),
+        'mac_interface': (mac_index['interface'],
+                          _match_patterns(patterns, [(key, (key,)) for key in mac_index['interface']]))
+    }
+
+
+def _get_interfaces_index():
+    '''
+    Return the lookup tables for the ``net.interfaces`` and ``net.ipaddrs`` mines.
+    '''
+    return _get_index('interfaces', _build_interfaces_index, 'net.interfaces', 'net.ipaddrs')
+
+
+def _find_interfaces_ip(mac):
+    '''
+    Helper to search the interfaces IPs using the MAC address.
+    '''
+    try:
+        mac = napalm_helpers.convert(napalm_helpers.mac, mac)
+    except AddrFormatError:
+        return ('', '', [])
 
-    return ('', '', '')
+    index = _get_interfaces_index()
+    positions = index['mac'].get(mac)
+    if not mac or not positions:
+        return ('', '', [])
+    device, interface, _, _ = index['entries'][positions[0]]
+    return device, interface, list(index['ipaddrs'].get((device, interface), []))
+
+
+def _find_interfaces_mac(ip):  # pylint: disable=invalid-name
+    '''
+    Helper to get the interfaces hardware address using the IP Address.
+    '''
+    index = _get_interfaces_index()
+    if ip not in index['ip']:
+        return ('', '', '')
+    device, interface = index['ip'][ip]
+    all_interfaces = _get_mine('net.interfaces')
+    interface_mac = all_interfaces.get(device, {}).get('out', {}).get(interface, {}).get('mac_address', '')
+    return device, interface, interface_mac
 
 
 # -----------------------------------------------------------------------------
@@ -312,7 +761,7 @@ def interfaces(device=None,
         net_obj = _get_network_obj(net)
         if not net_obj:
             return False
-        return ipnet in net_obj or net_obj in ipnet
+        return ipnet_obj in net_obj or net_obj in ipnet_obj
 
     labels = {
         'device': 'Device',
@@ -343,86 +792,67 @@ def interfaces(device=None,
             if best:
                 title += ' - only best match returned'
 
-    all_interfaces = _get_mine('net.interfaces')
-    all_ipaddrs = _get_mine('net.ipaddrs')
+    ipnet_obj = None
+    if ipnet:
+        ipnet_obj = ipnet if isinstance(ipnet, IPNetwork) else _get_network_obj(ipnet)
 
+    index = _get_interfaces_index()
+
+    # narrow down the interfaces using the lookup tables, instead of walking the mines
+    positions = None
     if device:
-        all_interfaces = {device: all_interfaces.get(device, {})}
+        positions = _index_intersect(positions, index['device'].get(device, []))
+    if interface:
+        positions = _index_intersect(positions, index['interface'].get(interface, []))
+    if ipnet:
+        positions = _index_intersect(positions, _lookup_network(index, ipnet_obj) if ipnet_obj else [])
+    if pattern:
+        positions = _index_intersect(positions, _index_pattern(index, pattern, 'interfaces'))
+    if positions is None:
+        positions = range(len(index['entries']))
 
     best_row = {}
     best_net_match = None
-    for device, net_interfaces_out in six.iteritems(all_interfaces):  # pylint: disable=too-many-nested-blocks
-        if not net_interfaces_out:
+    for pos in sorted(positions):
+        _, interface_name, device_entry, ips_groups = index['entries'][pos]
+        if ipnet and interface_name in net_runner_opts.get('ignore_interfaces'):
             continue
-        if not net_interfaces_out.get('result', False):
+        if ips_groups is None:
+            # no IP addresses details available for this device
             continue
-        selected_device_interfaces = net_interfaces_out.get('out', {})
-        if interface:
-            selected_device_interfaces = {interface: selected_device_interfaces.get(interface, {})}
-        for interface_name, interface_details in six.iteritems(selected_device_interfaces):
-            if not interface_details:
-                continue
-            if ipnet and interface_name in net_runner_opts.get('ignore_interfaces'):
-                continue
-            interface_description = (interface_details.get('description', '') or '')
-            if pattern:
-                if pattern.lower() not in interface_description.lower():
-                    continue
-            if not all_ipaddrs.get(device, {}).get('result', False):
-                continue
-            ips = []
-            device_entry = {
-                'device': device,
-                'interface': interface_name,
-                'interface_description': interface_description,
-                'is_up': (interface_details.get('is_up', '') or ''),
-                'is_enabled': (interface_details.get('is_enabled', '') or ''),
-                'speed': (interface_details.get('speed', '') or ''),
-                'mac': napalm_helpers.convert(napalm_helpers.mac, (interface_details.get('mac_address', '') or '')),
-                'ips': []
-            }
-            intf_entry_found = False
-            for intrf, interface_ips in six.iteritems(all_ipaddrs.get(device, {}).get('out', {})):
-                if intrf.split('.')[0] == interface_name:
-                    ip_addresses = interface_ips.get('ipv4', {})  # all IPv4 addresses
-                    ip_addresses.update(interface_ips.get('ipv6', {}))  # and all IPv6 addresses
-                    ips = [
-                        '{0}/{1}'.format(
-                            ip_addr,
-                            addr_details.get('prefix_length', '32')
-                        ) for ip_addr, addr_details in six.iteritems(ip_addresses)
-                    ]
-                    interf_entry = {}
-                    interf_entry.update(device_entry)
-                    interf_entry['ips'] = ips
-                    if display:
-                        interf_entry['ips'] = '\n'.join(interf_entry['ips'])
-                    if ipnet:
-                        inet_ips = [
-                            str(ip) for ip in ips if _ipnet_belongs(ip)
-                        ]  # filter and get only IP include ipnet
-                        if inet_ips:  # if any
-                            if best:
-                                # determine the global best match
-                                compare = [best_net_match]
-                                compare.extend(list(map(_get_network_obj, inet_ips)))
-                                new_best_net_match = max(compare)
-                                if new_best_net_match != best_net_match:
-                                    best_net_match = new_best_net_match
-                                    best_row = interf_entry
-                            else:
-                                # or include all
-                                intf_entry_found = True
-                                rows.append(interf_entry)
+        intf_entry_found = False
+        for ips in ips_groups:
+            interf_entry = {}
+            interf_entry.update(device_entry)
+            interf_entry['ips'] = list(ips)
+            if display:
+                interf_entry['ips'] = '\n'.join(interf_entry['ips'])
+            if ipnet:
+                inet_ips = [
+                    str(ip) for ip in ips if _ipnet_belongs(ip)
+                ]  # filter and get only IP include ipnet
+                if inet_ips:  # if any
+                    if best:
+                        # determine the global best match
+                        compare = [best_net_match]
+                        compare.extend(list(map(_get_network_obj, inet_ips)))
+                        new_best_net_match = max(compare)
+                        if new_best_net_match != best_net_match:
+                            best_net_match = new_best_net_match
+                            best_row = interf_entry
                     else:
+                        # or include all
                         intf_entry_found = True
                         rows.append(interf_entry)
-            if not intf_entry_found and not ipnet:
-                interf_entry = {}
-                interf_entry.update(device_entry)
-                if display:
-                    interf_entry['ips'] = ''
+            else:
+                intf_entry_found = True
                 rows.append(interf_entry)
+        if not intf_entry_found and not ipnet:
+            interf_entry = {}
+            interf_entry.update(device_entry)
+            if display:
+                interf_entry['ips'] = ''
+            rows.append(interf_entry)
 
     if ipnet and best and best_row:
         rows = [best_row]
@@ -481,9 +911,6 @@ def findarp(device=None,
         'ip': 'IP',
         'age': 'Age'
     }
-    rows = []
-
-    all_arp = _get_mine('net.arp')
 
     title = "ARP Entries"
     if device:
@@ -495,29 +922,19 @@ def findarp(device=None,
     if mac:
         title += ' for MAC {mac}'.format(mac=mac)
 
+    index = _get_index('arp', _build_arp_index, 'net.arp')
+    positions = set()
+    if mac:
+        positions.update(index['mac'].get(mac.lower(), []))
+    if interface:
+        positions.update(_index_substring(index['interface'], interface, batch='arp_interface'))
+    if ip:
+        positions.update(index['ip'].get(napalm_helpers.convert(napalm_helpers.ip, ip), []))
     if device:
-        all_arp = {device: all_arp.get(device)}
+        positions.intersection_update(index['device'].get(device, []))
+    rows = _index_rows(index, positions)
 
-    for device, device_arp in six.iteritems(all_arp):
-        if not device_arp:
-            continue
-        if not device_arp.get('result', False):
-            continue
-        arp_table = device_arp.get('out', [])
-        for arp_entry in arp_table:
-            if ((mac and arp_entry.get('mac', '').lower() == mac.lower()) or  # pylint: disable=too-many-boolean-expressions
-                (interface and interface in arp_entry.get('interface', '')) or
-                (ip and napalm_helpers.convert(napalm_helpers.ip, arp_entry.get('ip', '')) ==
-                 napalm_helpers.convert(napalm_helpers.ip, ip))):
-                rows.append({
-                    'device': device,
-                    'interface': arp_entry.get('interface'),
-                    'mac': napalm_helpers.convert(napalm_helpers.mac, arp_entry.get('mac')),
-                    'ip': napalm_helpers.convert(napalm_helpers.ip, arp_entry.get('ip')),
-                    'age': arp_entry.get('age')
-                })
-
-    return _display_runner(rows, labels, title, display=display)
+    return _display_runner(rows, labels, title, display=display, count=len(positions))
 
 
 def findmac(device=None, mac=None, interface=None, vlan=None, display=_DEFAULT_DISPLAY):
@@ -570,9 +987,6 @@ def findmac(device=None, mac=None, interface=None, vlan=None, display=_DEFAULT_D
         'moves': 'Moves',
         'last_move': 'Last Move'
     }
-    rows = []
-
-    all_mac = _get_mine('net.mac')
 
     title = "MAC Address(es)"
     if device:
@@ -582,33 +996,19 @@ def findmac(device=None, mac=None, interface=None, vlan=None, display=_DEFAULT_D
     if vlan:
         title += ' on VLAN {vlan}'.format(vlan=vlan)
 
+    index = _get_index('mac', _build_mac_index, 'net.mac')
+    positions = set()
+    if mac:
+        positions.update(index['mac'].get(napalm_helpers.convert(napalm_helpers.mac, mac), []))
+    if interface:
+        positions.update(_index_substring(index['interface'], interface, batch='mac_interface'))
+    if vlan:
+        positions.update(index['vlan'].get(str(vlan), []))
     if device:
-        all_mac = {device: all_mac.get(device)}
+        positions.intersection_update(index['device'].get(device, []))
+    rows = _index_rows(index, positions)
 
-    for device, device_mac in six.iteritems(all_mac):
-        if not device_mac:
-            continue
-        if not device_mac.get('result', False):
-            continue
-        mac_table = device_mac.get('out', [])
-        for mac_entry in mac_table:
-            if ((mac and    # pylint: disable=too-many-boolean-expressions
-                napalm_helpers.convert(napalm_helpers.mac, mac_entry.get('mac', '')) ==
-                napalm_helpers.convert(napalm_helpers.mac, mac)) or
-                (interface and interface in mac_entry.get('interface', '')) or
-               (vlan and str(mac_entry.get('vlan', '')) == str(vlan))):
-                rows.append({
-                    'device': device,
-                    'interface': mac_entry.get('interface'),
-                    'mac': napalm_helpers.convert(napalm_helpers.mac, mac_entry.get('mac')),
-                    'vlan': mac_entry.get('vlan'),
-                    'static': mac_entry.get('static'),
-                    'active': mac_entry.get('active'),
-                    'moves': mac_entry.get('moves'),
-                    'last_move': mac_entry.get('last_move')
-                })
-
-    return _display_runner(rows, labels, title, display=display)
+    return _display_runner(rows, labels, title, display=display, count=len(positions))
 
 
 def lldp(device=None,
@@ -680,8 +1080,6 @@ def lldp(device=None,
         |              |           |                  |                   |                |                         |                        |                2/17/2016 22:00:00               |
         _________________________________________________________________________________________________________________________________________________________________________________________
     '''
-    all_lldp = _get_mine('net.lldp')
-
     labels = {
         'device': 'Device',
         'interface': 'Interface',
@@ -692,7 +1090,6 @@ def lldp(device=None,
         'remote_system_name': 'Remote System Name',
         'remote_system_desc': 'Remote System Description'
     }
-    rows = []
 
     if pattern:
         title = 'Pattern "{0}" found in one of the following LLDP details'.format(pattern)
@@ -707,48 +1104,22 @@ def lldp(device=None,
         if chassis:
             title += ' having Chassis ID {0}'.format(chassis)
 
+    index = _get_index('lldp', _build_lldp_index, 'net.lldp')
+    positions = None
     if device:
-        all_lldp = {device: all_lldp.get(device)}
-
-    for device, device_lldp in six.iteritems(all_lldp):
-        if not device_lldp:
-            continue
-        if not device_lldp.get('result', False):
-            continue
-        lldp_interfaces = device_lldp.get('out', {})
-        if interface:
-            lldp_interfaces = {interface: lldp_interfaces.get(interface, [])}
-        for intrf, interface_lldp in six.iteritems(lldp_interfaces):
-            if not interface_lldp:
-                continue
-            for lldp_row in interface_lldp:
-                rsn = (lldp_row.get('remote_system_name', '') or '')
-                rpi = (lldp_row.get('remote_port_id', '') or '')
-                rsd = (lldp_row.get('remote_system_description', '') or '')
-                rpd = (lldp_row.get('remote_port_description', '') or '')
-                rci = (lldp_row.get('remote_chassis_id', '') or '')
-                if pattern:
-                    ptl = pattern.lower()
-                    if not((ptl in rsn.lower()) or (ptl in rsd.lower()) or
-                           (ptl in rpd.lower()) or (ptl in rci.lower())):
-                        # nothing matched, let's move on
-                        continue
-                if chassis:
-                    if (napalm_helpers.convert(napalm_helpers.mac, rci) !=
-                       napalm_helpers.convert(napalm_helpers.mac, chassis)):
-                        continue
-                rows.append({
-                    'device': device,
-                    'interface': intrf,
-                    'parent_interface': (lldp_row.get('parent_interface', '') or ''),
-                    'remote_chassis_id': napalm_helpers.convert(napalm_helpers.mac, rci),
-                    'remote_port_id': rpi,
-                    'remote_port_descr': rpd,
-                    'remote_system_name': rsn,
-                    'remote_system_descr': rsd
-                })
+        positions = _index_intersect(positions, index['device'].get(device, []))
+    if interface:
+        positions = _index_intersect(positions, index['interface'].get(interface, []))
+    if chassis:
+        positions = _index_intersect(positions,
+                                     index['chassis'].get(napalm_helpers.convert(napalm_helpers.mac, chassis), []))
+    if pattern:
+        positions = _index_intersect(positions, _index_pattern(index, pattern, 'lldp'))
+    if positions is None:
+        positions = range(len(index['rows']))
+    rows = _index_rows(index, positions)
 
-    return _display_runner(rows, labels, title, display=display)
+    return _display_runner(rows, labels, title, display=display, count=len(positions))
 
 
 def find(addr, best=True, display=_DEFAULT_DISPLAY):
@@ -891,6 +1262,8 @@ def multi_find(*patterns, **kwargs):
     Execute multiple search tasks.
     This function is based on the `find` function.
     Depending on the search items, some information might overlap.
+    The free text patterns are matched all at once, in a single pass
+    through the interfaces, LLDP, MAC and ARP details.
 
     Optional arguments:
 
@@ -937,10 +1310,23 @@ def multi_find(*patterns, **kwargs):
             -------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------
     '''
     out = {}
-    for pattern in set(patterns):
-        search_result = find(pattern,
-                             best=kwargs.get('best', True),
-                             display=kwargs.get('display', _DEFAULT_DISPLAY))
-        out[pattern] = search_result
+    patterns = set(patterns)
+    text_patterns = [pattern for pattern in patterns if pattern and _pattern_type(pattern) == 'text']
+    try:
+        if len(text_patterns) > 1:
+            # the free text patterns are searched all at once
+            # then each ``find`` below only looks up its matches
+            _MATCHES.update(_batch_patterns(text_patterns))
+            # the lookup tables are taken once for all the searches
+            for name in ('interfaces', 'lldp', 'arp', 'mac'):
+                _PINNED_INDEX[name] = _INDEX[name][1]
+        for pattern in patterns:
+            search_result = find(pattern,
+                                 best=kwargs.get('best', True),
+                                 display=kwargs.get('display', _DEFAULT_DISPLAY))
+            out[pattern] = search_result
+    finally:
+        _MATCHES.clear()
+        _PINNED_INDEX.clear()
     if not kwargs.get('display', _DEFAULT_DISPLAY):
         return out
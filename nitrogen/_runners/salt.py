@@ -32,16 +32,96 @@ Execution modules are also available to salt runners:
 # import python libs
 from __future__ import absolute_import
 from __future__ import print_function
+import time
 import logging
 
 # import salt libs
 import salt.client
+from salt.ext import six
 from salt.loader import minion_mods, utils
 from salt.exceptions import SaltClientError
 
 log = logging.getLogger(__name__)  # pylint: disable=invalid-name
 
 
+def _target_minions(client, tgt, tgt_type, timeout=None):
+    '''
+    Return the sorted list of minions matched by the target that are up.
+    As Salt's batch mode does, the minions are pinged using the original target
+    and target type, so only the minions actually matching the target reply;
+    the list of minions returned by the master for grain, pillar or compound
+    targets is greedy and would also include minions not matching them.
+    '''
+    minions = set()
+    for minion_ret in client.cmd_iter(tgt,
+                                      'test.ping',
+                                      timeout=timeout,
+                                      expr_form=tgt_type):
+        minions.update(minion_ret)
+    return sorted(minions)
+
+
+def _fan_out_batches(client, tgt, tgt_type, batch_size, timeout=None):
+    '''
+    Yield the target and target type of each batch of minions.
+    '''
+    if not batch_size:
+        yield tgt, tgt_type
+        return
+    minions = _target_minions(client, tgt, tgt_type, timeout=timeout)
+    for index in range(0, len(minions), batch_size):
+        yield minions[index:index + batch_size], 'list'
+
+
+def _fan_out(client,
+             tgt,
+             fun,
+             arg=(),
+             timeout=None,
+             tgt_type='glob',
+             kwarg=None,
+             process=None,
+             batch_size=None,
+             rate=None,
+             **kwargs):
+    '''
+    Publish ``fun`` to the minions matched by the target, in batches of
+    ``batch_size`` minions, publishing to at most ``rate`` minions per second.
+    The returns are consumed as soon as they arrive, and handed over to
+    ``process`` (when specified), while still waiting for the returns of the
+    other minions.
+    '''
+    if rate and not batch_size:
+        batch_size = max(int(rate), 1)
+    if batch_size and kwargs.get('jid'):
+        # each batch is a separate job
+        log.warning('Ignoring the JID %s, as the job is published in batches', kwargs.pop('jid'))
+    ret = {}
+    published = 0
+    started = time.time()
+    for batch_tgt, batch_tgt_type in _fan_out_batches(client, tgt, tgt_type, batch_size, timeout=timeout):
+        if rate:
+            delay = started + published / float(rate) - time.time()
+            if delay > 0:
+                time.sleep(delay)
+            published += len(batch_tgt)
+        for minion_ret in client.cmd_iter(batch_tgt,
+                                          fun,
+                                          arg=arg,
+                                          timeout=timeout,
+                                          expr_form=batch_tgt_type,  # no warn_until, as this is introduced only in Nitrogen
+                                          kwarg=kwarg,
+                                          **kwargs):
+            for minion_id, minion_data in six.iteritems(minion_ret):
+                if not isinstance(minion_data, dict) or 'ret' not in minion_data:
+                    continue
+                if process is None:
+                    ret[minion_id] = minion_data['ret']
+                else:
+                    ret[minion_id] = process(minion_id, minion_data['ret'])
+    return ret
+
+
 def cmd(fun, *args, **kwargs):
     '''
     Execute ``fun`` with the given ``args`` and ``kwargs``.
@@ -77,6 +157,9 @@ def execute(tgt,
             ret='',
             jid='',
             kwarg=None,
+            process=None,
+            batch_size=None,
+            rate=None,
             **kwargs):
     '''
     Execute `fun` on all minions matched by `tgt` and `tgt_type`.
@@ -92,19 +175,48 @@ def execute(tgt,
         ret1 = __salt__['salt.execute']('*', 'mod.fun')
         ret2 = __salt__['salt.execute']('my_nodegroup', 'mod2.fun2', tgt_type='nodegroup')
 
+    The returns are streamed as they arrive, so the minions that already
+    replied don't wait for the slowest ones. The following arguments control
+    the fan-out:
+
+    process
+        Callable executed for each minion, as soon as its return is available,
+        receiving the minion ID and the return. The result of ``process``
+        replaces the return of the minion.
+
+        .. code-block:: python
+
+            def _synced(minion_id, ntp_stats):
+                return any(peer.get('synchronized') for peer in ntp_stats.get('out', []))
+
+            ret = __salt__['salt.execute']('*', 'ntp.stats', process=_synced)
+
+    batch_size
+        Publish the job to at most this many minions at a time.
+        By default, the job is published to all the matched minions at once.
+        When publishing in batches, the target is first pinged, and the job is
+        published only to the minions that replied, as Salt's batch mode does.
+
+    rate
+        Publish the job to at most this many minions per second.
+
     .. versionadded:: Nitrogen
     '''
     client = salt.client.get_local_client(__opts__['conf_file'])
     try:
-        ret = client.cmd(tgt,
-                         fun,
-                         arg=arg,
-                         timeout=timeout or __opts__['timeout'],
-                         expr_form=tgt_type,  # no warn_until, as this is introduced only in Nitrogen
-                         ret=ret,
-                         jid=jid,
-                         kwarg=kwarg,
-                         **kwargs)
+        ret = _fan_out(client,
+                       tgt,
+                       fun,
+                       arg=arg,
+                       timeout=timeout or __opts__['timeout'],
+                       tgt_type=tgt_type,
+                       kwarg=kwarg,
+                       process=process,
+                       batch_size=batch_size,
+                       rate=rate,
+                       ret=ret,
+                       jid=jid,
+                       **kwargs)
     except SaltClientError as client_error:
         log.error('Error while executing {fun} on {tgt} ({tgt_type})'.format(fun=fun,
                                                                              tgt=tgt,
@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+'''
+Mine Snapshot Cache
+===================
+
+.. versionadded:: Nitrogen
+
+Utilities used by the ``net`` and ``bgp`` runners to keep on the master
+a snapshot of the mine data they need, so consecutive runner calls don't
+load again the (possibly very large) mine of each and every minion.
+
+The snapshots are stored through the :mod:`Salt cache subsystem <salt.cache>`,
+which serializes the data using msgpack (default ``localfs`` driver).
+A snapshot is reused as long as:
+
+- it is not older than the configured TTL (in seconds);
+- none of the targeted minions updated their mine since the snapshot was taken;
+- the list of targeted minions did not change.
+
+Usage example:
+
+.. code-block:: python
+
+    mine = __utils__['mine_cache.get'](__opts__,
+                                       'net.arp',
+                                       lambda: __salt__['mine.get']('*', 'net.arp'),
+                                       tgt='*',
+                                       ttl=300)
+'''
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+# Import python libs
+import time
+import hashlib
+import logging
+
+# Import salt libs
+import salt.cache
+import salt.utils.minions
+
+log = logging.getLogger(__name__)
+
+# -----------------------------------------------------------------------------
+# global variables
+# -----------------------------------------------------------------------------
+
+_SNAPSHOTS_BANK = 'napalm/mine_snapshots'
+_MINE_BANK = 'minions/{minion}'
+_MINE_KEY = 'mine'
+
+# -----------------------------------------------------------------------------
+# helper functions -- will not be exported
+# -----------------------------------------------------------------------------
+
+
+def _snapshot_key(fun, tgt, tgt_type):
+    '''
+    Return the cache key of the snapshot for a certain mine function and target.
+    '''
+    key = '{fun}|{tgt}|{tgt_type}'.format(fun=fun, tgt=tgt, tgt_type=tgt_type)
+    return hashlib.md5(key.encode('utf-8')).hexdigest()
+
+
+def _target_minions(opts, tgt, tgt_type):
+    '''
+    Return the sorted list of minions matched by the target.
+    '''
+    minions = salt.utils.minions.CkMinions(opts).check_minions(tgt, tgt_type)
+    if isinstance(minions, dict):
+        # newer releases return the list of minions under the ``minions`` key
+        minions = minions.get('minions', [])
+    return sorted(minions)
+
+
+def _mine_updated(cache, minions):
+    '''
+    Return the timestamp of the most recent mine update, across the targeted minions.
+    '''
+    updated = 0
+    for minion in minions:
+        updated = max(updated, cache.updated(_MINE_BANK.format(minion=minion), _MINE_KEY) or 0)
+    return updated
+
+# -----------------------------------------------------------------------------
+# callable functions
+# -----------------------------------------------------------------------------
+
+
+def get(opts, fun, fetch, tgt='*', tgt_type='glob', ttl=300):
+    '''
+    Return the mine data for the function ``fun`` from the snapshot cache,
+    or execute ``fetch`` and store its result, when the snapshot is missing
+    or no longer valid.
+
+    opts
+        The master opts.
+
+    fun
+        The name of the mine function.
+
+    fetch
+        Callable returning the mine data, when the snapshot cannot be used.
+
+    tgt: ``*``
+        The target of the minions whose mine data is cached.
+
+    tgt_type: ``glob``
+        The type of ``tgt``.
+
+    ttl: ``300``
+        For how many seconds the snapshot can be reused.
+        When ``0``, the snapshot cache is not used.
+    '''
+    if not ttl:
+        return fetch()
+    cache = salt.cache.Cache(opts)
+    key = _snapshot_key(fun, tgt, tgt_type)
+    minions = _target_minions(opts, tgt, tgt_type)
+    mine_updated = _mine_updated(cache, minions)
+    snapshot = cache.fetch(_SNAPSHOTS_BANK, key) or {}
+    if snapshot and \
+            time.time() - snapshot.get('timestamp', 0) < ttl and \
+            snapshot.get('mine_updated', 0) >= mine_updated and \
+            snapshot.get('minions') == minions:
+        log.debug('Using the %s mine snapshot cached at %s', fun, snapshot['timestamp'])
+        return snapshot.get('data', {})
+    log.debug('Refreshing the %s mine snapshot', fun)
+    data = fetch()
+    cache.store(_SNAPSHOTS_BANK, key, {
+        'timestamp': time.time(),
+        'mine_updated': mine_updated,
+        'minions': minions,
+        'data': data
+    })
+    return data
+
+
+def flush(opts, fun=None, tgt='*', tgt_type='glob'):
+    '''
+    Remove the mine snapshot of the function ``fun`` for a certain target,
+    or all the mine snapshots, when ``fun`` is not specified.
+    '''
+    cache = salt.cache.Cache(opts)
+    if fun:
+        return cache.flush(_SNAPSHOTS_BANK, _snapshot_key(fun, tgt, tgt_type))
+    return cache.flush(_SNAPSHOTS_BANK)
@@ -167,11 +167,57 @@ Event structure example:
 The event examplified above has been fired when the device
 identified by the Minion id ``edge01.bjm01`` has been synchronized
 with a NTP server at a stratum level greater than 5.
+
+By default, the events are fired at every interval, as long as the
+condition is matched. With ``_delta: true``, the beacon remembers the
+elements matched at the previous interval, and fires events only when
+they change: the ``enter`` event lists the elements that started
+matching, and the ``clear`` event the ones that are no longer matched.
+Each element is identified by its path in the output structure, and the
+events carry only the elements changed, not the entire output:
+
+.. code-block:: yaml
+
+    beacons:
+      napalm:
+        - bgp.neighbors:
+            _delta: true
+            global:
+              '*':
+                up: false
+
+.. code-block:: json
+
+    salt/beacon/edge01.bjm01/napalm/junos/bgp.neighbors/enter {
+        "_stamp": "2017-09-05T09:51:09.377202",
+        "args": [],
+        "changes": [
+            {
+                "data": {
+                    "remote_address": "172.17.17.1",
+                    "up": false,
+                    ...
+                },
+                "path": ["global", 13335, 0]
+            }
+        ],
+        "fun": "bgp.neighbors",
+        "id": "edge01.bjm01",
+        "kwargs": {},
+        "match": {
+            "global": {
+                "*": {
+                    "up": false
+                }
+            }
+        }
+    }
 '''
 from __future__ import absolute_import
 
 # Import Python std lib
 import re
+import json
 import logging
 
 # Import Salt modules
@@ -189,6 +235,8 @@ _numeric_operand = {
     '==': '__eq__',
     '!=': '__ne__',
 }  # mathematical operand - private method map
+# compiled match functions, per function and match structure
+_PLANS = {}
 
 
 __virtualname__ = 'napalm'
@@ -201,82 +249,166 @@ def __virtual__():
     return salt.utils.napalm.virtual(__opts__, __virtualname__, __file__)
 
 
-def _compare(cur_cmp, cur_struct):
+def _numeric_types(value):
     '''
-    Compares two objects and return a boolean value
-    when there's a match.
+    Tell if the value is numeric (booleans included).
     '''
-    if isinstance(cur_cmp, dict) and isinstance(cur_struct, dict):
-        log.debug('Comparing dict to dict')
-        for cmp_key, cmp_value in six.iteritems(cur_cmp):
-            if cmp_key == '*':
-                # matches any key from the source dictionary
-                if isinstance(cmp_value, dict):
-                    found = False
-                    for _, cur_struct_val in six.iteritems(cur_struct):
-                        found |= _compare(cmp_value, cur_struct_val)
-                    return found
-                else:
-                    found = False
-                    if isinstance(cur_struct, (list, tuple)):
-                        for cur_ele in cur_struct:
-                            found |= _compare(cmp_value, cur_ele)
-                    elif isinstance(cur_struct, dict):
-                        for _, cur_ele in six.iteritems(cur_struct):
-                            found |= _compare(cmp_value, cur_ele)
-                    return found
-            else:
-                if isinstance(cmp_value, dict):
-                    if cmp_key not in cur_struct:
-                        return False
-                    return _compare(cmp_value, cur_struct[cmp_key])
-                if isinstance(cmp_value, list):
-                    found = False
-                    for _, cur_struct_val in six.iteritems(cur_struct):
-                        found |= _compare(cmp_value, cur_struct_val)
-                    return found
-                else:
-                    return _compare(cmp_value, cur_struct[cmp_key])
-    elif isinstance(cur_cmp, (list, tuple)) and isinstance(cur_struct, (list, tuple)):
-        log.debug('Comparing list to list')
-        found = False
-        for cur_cmp_ele in cur_cmp:
-            for cur_struct_ele in cur_struct:
-                found |= _compare(cur_cmp_ele, cur_struct_ele)
-        return found
-    elif isinstance(cur_cmp, dict) and isinstance(cur_struct, (list, tuple)):
-        log.debug('Comparing dict to list (of dicts?)')
-        found = False
-        for cur_struct_ele in cur_struct:
-            found |= _compare(cur_cmp, cur_struct_ele)
-        return found
-    elif isinstance(cur_cmp, bool) and isinstance(cur_struct, bool):
-        log.debug('Comparing booleans: %s ? %s', cur_cmp, cur_struct)
-        return cur_cmp == cur_struct
-    elif isinstance(cur_cmp, (six.string_types, six.text_type)) and \
-         isinstance(cur_struct, (six.string_types, six.text_type)):
-        log.debug('Comparing strings (and regex?): %s ? %s', cur_cmp, cur_struct)
-        # Trying literal match
-        matched = re.match(cur_cmp, cur_struct, re.I)
-        if matched:
-            return True
-        return False
-    elif isinstance(cur_cmp, (six.integer_types, float)) and \
-         isinstance(cur_struct, (six.integer_types, float)):
-        log.debug('Comparing numeric values: %d ? %d', cur_cmp, cur_struct)
-        # numeric compare
-        return cur_cmp == cur_struct
-    elif isinstance(cur_struct, (six.integer_types, float)) and \
-         isinstance(cur_cmp, (six.string_types, six.text_type)):
-        # Comapring the numerical value agains a presumably mathematical value
-        log.debug('Comparing a numeric value (%d) with a string (%s)', cur_struct, cur_cmp)
+    return isinstance(value, (six.integer_types, float))
+
+
+def _any(results, matched):
+    '''
+    Return ``True`` when any of the results is true.
+    When collecting the ``matched`` paths, all the results are evaluated,
+    otherwise stop at the first one found.
+    '''
+    if matched is None:
+        return any(results)
+    return any(list(results))
+
+
+def _leaf(matches):
+    '''
+    Wrap a comparison function, recording the path of the value when it matches.
+    '''
+    def _match(cur_struct, path=(), matched=None):
+        if not matches(cur_struct):
+            return False
+        if matched is not None:
+            matched.append(path)
+        return True
+    return _match
+
+
+def _compile(cur_cmp):
+    '''
+    Compile the match structure into a function receiving the output structure
+    and returning a boolean value when there's a match.
+
+    The regular expressions and the mathematical comparisons are parsed only once,
+    and the matching stops at the first element found.
+    When the function receives a ``matched`` list, all the elements are evaluated instead,
+    and the paths of the values matched are appended to that list.
+    '''
+    if isinstance(cur_cmp, dict):
+        if not cur_cmp:
+            return lambda cur_struct, path=(), matched=None: False
+        # only the first key of the match structure is evaluated at each level
+        cmp_key, cmp_value = next(six.iteritems(cur_cmp))
+        cmp_value_fun = _compile(cmp_value)
+        if cmp_key == '*' or isinstance(cmp_value, list):
+            # matches any key from the source dictionary
+            def _match_dict(cur_struct, path, matched):
+                return _any((cmp_value_fun(cur_struct_val, path + (cur_struct_key,), matched)
+                             for cur_struct_key, cur_struct_val in six.iteritems(cur_struct)), matched)
+        else:
+            def _match_dict(cur_struct, path, matched):
+                if cmp_key not in cur_struct:
+                    return False
+                return cmp_value_fun(cur_struct[cmp_key], path + (cmp_key,), matched)
+
+        def _match(cur_struct, path=(), matched=None):
+            if isinstance(cur_struct, dict):
+                return _match_dict(cur_struct, path, matched)
+            if isinstance(cur_struct, (list, tuple)):
+                # dict to list (of dicts?)
+                return _any((_match(cur_struct_ele, path + (index,), matched)
+                             for index, cur_struct_ele in enumerate(cur_struct)), matched)
+            return False
+        return _match
+    elif isinstance(cur_cmp, (list, tuple)):
+        cmp_funs = [_compile(cur_cmp_ele) for cur_cmp_ele in cur_cmp]
+
+        def _match(cur_struct, path=(), matched=None):
+            if not isinstance(cur_struct, (list, tuple)):
+                return False
+            return _any((cmp_fun(cur_struct_ele, path + (index,), matched)
+                         for cmp_fun in cmp_funs
+                         for index, cur_struct_ele in enumerate(cur_struct)), matched)
+        return _match
+    elif isinstance(cur_cmp, bool):
+        return _leaf(lambda cur_struct: _numeric_types(cur_struct) and cur_cmp == cur_struct)
+    elif isinstance(cur_cmp, (six.string_types, six.text_type)):
+        cmp_regex = re.compile(cur_cmp, re.I)
         numeric_compare = _numeric_regex.match(cur_cmp)
-        # determine if the value to compare agains is a mathematical operand
+        # determine if the value to compare against is a mathematical operand
+        numeric_fun = None
         if numeric_compare:
-            compare_value = numeric_compare.group(2)
-            return getattr(float(cur_struct), _numeric_operand[numeric_compare.group(1)])(float(compare_value))
-        return False
-    return False
+            compare_value = float(numeric_compare.group(2))
+            numeric_operand = _numeric_operand[numeric_compare.group(1)]
+            numeric_fun = lambda cur_struct: getattr(float(cur_struct), numeric_operand)(compare_value)
+
+        def _matches(cur_struct):
+            if isinstance(cur_struct, (six.string_types, six.text_type)):
+                return cmp_regex.match(cur_struct) is not None
+            if _numeric_types(cur_struct) and numeric_fun:
+                return numeric_fun(cur_struct)
+            return False
+        return _leaf(_matches)
+    elif _numeric_types(cur_cmp):
+        return _leaf(lambda cur_struct: _numeric_types(cur_struct) and cur_cmp == cur_struct)
+    return lambda cur_struct, path=(), matched=None: False
+
+
+def _get_match_cfg(fun_cfg):
+    '''
+    Return the match structure, without the ``_args``, ``_kwargs`` and ``_delta`` keys.
+    '''
+    return dict((key, value) for key, value in six.iteritems(fun_cfg) if key not in ('_args', '_kwargs', '_delta'))
+
+
+def _get_plan_key(fun, fun_cfg):
+    '''
+    Return the key identifying this function and match structure.
+    '''
+    return (fun, json.dumps(fun_cfg, default=str))
+
+
+def _get_plan(fun, fun_cfg):
+    '''
+    Return the compiled match function for this function and match structure,
+    compiling it only the first time.
+    '''
+    plan_key = _get_plan_key(fun, fun_cfg)
+    if plan_key not in _PLANS:
+        _PLANS[plan_key] = _compile(_get_match_cfg(fun_cfg))
+    return _PLANS[plan_key]
+
+
+def _get_path(cur_struct, path):
+    '''
+    Return the element found at a certain path in the output structure.
+    '''
+    for key in path:
+        cur_struct = cur_struct[key]
+    return cur_struct
+
+
+def _delta(fun, fun_cfg, fun_ret_out):
+    '''
+    Return the elements that started matching, and the paths of the elements that stopped matching,
+    since the previous execution. The matched elements are identified by their path in the output
+    structure, and remembered in the context between the executions.
+    '''
+    matched = []
+    _get_plan(fun, fun_cfg)(fun_ret_out, matched=matched)
+    # the element matched is the one containing the value compared
+    current = dict((path[:-1], _get_path(fun_ret_out, path[:-1])) for path in matched)
+    state_key = ('napalm_beacon', ) + _get_plan_key(fun, fun_cfg)
+    previous = __context__.get(state_key, set())
+    __context__[state_key] = set(current)
+    entered = [
+        {
+            'path': list(path),
+            'data': current[path]
+        } for path in sorted(current, key=str) if path not in previous
+    ]
+    cleared = [
+        {
+            'path': list(path)
+        } for path in sorted(previous, key=str) if path not in current
+    ]
+    return entered, cleared
 
 
 def validate(config):
@@ -293,6 +425,10 @@ def validate(config):
             return False, 'The match structure for the {} execution function output must be a dictionary'.format(fun)
         if fun not in __salt__:
             return False, 'Execution function {} is not availabe!'.format(fun)
+        try:
+            _get_plan(fun, fun_cfg)
+        except re.error as err:
+            return False, 'Invalid regular expression in the match structure for {}: {}'.format(fun, err)
     return True, 'Valid configuration for the napalm beacon!'
 
 
@@ -309,8 +445,9 @@ def beacon(config):
         event = {}
         fun = mod.keys()[0]
         fun_cfg = mod.values()[0]
-        args = fun_cfg.pop('_args', [])
-        kwargs = fun_cfg.pop('_kwargs', {})
+        args = fun_cfg.get('_args', [])
+        kwargs = fun_cfg.get('_kwargs', {})
+        fun_match_cfg = _get_match_cfg(fun_cfg)
         log.debug('Executing {fun} with {args} and {kwargs}'.format(
             fun=fun,
             args=args,
@@ -325,26 +462,48 @@ def beacon(config):
             continue
         fun_ret_out = fun_ret['out']
         log.debug('Comparing to:')
-        log.debug(fun_cfg)
+        log.debug(fun_match_cfg)
         try:
-            fun_cmp_result = _compare(fun_cfg, fun_ret_out)
+            if fun_cfg.get('_delta', False):
+                entered, cleared = _delta(fun, fun_cfg, fun_ret_out)
+            else:
+                fun_cmp_result = _get_plan(fun, fun_cfg)(fun_ret_out)
         except Exception as err:
             log.error(err, exc_info=True)
             # catch any exception and continue
             # to not jeopardise the execution of the next function in the list
             continue
+        if fun_cfg.get('_delta', False):
+            for change, changes in (('enter', entered), ('clear', cleared)):
+                if not changes:
+                    continue
+                log.info('{change} {fun} with {cfg}: {count} element(s)'.format(
+                    change=change.title(),
+                    fun=fun,
+                    cfg=fun_match_cfg,
+                    count=len(changes)
+                ))
+                ret.append({
+                    'tag': '{os}/{fun}/{change}'.format(os=__grains__['os'], fun=fun, change=change),
+                    'fun': fun,
+                    'args': args,
+                    'kwargs': kwargs,
+                    'match': fun_match_cfg,
+                    'changes': changes
+                })
+            continue
         log.debug('Result of comparison: {res}'.format(res=fun_cmp_result))
         if fun_cmp_result:
             log.info('Matched {fun} with {cfg}'.format(
                 fun=fun,
-                cfg=fun_cfg
+                cfg=fun_match_cfg
             ))
             event['tag'] = '{os}/{fun}'.format(os=__grains__['os'], fun=fun)
             event['fun'] = fun
             event['args'] = args
             event['kwargs'] = kwargs
             event['data'] = fun_ret
-            event['match'] = fun_cfg
+            event['match'] = fun_match_cfg
             log.debug('Queueing event:')
             log.debug(event)
             ret.append(event)